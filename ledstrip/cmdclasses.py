@@ -28,3 +28,11 @@
 from ledrandom import LedRandom, LedRandomOG
 from ledmeter import LedMeter
 from ledturn import LedTurn
+from ledpixels import LedPixels
+from ledcycle import LedCycle
+from ledplay import LedPlay
+from ledeffects import LedRainbow, LedBreathe, LedPlasma, LedFire
+from ledparticles import LedParticles
+from ledrpm import LedRpm
+from ledindicator import LedIndicator
+from ledbands import LedBands
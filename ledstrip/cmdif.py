@@ -30,19 +30,24 @@
 * CmdAdd - provide a way to add new command module to the list of commands
 * CmdStop - stop a running command
 * CmdFreeMem - display amount of free memory to console
+* CmdBatch - apply a batch of one-shot commands with a single repaint
+* CmdMode - switch the console between human and machine mode
+* CmdScene - save and recall scene presets
 
-This module relies on the presence of the [`console_std`][ledstrip.console_std]
+This module relies on the presence of the [`console`][ledstrip.console]
 module which provides an abstraction of read and write functions for a console.
-This should allow this module to be used with different mechanisms of input and
-output.
+This allows this module to be used with different mechanisms of input and
+output, such as [`console_std`][ledstrip.console_std] or
+[`console_uart`][ledstrip.console_uart].
 """
 
 import asyncio
 from collections import OrderedDict
-from console_std import *
+from console import *
 import cmdparser
-from  cmdtemplate import CommandTemplate
+from  cmdtemplate import CommandTemplate, convert_parms, format_parms
 from cmdclasses import *
+import os
 import time
 import gc
 
@@ -56,7 +61,9 @@ class CmdFreeMem(CommandTemplate):
     much memory resource is being used by the program.
     """
     helpstr = "show free memory"
-    async def run(self, parmlist: list[str]) -> None:
+    schema = ""
+    oneshot = True
+    def apply(self, parmlist: list[str]) -> None:
         gc.collect()
         freemem = gc.mem_free() # type: ignore[attr-defined]
         console_writeln(f"free mem: {freemem}")
@@ -76,6 +83,7 @@ class CmdHelp(CommandTemplate):
     provides a help string.
     """
     helpstr = "show list of commands"
+    oneshot = True
 
     def __init__(self, cmddict: dict) -> None:
         super().__init__()
@@ -86,7 +94,12 @@ def cmdhelp(self) -> None:
         console_writeln("\nCommands")
         console_writeln("--------")
         for cmdname, cmdobj in self._dict.items():
+            # aliases are shown with the full command name
+            if cmdname == cmdobj.alias:
+                continue
             cmdhelp = cmdobj.helpstr
+            if cmdobj.alias:
+                cmdhelp = f"{cmdhelp} (alias: {cmdobj.alias})"
             console_writeln(f"{cmdname:<8} : {cmdhelp}")
         console_writeln("")
 
@@ -95,12 +108,14 @@ def cfghelp(self) -> None:
         console_writeln("\nConfigs")
         console_writeln("-------")
         for cmdname, cmdobj in self._dict.items():
+            if cmdname == cmdobj.alias:
+                continue
             cfghelp = cmdobj.cfgstr
             console_writeln(f"{cmdname:<8} : {cfghelp}")
         console_writeln("")
 
     # this is called whenever parm[0]=='help'
-    async def run(self, parmlist: list[str]) -> None:
+    def apply(self, parmlist: list[str]) -> None:
         # decide if this is a regular help, or a config help, and then
         # call the appropriate method to show the help to the user
         if len(parmlist) == 2 and parmlist[1] == "config":
@@ -117,19 +132,40 @@ class CmdConfig(CommandTemplate):
     It is invoked as `config,<cmdname>,parm1,parm2,...`
 
     The parameters are passed through to the specified command's config handler
-    if it has one. No checking is done on the actual parameters.
+    if it has one. If the command has a `cfgschema`, the parameters are checked
+    and converted first, and a mismatch is an error.
+
+    The last config of each command is kept in `saved`, so that it can be
+    saved in a scene, or kept over a reset by a
+    [ConfigStore][ledstrip.config_store.ConfigStore].
     """
     helpstr = "config,<cmdname>,parm1,parm2,..."
+    oneshot = True
 
     def __init__(self, cmddict: dict) -> None:
         super().__init__()
         self._dict = cmddict
+        self.saved = OrderedDict()
+        """Last converted config parameters for each command, see `cfgkey`."""
+        self.store = None
+        """[ConfigStore][ledstrip.config_store.ConfigStore] told about each
+        config change, if there is one."""
+
+    # check that the command to configure exists and that the parameters
+    # match its config schema
+    def validate(self, parmlist: list[str]) -> bool:
+        if len(parmlist) < 3:
+            return False
+        cmdobj = self._dict.get(parmlist[1])
+        if cmdobj is None:
+            return False
+        return cmdobj.validate_config(parmlist)
 
     # this is called when parm[0]=='config'
     # parm[1] should be the command to be conigured
     # parm[2] and greater are configuration parameters, which vary depending
     # on the command that is being configured
-    async def run(self, parmlist: list[str]) -> None:
+    def apply(self, parmlist: list[str]) -> None:
         # check that there at least one parameter, and that the specified
         # command exists, and then pass to the command's config handler.
         if len(parmlist) >= 3:
@@ -137,6 +173,13 @@ async def run(self, parmlist: list[str]) -> None:
             if cmdname in self._dict:
                 cmdobj = self._dict[cmdname]
                 cmdobj.config(parmlist)
+                # keep the config that was accepted, under the name of the
+                # command and the parameters that pick what was configured
+                key = ",".join(str(parm) for parm in
+                               parmlist[1:2 + cmdobj.cfgkey])
+                self.saved[key] = parmlist
+                if self.store:
+                    self.store.changed()
 
 class CmdStop(CommandTemplate):
     """Stop a previously running command.
@@ -152,6 +195,8 @@ class CmdStop(CommandTemplate):
     It is invoked as `stop,<cmdname>`
     """
     helpstr = "stop,<cmdname>"
+    schema = "s"
+    oneshot = True
 
     def __init__(self, cmddict: dict) -> None:
         super().__init__()
@@ -159,7 +204,7 @@ def __init__(self, cmddict: dict) -> None:
 
     # this is called when parm[0]=='stop'
     # parm[1] should be the command to be stop
-    async def run(self, parmlist: list[str]) -> None:
+    def apply(self, parmlist: list[str]) -> None:
         # check that there at least one parameter, and that the specified
         # command exists, and then pass to the command's config handler.
         if len(parmlist) >= 2:
@@ -168,6 +213,272 @@ async def run(self, parmlist: list[str]) -> None:
                 cmdobj = self._dict[cmdname]
                 cmdobj.stop()
 
+class CmdBatch(CommandTemplate):
+    """Apply a batch of one-shot commands with a single repaint.
+
+    More than one command can be sent on a single command line by separating
+    the commands with a semicolon:
+
+        $range0,0,10,15,0,0;range0,10,10,0,15,0;range1,0,10,0,0,15
+
+    Every command in the batch must be a one-shot command that draws on an
+    LED strip (see [CommandTemplate][ledstrip.cmdtemplate]), so commands like
+    `config` or `scene` can not be batched. Each command is fully checked by
+    its `validate()` before the batch is accepted. The commands for each LED
+    strip are handed to the strip as a single one-shot command. If the strip
+    is idle they are applied in order and the strip is shown once before the
+    reply is sent, otherwise they are queued and applied together when the
+    strip is free (see [LedStrip][ledstrip.ledstrip]). There is a single
+    `$OK` reply for the whole batch. If any command in the batch is not valid
+    then `$ERR` is the reply and none of the commands are applied, and if a
+    strip has no room in its queue then `$BUSY` is the reply and none of the
+    commands are applied.
+
+    This is not a named command. It is used by the command interface whenever
+    a command line contains more than one command.
+    """
+    helpstr = "cmd,parm,...;cmd,parm,...;..."
+    oneshot = True
+
+    def __init__(self, cmddict: dict) -> None:
+        super().__init__()
+        self._dict = cmddict
+
+    def split(self, parmlist: list[str]) -> list:
+        """Split a batch command line into the individual commands.
+
+        The parameter list is the one returned by the command parser, where
+        each command is separated by a ";" item.
+
+        :param parmlist: string list of all the command line parameters
+        :return: list of (CommandTemplate, parameter list) pairs, or `None` if
+            any command in the batch is not a valid one-shot strip command, or
+            its parameters are not valid
+        """
+        batch = []
+        first = 0
+        numparms = len(parmlist)
+        for idx in range(numparms + 1):
+            if idx == numparms or parmlist[idx] == ";":
+                cmdobj = self._dict.get(parmlist[first])
+                if (cmdobj is None or not cmdobj.oneshot
+                        or cmdobj._strip is None):
+                    return None
+                cmdparms = parmlist[first:idx]
+                if not cmdobj.validate(cmdparms):
+                    return None
+                batch.append((cmdobj, cmdparms))
+                first = idx + 1
+        return batch
+
+    def submit(self, batch: list) -> str:
+        """Apply a batch returned by `split()`, or queue it.
+
+        :param batch: list of (CommandTemplate, parameter list) pairs
+        :return: the reply for the batch, `$OK` or `$BUSY`
+        """
+        # group the commands by strip, keeping their order
+        strips = []
+        parts = []
+        for cmdobj, cmdparms in batch:
+            strip = cmdobj._strip
+            if strip not in strips:
+                strips.append(strip)
+                parts.append([])
+            parts[strips.index(strip)].append((cmdobj, cmdparms))
+
+        # nothing is applied unless every strip can take its part
+        for strip in strips:
+            if len(strip._queue) >= strip.QUEUE_DEPTH:
+                return "$BUSY"
+        for idx in range(len(strips)):
+            strips[idx].submit(self, parts[idx])
+        return "$OK"
+
+    # this is called by the strip with the commands for that strip from
+    # submit(), not the raw command line parameters
+    def apply(self, parmlist: list) -> None:
+        first = True
+        for cmdobj, cmdparms in parmlist:
+            # the strip counted the first write when it took the batch
+            if not first:
+                cmdobj._strip.writes += 1
+            first = False
+            # the other commands must still be applied if one of them fails
+            try:
+                cmdobj.apply(cmdparms)
+            except Exception:
+                pass
+
+class CmdMode(CommandTemplate):
+    """Switch the console between human and machine mode.
+
+    In human mode (the default), every received character is echoed back so
+    that a person using a terminal can see what they are typing, and every
+    reply is written as soon as it is ready.
+
+    In machine mode, there is no echo, and replies are buffered and written
+    once per pass of the command loop. This is meant for a host program that
+    is sending commands, and it cuts down the amount of serial traffic.
+
+    It is invoked as `mode,machine` or `mode,human`. The mode lasts until it
+    is changed or the controller is reset.
+    """
+    helpstr = "mode,<human|machine>"
+    schema = "s"
+    oneshot = True
+
+    def __init__(self, cmdinterface: "CmdInterface") -> None:
+        super().__init__()
+        self._ci = cmdinterface
+
+    # this is called when parm[0]=='mode'
+    # parm[1] is the new mode
+    def apply(self, parmlist: list[str]) -> None:
+        if len(parmlist) == 2:
+            if parmlist[1] == "machine":
+                self._ci._echo = False
+                console_buffered(True)
+            elif parmlist[1] == "human":
+                self._ci._echo = True
+                console_buffered(False)
+
+class CmdScene(CommandTemplate):
+    """Save and recall scene presets.
+
+    A scene is the configuration of the commands, and the patterns running on
+    the LED strips, kept in a small text file on the controller's flash. It
+    is recalled with a single command:
+
+        $scene,<n>
+
+    and the current state is saved as scene `n` with:
+
+        $scene,save,<n>
+
+    A scene file is named `scene<n>.txt`, and it has one command line per
+    line, without the `$`. Blank lines and lines starting with `#` are skipped.
+    It can also be written on the host and copied to the controller:
+
+        # pattern 1 - scrolling bands, dimmed, with the charger indicator
+        config,strips,0,dim,2048
+        config,ind,0,417,003200,320000,000032
+        config,bands,256,20,5,0,0,5,0,0,0,5
+        bands
+
+    Saving writes the last config of every command that was configured since
+    reset, and the command that started each running pattern. One-shot
+    commands like `range` are not saved.
+
+    A scene is recalled all or nothing. Every line is checked first,
+    including the config values (see
+    [validate_config][ledstrip.cmdtemplate.CommandTemplate.validate_config]),
+    and if any line is not a valid command, or the file is missing, the reply is
+    `$ERR` and nothing is changed. Otherwise all of the configs are applied,
+    patterns that are running but not in the scene are stopped, and then the
+    scene's patterns are started. A hand-written scene can also have one-shot
+    lines like `range`. If one of those can not be applied, for example
+    because its strip's queue is full, the rest of the scene is still applied
+    but the reply is `$ERR`.
+
+    A scene can also be loaded at boot, see `main.py`.
+    """
+    helpstr = "scene,[save,]<n>"
+    oneshot = True
+
+    def __init__(self, cmdinterface: "CmdInterface") -> None:
+        super().__init__()
+        self._ci = cmdinterface
+
+    @staticmethod
+    def filename(num: int) -> str:
+        """Return the name of the file for scene `num`."""
+        return f"scene{num}.txt"
+
+    def validate(self, parmlist: list[str]) -> bool:
+        if len(parmlist) == 3 and parmlist[1] == "save":
+            return convert_parms(parmlist, "si", 1)
+        return convert_parms(parmlist, "i", 1)
+
+    # this is called when parm[0]=='scene'
+    # parm[1] is the scene number, or "save" and parm[2] is the scene number
+    def apply(self, parmlist: list) -> None:
+        if parmlist[1] == "save":
+            self.save(parmlist[2])
+        elif not self.load(parmlist[1]):
+            raise ValueError(parmlist[1])
+
+    def lines(self) -> list[str]:
+        """Return the command lines that make up the current scene."""
+        ci = self._ci
+        lines = [format_parms(parmlist, ci._cmds[parmlist[1]].cfgschema, 2)
+                 for parmlist in ci._cmds["config"].saved.values()]
+        for strip in ci._strips:
+            line = ci._started.get(strip._user)
+            if line:
+                lines.append(line)
+        return lines
+
+    def save(self, num: int) -> None:
+        """Save the current scene to a file.
+
+        The file is written under a temporary name and then renamed, so a
+        reset while saving does not leave a broken scene.
+
+        :param num: scene number
+        """
+        name = self.filename(num)
+        with open(name + ".tmp", "w") as scenefile:
+            for line in self.lines():
+                scenefile.write(line)
+                scenefile.write("\n")
+        os.rename(name + ".tmp", name)
+
+    def load(self, num: int) -> bool:
+        """Recall a scene from its file.
+
+        :param num: scene number
+        :return: False if the file is missing or has a line that is not valid,
+            in which case nothing is changed, or if a line could not be
+            started
+        """
+        ci = self._ci
+        try:
+            with open(self.filename(num)) as scenefile:
+                text = scenefile.read()
+        except OSError:
+            return False
+
+        # check every line before anything is changed
+        scene = []
+        for line in text.split("\n"):
+            line = line.strip()
+            if not line or line[0] == "#":
+                continue
+            parmlist = line.split(",")
+            cmdobj = ci._cmds.get(parmlist[0])
+            if (cmdobj is None or cmdobj is self
+                    or not cmdobj.validate(parmlist)):
+                return False
+            scene.append((cmdobj, parmlist))
+
+        config = ci._cmds["config"]
+        for cmdobj, parmlist in scene:
+            if cmdobj is config:
+                config.apply(parmlist)
+        # stop the patterns that are not part of the scene
+        for strip in ci._strips:
+            user = strip._user
+            if user is not None and all(user is not cmdobj
+                                        for cmdobj, _ in scene):
+                user.stop()
+        started = True
+        for cmdobj, parmlist in scene:
+            if cmdobj is not config:
+                if ci.dispatch(cmdobj, parmlist) != "$OK":
+                    started = False
+        return started
+
 #
 # removed CmdAdd class for now because it is not used and nuisance to
 # maintain, plus it uses code space. If it is needed again, perhaps move to
@@ -217,6 +528,17 @@ def __init__(self) -> None:
         #self._cmds["add"] = CmdAdd(self)
         self._cmds["stop"] = CmdStop(self._cmds)
         self._cmds["freemem"] = CmdFreeMem()
+        self._cmds["mode"] = CmdMode(self)
+        self._cmds["scene"] = CmdScene(self)
+
+        # handles command lines with more than one command
+        self._batch = CmdBatch(self._cmds)
+
+        # LED strips used by commands, to check for idle
+        self._strips = []
+
+        # command line that started each pattern, to save in a scene
+        self._started = {}
 
         # temporary additional commands
         #self._cmds["meter"] = LedMeter()
@@ -225,18 +547,35 @@ def __init__(self) -> None:
         # used for testing to allow run loop to exit
         self._exit = False
 
+        # echo input characters back to the console (see CmdMode)
+        self._echo = True
+
         self._cp = cmdparser.CmdParser()
         console_init()
 
-    def add_cmd(self, cmdname: str, cmdobj: CommandTemplate) -> None:
+    def add_cmd(self, cmdname: str, cmdobj: CommandTemplate,
+                alias: str=None) -> None:
         """Adds a new command of the specified class to the command list.
 
+        A command can also have an alias, which is a short name such as a
+        single letter or a number. The alias can be used anywhere the command
+        name is used, and saves sending and parsing the full name for
+        commands that are sent often.
+
         :param cmdname: name of the new command, must be unique from other
             command names
         :param cmdobj: a [CommandTemplate][ledstrip.cmdtemplate] subclass
             implementing the new command
+        :param alias: optional short name for the command, must also be
+            unique from other command names
         """
         self._cmds[cmdname] = cmdobj
+        strip = cmdobj._strip
+        if strip is not None and strip not in self._strips:
+            self._strips.append(strip)
+        if alias:
+            cmdobj.alias = alias
+            self._cmds[alias] = cmdobj
 
     def setup(self, param_list: list[str]) -> CommandTemplate:
         """Setup to start running a new command.
@@ -248,19 +587,48 @@ def setup(self, param_list: list[str]) -> CommandTemplate:
 
         It sends `$OK` or `$ERR` to the serial console as a reply. If a valid
         command is dispatched, the CommandTemplate object will be returned.
-        If the command is not valid then `None` is returned.
+        If the command is not valid then `None` is returned. A command is not
+        valid if its name is not known, or if its parameters do not match the
+        command's schema. The parameters are converted according to the
+        schema before the command is dispatched.
+
+        One-shot commands are not run as a new task. If they do not use an
+        LED strip, or if the strip is not in use, they are carried out before
+        the reply is sent. Otherwise they are queued on the strip (see
+        [LedStrip][ledstrip.ledstrip]). If the queue is full the reply is
+        `$BUSY` and `None` is returned.
+
+        If the command is already running, it is first offered the new
+        parameters through its `update()` method. If it takes them, nothing
+        else is started.
+
+        If the command line holds a batch of commands separated by ";" then
+        the whole batch is dispatched together (see
+        [CmdBatch][ledstrip.cmdif.CmdBatch]).
 
         :param param_list: string list of all the command line parameters,
             including the command name which is the first item.
         :return: the [CommandTemplate][ledstrip.cmdtemplate] subclass that
             implements the command, or `None`
         """
-        if param_list[0] in self._cmds:
+        if ";" in param_list:
+            # batch of one-shot commands, all or nothing
+            batch = self._batch.split(param_list)
+            if batch is None:
+                console_writeln("$ERR")
+                return None
+            reply = self._batch.submit(batch)
+            console_writeln(reply)
+            return self._batch if reply == "$OK" else None
+        elif param_list[0] in self._cmds:
             # if new command is valid, schedule it to run immediately
             cmdobj = self._cmds[param_list[0]]
-            asyncio.create_task(cmdobj.run(param_list))
-            console_writeln("$OK")
-            return cmdobj
+            if not cmdobj.validate(param_list):
+                console_writeln("$ERR")
+                return None
+            reply = self.dispatch(cmdobj, param_list)
+            console_writeln(reply)
+            return cmdobj if reply == "$OK" else None
         elif param_list[0] == "exit":
             self._exit = True
         else:
@@ -268,6 +636,40 @@ def setup(self, param_list: list[str]) -> CommandTemplate:
             console_writeln("$ERR")
             return None
 
+    def dispatch(self, cmdobj: CommandTemplate, param_list: list) -> str:
+        """Start a command whose parameters were already checked.
+
+        This is the part of [setup][ledstrip.cmdif.CmdInterface.setup] after
+        the command is found and validated. It does not write a reply.
+
+        :param cmdobj: the command to start
+        :param param_list: the converted command line parameters
+        :return: the reply for the command, `$OK`, `$BUSY` or `$ERR`
+        """
+        if cmdobj.update(param_list):
+            # command is already running and took the new parameters
+            pass
+        elif cmdobj.oneshot:
+            # one-shot commands run right here, or are queued on the strip
+            try:
+                if cmdobj._strip is None:
+                    cmdobj.apply(param_list)
+                elif not cmdobj._strip.submit(cmdobj, param_list):
+                    return "$BUSY"
+            except Exception:
+                return "$ERR"
+        else:
+            self._started[cmdobj] = format_parms(param_list, cmdobj.schema, 1)
+            asyncio.create_task(cmdobj.run(param_list))
+        return "$OK"
+
+    def idle(self) -> bool:
+        """Return True if no LED strip is in use or has commands waiting."""
+        for strip in self._strips:
+            if strip.busy:
+                return False
+        return True
+
     async def run(self) -> None:
         """Command line processing and run loop.
 
@@ -279,7 +681,12 @@ async def run(self) -> None:
 
         The run loop processes incoming data from the command line, calls the
         parser, and dispatches commands when a complete command line is
-        received.
+        received. Any buffered console output is flushed once per pass.
+
+        When none of the LED strips are in use, the loop goes idle. The strip
+        state machines are stopped, and the loop waits for console input
+        instead of polling every millisecond, so the processor can sleep until
+        the next command arrives.
 
         Command errors are silently ignored.
         """
@@ -287,14 +694,28 @@ async def run(self) -> None:
 
         # loop forever, with a yield
         while not self._exit:
-            # yield
-            await asyncio.sleep_ms(1)  # type: ignore[attr-defined]
-            # process any new incoming characters
-            incoming = console_read()
-            if incoming:
+            if self.idle():
+                # nothing is running, stop the strips and wait for input
+                # without waking up
+                for strip in self._strips:
+                    strip.sleep()
+                incoming = await console_aread()
+            else:
+                # yield
+                await asyncio.sleep_ms(1)  # type: ignore[attr-defined]
+                # process any new incoming characters
+                incoming = console_read()
+            if incoming and self._echo:
                 console_write(incoming)     # echo to console
+
+            # the input can hold more than one command if it was read in bulk
+            while incoming:
                 cmdargs = self._cp.process_input(incoming)
 
                 # if there is a complete new command line, then setup new command
                 if cmdargs:
                     self.setup(cmdargs)
+                incoming = self._cp.rest
+
+            # write anything that was buffered during this pass
+            console_flush()
@@ -44,6 +44,11 @@
   will probably get garbage out
 - it does not echo anything, that is up to client if needed
 - everything outside of $...\\n is ignored
+- more than one command can be put in a single line by separating the
+  commands with a semicolon ';'. The semicolon is returned as its own ";"
+  arg between the args of each command, so that `$foo,1;bar,2\\n` is returned
+  as `["foo", "1", ";", "bar", "2"]`. It is up to the client to decide what
+  a batch of commands means.
 
 A note about efficiency: it creates bytearrays during the process which are
 then eventually freed. If it causes a memory usage or gc problem then it can be
@@ -62,14 +67,17 @@
 
 while (processing main loop):
     ...
-    if incoming_bytes_are_available():
-        incoming = get_the_incoming_bytes()
+    incoming = get_the_incoming_bytes()
+    # there can be more than one command in the input
+    while incoming:
         cmdargs = cp.process_input(incoming)
         # if not None, then there is new args
         if cmdargs:
             numargs = len(cmdargs)
             process_command(cmdargs)
             ...
+        # anything left after the command that was returned
+        incoming = cp.rest
     ...
 ```
 """
@@ -77,6 +85,8 @@
 class CmdParser():
     def __init__(self):
         self._buf = None
+        # input that came after the end of the last returned command line
+        self.rest = None
 
     # INTERNAL METHOD
     # break apart the command line and return args as strings
@@ -85,6 +95,7 @@ def __init__(self):
     # contents should be comma separated list of args, no spaces
     # expects only ascii input
     # any alpha will be converted to lower case
+    # a ';' separating batched commands is returned as its own ";" arg
     # returns args as list of strings (one or more)
     # or an empty list which means there was an error
     def parse_cmd(self, cmdline):
@@ -99,6 +110,9 @@ def parse_cmd(self, cmdline):
             #cmdstr = cmdline.lower()
             cmdstr = cmdline
             cmdstr = cmdstr[1:-1]  # remove terminators
+            # batched commands, make each separator its own arg
+            if ';' in cmdstr:
+                cmdstr = cmdstr.replace(';', ',;,')
             cmdargs = cmdstr.split(',')
             # return the parsed input arg
             return cmdargs
@@ -108,10 +122,14 @@ def parse_cmd(self, cmdline):
     # INTERNAL METHOD
     # inbuf is string one or more characters
     # returns None or string containing properly framed command
+    # any input after the end of the returned command is kept in self.rest
+    # so that the client can pass it back in. this matters when input is read
+    # in bulk and there may be more than one command in the input
     # this method is separated from process_input() to make it easier to test
     def assemble_cmd(self, inbuf):
+        self.rest = None
         # process all incoming characters
-        for ch in inbuf:
+        for idx, ch in enumerate(inbuf):
             # if it is a $ that is start of a command
             if ch == '$':
                 self._buf = ch
@@ -124,6 +142,8 @@ def assemble_cmd(self, inbuf):
                     self._buf += '\n'
                     ret = self._buf
                     self._buf = None  # reset the input buffer
+                    if idx + 1 < len(inbuf):
+                        self.rest = inbuf[idx+1:]
                     return ret
                 # any other character just store it
                 else:
@@ -134,6 +154,8 @@ def assemble_cmd(self, inbuf):
     # inbuf is string, one or more characters
     # returns None or list of command line components as strings
     # empty list means there was an error
+    # if inbuf held more than just the returned command, the remaining input
+    # is in self.rest and should be passed back in
     def process_input(self, inbuf):
         buf = self.assemble_cmd(inbuf)
         if buf:
@@ -0,0 +1,84 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+"""strips (CmdStrips) - show and configure the LED strips.
+
+This command prints a simple table of the instantiated
+[LedStrip][ledstrip.ledstrip.LedStrip] objects for diagnostic purposes:
+
+    $strips
+
+It also sets options for each LED strip, one option at a time:
+
+    $config,strips,<idx>,<option>,<value>
+
+* idx - the LED strip number, as shown by `$strips`
+* option - the name of the option, see below
+* value - the option value
+
+The options are:
+
+* fade - crossfade time in milliseconds when a pattern replaces another
+  pattern on the strip. 0 turns crossfade off
+* dim - brightness of the whole strip, 0-4096. 4096 is full brightness. The
+  strip uses temporal dithering, so low levels still fade smoothly
+* trail - fade factor, 1-255, applied to the whole strip after every frame.
+  Whatever a pattern draws leaves a trail, longer for higher values. 0 turns
+  trails off
+
+An unknown strip number or option is an error.
+"""
+
+from console import console_writeln
+from cmdtemplate import CommandTemplate
+from ledstrip import LedStrip
+
+class CmdStrips(CommandTemplate):
+    helpstr = "show LED strip resources"
+    cfgstr = "idx,option,value"
+    schema = ""
+    cfgschema = "isi"
+    cfgkey = 2
+    oneshot = True
+
+    def __init__(self, ledstrips: list[LedStrip]) -> None:
+        super().__init__(strip=None)
+        self._strips = ledstrips
+
+    _options = ("fade", "dim", "trail")
+
+    def validate_config(self, cfglist: list[str]) -> bool:
+        return (super().validate_config(cfglist)
+                and 0 <= cfglist[2] < len(self._strips)
+                and cfglist[3] in self._options)
+
+    # cfglist[2] - strip index
+    # cfglist[3] - option name
+    # cfglist[4] - option value
+    def config(self, cfglist: list[str]) -> None:
+        strip = self._strips[cfglist[2]]
+        option = cfglist[3]
+        value = cfglist[4]
+        if option == "fade":
+            strip.fade_ms = max(value, 0)
+        elif option == "dim":
+            strip.set_dim(value)
+        elif option == "trail":
+            strip.set_trail(value)
+        else:
+            raise ValueError(option)
+
+    def apply(self, parmlist: list[str]) -> None:
+        for idx, strip in enumerate(self._strips):
+            console_writeln(f"{idx}: {str(strip)}")
@@ -12,6 +12,71 @@
 # OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
 # PERFORMANCE OF THIS SOFTWARE.
 
+def convert_parms(parmlist: list, schema: str, first: int) -> bool:
+    """Check and convert command parameters using a parameter schema.
+
+    The schema is a string with one character for the type of each parameter:
+
+    * `i` - decimal integer
+    * `x` - hex integer
+    * `s` - string, left as is
+
+    If the last character of the schema is `*` then the type before it can
+    repeat any number of times, including zero. For example `"ii"` is exactly
+    two integers, and `"s*"` is any number of strings.
+
+    The integer parameters are converted in place in `parmlist`.
+
+    :param parmlist: list of parameters, as strings
+    :param schema: parameter schema, or `None` to skip the checks
+    :param first: index in `parmlist` of the first parameter to check
+    :return: True if the parameters match the schema
+    """
+    if schema is None:
+        return True
+    numparms = len(parmlist) - first
+    if schema and schema[-1] == "*":
+        fixed = len(schema) - 2
+        if numparms < fixed:
+            return False
+    else:
+        fixed = len(schema)
+        if numparms != fixed:
+            return False
+    try:
+        for idx in range(numparms):
+            ptype = schema[idx if idx < fixed else fixed]
+            if ptype == "i":
+                parmlist[first + idx] = int(parmlist[first + idx])
+            elif ptype == "x":
+                parmlist[first + idx] = int(parmlist[first + idx], 16)
+    except ValueError:
+        return False
+    return True
+
+def format_parms(parmlist: list, schema: str, first: int) -> str:
+    """Make a command line from a converted parameter list.
+
+    This undoes [convert_parms][ledstrip.cmdtemplate.convert_parms], so that
+    a command can be saved and sent again later. Hex integers are written
+    back as hex. The line has no `$` and no line ending.
+
+    :param parmlist: list of parameters, as strings or converted integers
+    :param schema: parameter schema the list was converted with, or `None`
+    :param first: index in `parmlist` of the first parameter in the schema
+    :return: the parameters separated by commas
+    """
+    fixed = len(schema) - 2 if schema and schema[-1] == "*" else len(schema or "")
+    parms = []
+    for idx, parm in enumerate(parmlist):
+        pidx = idx - first
+        if (schema and pidx >= 0 and isinstance(parm, int)
+                and schema[pidx if pidx < fixed else fixed] == "x"):
+            parms.append("%x" % parm)
+        else:
+            parms.append(str(parm))
+    return ",".join(parms)
+
 class CommandTemplate():
     """
     CommandTemplate for implementing commands.
@@ -34,6 +99,14 @@ class MyCommand(CommandTemplate):
     is an optional method, `config()` which is only needed if the new command
     has configuration attributes. Each of these is documented below.
 
+    A command that finishes without waiting (a "one-shot" command, like
+    `range` or `help`) can instead set the class attribute `oneshot` to `True`
+    and implement `apply()` in place of `run()`. One-shot commands are not run
+    as a task. The command interface calls `apply()` directly, and takes care
+    of the LED strip resource lock and of showing the result. One-shot
+    commands can also be combined with other one-shot commands in a batch
+    which is shown with a single repaint.
+
     If the command is an LED pattern then at object creation you must also
     provide an existing [LedStrip][ledstrip.ledstrip] that the command pattern
     will use for display. If the command does not use any LED resources, then
@@ -70,12 +143,88 @@ class MyCommand(CommandTemplate):
     configuration parameters, you can just use this default.
     """
 
+    schema = None
+    """Parameter schema for the command.
+
+    This describes the type of each parameter after the command name, see
+    [convert_parms][ledstrip.cmdtemplate.convert_parms]. The command interface
+    checks the parameters against the schema and converts the integers before
+    the command is started, so `run()` and `apply()` are passed integers
+    instead of strings. A command that does not match is answered with `$ERR`
+    and not started. If this is `None`, there is no checking and all the
+    parameters are passed as strings.
+    """
+
+    cfgschema = None
+    """Parameter schema for the `config()` parameters.
+
+    This works the same as `schema`, for the parameters after the name of the
+    command being configured.
+    """
+
+    cfgkey = 0
+    """Number of leading `config()` parameters that pick what is configured.
+
+    The last config of each command is kept so it can be saved in a scene
+    (see [CmdScene][ledstrip.cmdif.CmdScene]). Most commands have a single
+    config, and a new config replaces the old one. A command like `strips`,
+    where the first parameters pick a strip and an option, sets this to the
+    number of those parameters, so that a config is only replaced by one for
+    the same strip and option.
+    """
+
+    oneshot = False
+    """Set to `True` if the command is implemented by `apply()`.
+
+    A one-shot command does all of its work in `apply()`, without looping or
+    waiting. This allows the command to be batched with other one-shot
+    commands.
+    """
+
+    coalesce = False
+    """Set to `True` if only the latest value of a one-shot command matters.
+
+    One-shot commands wait in a short queue for the LED strip. If this is set,
+    a new command replaces an older copy of itself that is still waiting, like
+    a meter value that has already been superseded.
+    """
+
     # if LedStrip is not provided then the command should not try to render
     # any led strip output. this can be used for non-rendering commands like
     # help and diagnostics
     def __init__(self, strip: LedStrip=None) -> None:
         self._strip = strip
         self._stoprequest = False
+        self.alias = None   # short name for the command, set by add_cmd
+
+    def validate_config(self, cfglist: list[str]) -> bool:
+        """Check and convert the `config()` parameters.
+
+        This is called by the `config` command before `config()`. The default
+        checks the parameters against `cfgschema`. A command whose `config()`
+        can still reject the values, for example a name that is not one of
+        its options, should override this to check them too, so that a
+        `config()` that was checked does not fail. Scenes depend on this to
+        be applied all or nothing.
+
+        :param cfglist: the config command line parameters, starting with
+            `"config"` and the command name, which are converted in place
+        :return: True if the config parameters are valid
+        """
+        return convert_parms(cfglist, self.cfgschema, 2)
+
+    def validate(self, parmlist: list[str]) -> bool:
+        """Check and convert the command parameters.
+
+        This is called by the command interface before the command is started.
+        The default checks the parameters against `schema`. A subclass only
+        needs to override this if it needs some other checking.
+
+        :param parmlist: the command line parameters, including the command
+            name, which are converted in place
+        :return: True if the command parameters are valid
+        """
+        return convert_parms(parmlist, self.schema, 1)
 
     # cfglist - list-like of strings with config values
     # cfglist[0] is "config" and cfglist[1] is command name
@@ -103,9 +252,10 @@ def config(self, cfglist: list[str]) -> None:
         underlying command class. In this case, the implementation of `config`
         could have conditional behavior depending on the name of the command.
 
-        All the parameters are passed as strings, but they are almost certainly
-        integers, so they need to be converted when they are stored, using
-        `int(v)`.
+        If the command sets `cfgschema`, then the parameters have already been
+        checked and the integers converted. Otherwise all the parameters are
+        passed as strings, but they are almost certainly integers, so they
+        need to be converted when they are stored, using `int(v)`.
 
         *Example Implementation*
 
@@ -124,6 +274,55 @@ def config(self, cfglist):
         """
         pass
 
+    # parmlist - list-like of strings with run-time parameters
+    # parmlist[0] is command name
+    # so command parms start with parmlist[1]
+    #
+    # This method is only used by one-shot commands. It must not wait or
+    # yield, and it must not show the LED strip or touch the resource lock.
+    #
+    def apply(self, parmlist: list[str]) -> None:
+        """Optional method to carry out a one-shot command.
+
+        This method is used instead of `run()` by commands that set `oneshot`
+        to `True`. It is passed the same parameter list as `run()`, and writes
+        the pixels for the command to the pixel buffer of `self._strip`. If
+        the command does not use an LED strip, it just does its work, like
+        printing to the console.
+
+        It is a normal (not `async`) method, and it is called while the caller
+        already holds the LED strip resource lock. It must not acquire or
+        release the lock, and it must not call `show()`. The caller takes care
+        of both, which is what allows several one-shot commands to be applied
+        to a strip and then shown once.
+
+        *Example Implementation*
+
+            oneshot = True
+
+            def apply(self, parmlist):
+                # $mycommand,pixel
+                self._strip.buf[int(parmlist[1])] = 0x101010
+        """
+        pass
+
+    def update(self, parmlist: list[str]) -> bool:
+        """Optional method to pass new parameters to a running command.
+
+        This is called by the command interface before the command is started
+        or applied. A command that keeps running, like an animation that moves
+        toward the last value it was given, can take the new parameters here
+        instead of being started again. It is a normal (not `async`) method
+        and must not wait.
+
+        The default does nothing and returns `False`.
+
+        :param parmlist: the command line parameters, already converted
+        :return: True if the running command took the new parameters, False
+            if the command should be started as usual
+        """
+        return False
+
     # parmlist - list-like of strings with run-time parameters
     # parmlist[0] is command name
     # so command parms start with parmlist[1]
@@ -151,10 +350,12 @@ async def run(self, parmlist: list[str]) -> None:
 
         The `run` method should carry out any actions needed for the command.
         If the command is a one-shot, then just perform the statements in
-        sequence and return. If the command runs in a loop, or does anything
-        that takes a long time to complete, then it must have some kind of
-        coroutine yield in the loop or long-running algorithm. The most common
-        yield is a sleep, like this:
+        sequence and return, or better, set `oneshot` and implement `apply()`
+        instead. The command interface never calls `run()` for a one-shot
+        command. If the command runs in a loop, or does anything that takes a
+        long time to complete, then it must have some kind of coroutine yield
+        in the loop or long-running algorithm. The most common yield is a
+        sleep, like this:
 
             await asyncio.sleep_ms(1)
 
@@ -0,0 +1,255 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+"""
+config_store - Keep command configs over a reset.
+
+Normally a config set with `$config` only lasts until the controller is
+reset, and the host has to send every config again after each power up. A
+[ConfigStore][ledstrip.config_store.ConfigStore] keeps the last config of
+each command in a small binary file on the controller's flash, and puts them
+back at boot.
+
+The configs are stored already converted, so restoring them at boot does not
+parse any text. Each config is passed straight to the command's `config()`.
+
+Writes are batched. A config change does not write the file right away.
+The file is written once the configs have not changed for a few seconds, so
+a host that sends a burst of configs causes a single write. The file is also
+not written if its contents would be the same as what is already stored.
+The new file is written under a temporary name and then renamed, so a reset
+in the middle of a write leaves the old file in place.
+
+To go back to the built-in configs, delete the file (`config.bin`) from the
+controller and reset it.
+
+**File format**
+
+All values are little endian. The file starts with a 12 byte header:
+
+| bytes | type   | value                                |
+|-------|--------|--------------------------------------|
+| 0-3   | bytes  | `LSCF`                               |
+| 4     | uint8  | format version, 1                    |
+| 5     | uint8  | reserved, 0                          |
+| 6-7   | uint16 | number of records                    |
+| 8-11  | uint32 | CRC-32 of all the records            |
+
+The header is followed by one record for each config:
+
+* uint8 length of the command name, then the name
+* uint8 number of config parameters, then for each parameter either `i`
+  and an int32, or `s`, a uint8 length and the string
+
+If the header or the CRC does not match, the whole file is ignored.
+"""
+
+import asyncio
+import binascii
+import os
+import struct
+import time
+
+MAGIC = b"LSCF"
+VERSION = 1
+HEADER = "<4sBBHI"
+HEADER_SIZE = 12
+_INT = ord("i")
+_STR = ord("s")
+
+FILENAME = "config.bin"
+"""Default name of the config file."""
+
+SAVE_DELAY = 5000
+"""Milliseconds without a config change before the file is written."""
+
+def _storable(parmlist: list) -> bool:
+    # a config fits in a record if its ints fit in an int32 and its name and
+    # strings are at most 255 bytes
+    if len(parmlist[1]) > 255 or len(parmlist) - 2 > 255:
+        return False
+    for parm in parmlist[2:]:
+        if isinstance(parm, int):
+            if parm < -0x80000000 or parm > 0x7FFFFFFF:
+                return False
+        elif len(parm.encode()) > 255:
+            return False
+    return True
+
+def encode(configs: list) -> bytes:
+    """Make the contents of a config file.
+
+    A config that does not fit in a record, such as one with an int that
+    does not fit in an int32, is left out.
+
+    :param configs: list of converted config parameter lists, each starting
+        with `"config"` and the command name
+    :return: the file contents, header and records
+    """
+    body = bytearray()
+    count = 0
+    for parmlist in configs:
+        if not _storable(parmlist):
+            continue
+        count += 1
+        name = parmlist[1].encode()
+        body += struct.pack("<B", len(name))
+        body += name
+        body += struct.pack("<B", len(parmlist) - 2)
+        for parm in parmlist[2:]:
+            if isinstance(parm, int):
+                body += struct.pack("<Bi", _INT, parm)
+            else:
+                value = parm.encode()
+                body += struct.pack("<BB", _STR, len(value))
+                body += value
+    header = struct.pack(HEADER, MAGIC, VERSION, 0, count,
+                         binascii.crc32(body))
+    return header + body
+
+def decode(data: bytes) -> list:
+    """Read the configs from the contents of a config file.
+
+    :param data: the file contents
+    :return: list of config parameter lists, each starting with `"config"` and
+        the command name, or None if the file is not valid
+    """
+    if len(data) < HEADER_SIZE:
+        return None
+    magic, version, _, count, crc = struct.unpack_from(HEADER, data)
+    body = memoryview(data)[HEADER_SIZE:]
+    if magic != MAGIC or version != VERSION or binascii.crc32(body) != crc:
+        return None
+    configs = []
+    pos = HEADER_SIZE
+    try:
+        for _ in range(count):
+            size = data[pos]
+            parmlist = ["config", str(data[pos + 1:pos + 1 + size], "utf-8")]
+            pos += 1 + size
+            numparms = data[pos]
+            pos += 1
+            for _ in range(numparms):
+                if data[pos] == _INT:
+                    parmlist.append(struct.unpack_from("<i", data, pos + 1)[0])
+                    pos += 5
+                else:
+                    size = data[pos + 1]
+                    parmlist.append(str(data[pos + 2:pos + 2 + size], "utf-8"))
+                    pos += 2 + size
+            configs.append(parmlist)
+    except (IndexError, ValueError):
+        return None
+    return configs
+
+class ConfigStore():
+    """Keeps the command configs in a file, and restores them at boot.
+
+    The store watches the `config` command of the command interface. Call
+    [load][ledstrip.config_store.ConfigStore.load] at boot to restore the
+    configs, and start [run][ledstrip.config_store.ConfigStore.run] as a task
+    to write changes.
+
+    :param cmdinterface: the command interface whose configs are kept
+    :param filename: name of the config file
+    :param delay_ms: milliseconds without a change before the file is written
+    """
+
+    def __init__(self, cmdinterface: "CmdInterface",
+                 filename: str=FILENAME, delay_ms: int=SAVE_DELAY) -> None:
+        self._config = cmdinterface._cmds["config"]
+        self._config.store = self
+        self._filename = filename
+        self._delay = delay_ms
+        self._crc = None            # CRC of the records in the file
+        self._changed = asyncio.Event()
+        self._lastchange = 0
+        self.writes = 0
+        """Number of times the file was written."""
+
+    def changed(self) -> None:
+        """Note that a config changed. Called by the `config` command."""
+        self._lastchange = time.ticks_ms()
+        self._changed.set()
+
+    def load(self) -> int:
+        """Restore the configs from the file.
+
+        Each config is applied through the `config` command, so the commands
+        get the same call as for a `$config` from the host. A config that
+        the command does not take any more, for example because the command
+        was removed, is skipped.
+
+        :return: number of configs restored, 0 if there is no valid file
+        """
+        try:
+            with open(self._filename, "rb") as cfgfile:
+                data = cfgfile.read()
+        except OSError:
+            return 0
+        configs = decode(data)
+        if configs is None:
+            return 0
+        self._crc = struct.unpack_from(HEADER, data)[4]
+        restored = 0
+        for parmlist in configs:
+            if parmlist[1] not in self._config._dict:
+                continue
+            try:
+                self._config.apply(parmlist)
+                restored += 1
+            except Exception:
+                pass
+        return restored
+
+    def save(self) -> bool:
+        """Write the configs to the file, if they are not already stored.
+
+        :return: True if the file was written
+        """
+        data = encode(list(self._config.saved.values()))
+        crc = struct.unpack_from(HEADER, data)[4]
+        if crc == self._crc:
+            return False
+        tmpname = self._filename + ".tmp"
+        with open(tmpname, "wb") as cfgfile:
+            cfgfile.write(data)
+        os.rename(tmpname, self._filename)
+        self._crc = crc
+        self.writes += 1
+        return True
+
+    async def run(self) -> None:
+        """Write the file when the configs have settled after a change.
+
+        This is meant to be started as a task. It does not wake up at all
+        while nothing changes.
+        """
+        while True:
+            await self._changed.wait()
+            self._changed.clear()
+            # wait until there have been no changes for the whole delay
+            while True:
+                left = self._delay - time.ticks_diff(time.ticks_ms(),
+                                                     self._lastchange)
+                if left <= 0:
+                    break
+                await asyncio.sleep_ms(left)
+            self._changed.clear()
+            # a failed write must not stop the task, or no later change
+            # would be saved either
+            try:
+                self.save()
+            except Exception:
+                pass
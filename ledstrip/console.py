@@ -0,0 +1,57 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+"""
+console - Selects the console IO implementation.
+
+The command interface does its console IO through the functions provided by
+this module:
+
+- console_init
+- console_write
+- console_writeln
+- console_read
+- console_aread
+- console_buffered
+- console_flush
+
+The functions come from one of the console implementations, which all provide
+the same functions:
+
+- [`console_std`][ledstrip.console_std] - stdin/stdout over the USB serial
+  port (default)
+- [`console_uart`][ledstrip.console_uart] - one of the hardware UARTs
+
+The implementation is selected at startup. By default `console_std` is used.
+To use the hardware UART instead, copy a file named `console_cfg.py` to the
+board that contains:
+
+``` py
+CONSOLE = "uart"
+```
+
+If you import this module using ``from console import *`` then you can
+get these function names directly into the namespace and will not need to
+use the module.fn notation.
+"""
+
+try:
+    from console_cfg import CONSOLE
+except ImportError:
+    CONSOLE = "std"
+
+if CONSOLE == "uart":
+    from console_uart import *
+else:
+    from console_std import *
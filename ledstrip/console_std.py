@@ -22,16 +22,27 @@
 - console_write
 - console_writeln
 - console_read
+- console_aread
+- console_buffered
+- console_flush
+
+Output can optionally be buffered, so that everything written during one pass
+of the command loop goes out in a single write, using ``console_flush``. This
+cuts down the number of USB transfers when the console is used by another
+program instead of a person.
 
 If you import this module using ``from console_std import *`` then you can
 get these function names directly into the namespace and will not need to
 use the module.fn notation.
 """
 
+import asyncio
 import select
 import sys
 
 console_poll = None
+console_reader = None
+console_outbuf = None   # list of pending strings when output is buffered
 
 # initialize whatever we are using for serial comms
 def console_init():
@@ -50,9 +61,15 @@ def console_write(printstr: str) -> None:
     Tha string parameter is written to the console without interpretation or
     adding any line terminators.
 
+    If output is buffered, the string is held until the next
+    ``console_flush``.
+
     :param printstr: the string to be printed to the console
     """
-    sys.stdout.write(printstr)
+    if console_outbuf is not None:
+        console_outbuf.append(printstr)
+    else:
+        sys.stdout.write(printstr)
 
 # write a line to serial console with CRLF termination
 def console_writeln(printstr: str) -> None:
@@ -63,8 +80,11 @@ def console_writeln(printstr: str) -> None:
 
     :param printstr: the string to be printed to the console
     """
-    console_write(printstr)
-    console_write("\r\n")
+    if console_outbuf is not None:
+        console_outbuf.append(printstr)
+        console_outbuf.append("\r\n")
+    else:
+        sys.stdout.write(printstr + "\r\n")
 
 def console_read() -> str:
     """Read available characters from the console input.
@@ -78,3 +98,44 @@ def console_read() -> str:
         input = sys.stdin.read(1)
         return input
     return None
+
+async def console_aread() -> str:
+    """Wait for console input.
+
+    Unlike ``console_read``, this waits until there is input. Only the calling
+    task is blocked. If no other task has anything to do, the asyncio loop
+    sleeps until a character arrives instead of waking up to poll.
+
+    :return: string of one or more characters
+    """
+    global console_reader
+    if console_reader is None:
+        console_reader = asyncio.StreamReader(sys.stdin)
+    return await console_reader.read(1)
+
+def console_buffered(enable: bool) -> None:
+    """Turn output buffering on or off.
+
+    When buffering is on, console output is held in memory until
+    ``console_flush`` is called. Turning buffering off flushes anything that
+    is still being held.
+
+    :param enable: True to buffer output, False to write it immediately
+    """
+    global console_outbuf
+    if enable:
+        if console_outbuf is None:
+            console_outbuf = []
+    else:
+        console_flush()
+        console_outbuf = None
+
+def console_flush() -> None:
+    """Write any buffered output to the console.
+
+    Everything that was buffered is written with a single write. This does
+    nothing if output is not buffered or if nothing is waiting.
+    """
+    if console_outbuf:
+        sys.stdout.write("".join(console_outbuf))
+        console_outbuf.clear()
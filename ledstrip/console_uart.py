@@ -0,0 +1,162 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+"""
+console_uart - Console IO implementation using a hardware UART.
+
+This module implements the same console functions as
+[`console_std`][ledstrip.console_std], but uses one of the RP2040 hardware
+UARTs instead of stdin/stdout:
+
+- console_init
+- console_write
+- console_writeln
+- console_read
+- console_aread
+- console_buffered
+- console_flush
+
+Using a UART leaves the USB serial port free for `mpremote` and the REPL.
+Received characters are stored by the UART driver interrupt handler in a
+ring buffer, so input is not lost while the command loop is busy.
+`console_read` does not block, and returns everything that is waiting in a
+single read instead of one character at a time.
+
+The UART and pins that are used are set by the `UART_` constants below. See
+[`console`][ledstrip.console] for how to select this implementation.
+"""
+
+import asyncio
+
+try:
+    from machine import UART, Pin
+except ImportError:
+    from tests.uart_test import UART, Pin
+
+UART_ID = 0         # hardware UART number
+UART_TX = 0         # GPIO for TX
+UART_RX = 1         # GPIO for RX
+UART_BAUD = 115200
+UART_RXBUF = 1024   # size of receive ring buffer
+UART_TXBUF = 256    # size of transmit buffer
+
+console_uart = None
+console_reader = None
+console_outbuf = None   # list of pending strings when output is buffered
+
+def console_init():
+    """Initialize serial IO console.
+
+    This should be called once at the start of the application. It sets up
+    the UART with a large receive ring buffer.
+    """
+    global console_uart
+    console_uart = UART(UART_ID, baudrate=UART_BAUD,
+                        tx=Pin(UART_TX), rx=Pin(UART_RX),
+                        rxbuf=UART_RXBUF, txbuf=UART_TXBUF)
+
+def console_write(printstr: str) -> None:
+    """Write a string to the console.
+
+    The string parameter is written to the console without interpretation or
+    adding any line terminators.
+
+    If output is buffered, the string is held until the next
+    ``console_flush``.
+
+    :param printstr: the string to be printed to the console
+    """
+    if console_outbuf is not None:
+        console_outbuf.append(printstr)
+    else:
+        console_uart.write(printstr)
+
+# write a line to serial console with CRLF termination
+def console_writeln(printstr: str) -> None:
+    """Write a string to the console with line terminator.
+
+    This performs the same function as ``console_write`` except that it also
+    add a line ending.
+
+    :param printstr: the string to be printed to the console
+    """
+    if console_outbuf is not None:
+        console_outbuf.append(printstr)
+        console_outbuf.append("\r\n")
+    else:
+        console_uart.write(printstr + "\r\n")
+
+def _decode(data: bytes) -> str:
+    # line noise or a baud rate mismatch can give bytes that are not valid
+    # text. keep only the ASCII bytes, the commands are all ASCII anyway
+    try:
+        return data.decode()
+    except UnicodeError:
+        text = bytes(ch for ch in data if ch < 0x80).decode()
+        return text if text else None
+
+def console_read() -> str:
+    """Read available characters from the console input.
+
+    Returns a string with all of the characters that are waiting in the
+    receive buffer, or ``None`` if there was nothing available.
+
+    :return: string of one or more characters, or None.
+    """
+    numchars = console_uart.any()
+    if numchars:
+        return _decode(console_uart.read(numchars))
+    return None
+
+async def console_aread() -> str:
+    """Wait for console input.
+
+    Unlike ``console_read``, this waits until there is input. Only the calling
+    task is blocked. If no other task has anything to do, the asyncio loop
+    sleeps until a character arrives instead of waking up to poll.
+
+    :return: string of one or more characters
+    """
+    global console_reader
+    if console_reader is None:
+        console_reader = asyncio.StreamReader(console_uart)
+    data = await console_reader.read(UART_RXBUF)
+    return _decode(data) if data else None
+
+def console_buffered(enable: bool) -> None:
+    """Turn output buffering on or off.
+
+    When buffering is on, console output is held in memory until
+    ``console_flush`` is called. Turning buffering off flushes anything that
+    is still being held.
+
+    :param enable: True to buffer output, False to write it immediately
+    """
+    global console_outbuf
+    if enable:
+        if console_outbuf is None:
+            console_outbuf = []
+    else:
+        console_flush()
+        console_outbuf = None
+
+def console_flush() -> None:
+    """Write any buffered output to the console.
+
+    Everything that was buffered is written with a single write. This does
+    nothing if output is not buffered or if nothing is waiting.
+    """
+    if console_outbuf:
+        console_uart.write("".join(console_outbuf))
+        console_outbuf.clear()
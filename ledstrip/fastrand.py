@@ -0,0 +1,113 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+"""
+fastrand - Fast seeded random numbers for LED patterns.
+
+The random patterns need several random values for every frame. The
+`random` module functions allocate and are fairly slow, and there is no
+easy way to get the same sequence again. This module is a small xorshift32
+generator with a fixed seed, so a pattern always produces the same frames
+after [seed][ledstrip.fastrand.seed] is called. That is useful for tests and
+benchmarks.
+
+Each call to [rand][ledstrip.fastrand.rand] returns 30 random bits, which
+fits a micropython small integer and so does not allocate. A pattern can
+split the bits between several of its random choices. The generator is
+compiled with the viper code emitter when it is available, otherwise a plain
+python version with the same results is used.
+
+[weighted_table][ledstrip.fastrand.weighted_table] builds a lookup table for
+making a weighted random choice from a few random bits, so a pattern can
+work out its probabilities once at config time instead of with a chain of
+comparisons for every frame.
+"""
+
+import array
+
+DEFAULT_SEED = 0x2545F491
+
+# generator state, one 32-bit word
+_state = array.array("I", [DEFAULT_SEED])
+
+try:
+    import micropython
+
+    @micropython.viper
+    def _xorshift(state) -> int:
+        s = ptr32(state)
+        x = uint(s[0])
+        x ^= x << 13
+        x ^= x >> 17
+        x ^= x << 5
+        s[0] = x
+        return int(x >> 2)
+
+except (ImportError, AttributeError):
+    def _xorshift(state) -> int:
+        x = state[0]
+        x ^= (x << 13) & 0xFFFFFFFF
+        x ^= x >> 17
+        x ^= (x << 5) & 0xFFFFFFFF
+        state[0] = x
+        return x >> 2
+
+def seed(value: int) -> None:
+    """Set the generator state.
+
+    :param value: new seed. The low 32 bits are used, and 0 selects the
+        default seed because xorshift can not use a 0 state.
+    """
+    value &= 0xFFFFFFFF
+    _state[0] = value if value else DEFAULT_SEED
+
+def rand() -> int:
+    """Return 30 random bits as a non-negative integer."""
+    return _xorshift(_state)
+
+def randbelow(num: int) -> int:
+    """Return a random integer from 0 up to but not including `num`.
+
+    :param num: upper limit, must be less than 16384
+    """
+    return ((rand() >> 14) * num) >> 16
+
+def weighted_table(weights: list[int], size: int=256) -> bytearray:
+    """Build a lookup table for a weighted random choice.
+
+    The table has `size` entries. Each entry is the index of one of the
+    choices in `weights`, and each choice gets a share of the entries in
+    proportion to its weight. Indexing the table with a random value below
+    `size` makes the choice.
+
+    *Example*
+
+        table = weighted_table([3, 1], 64)
+        choice = table[rand() & 63]    # 0 three times as often as 1
+
+    :param weights: relative weight for each choice, at most 256 choices
+    :param size: number of table entries
+    :return: the table
+    """
+    total = sum(weights)
+    table = bytearray(size)
+    idx = 0
+    acc = 0
+    for choice, weight in enumerate(weights):
+        acc += weight
+        end = ((acc * size) + (total // 2)) // total
+        while idx < end:
+            table[idx] = choice
+            idx += 1
+    return table
@@ -0,0 +1,190 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+"""
+frameclock - Frame timing for animated patterns.
+
+Animated patterns draw a frame, show it, and then wait for the next frame.
+If the wait is a plain sleep of the frame period, the real period becomes the
+sleep plus the time to draw and show the frame, which depends on the strip
+length and on whatever else is running. This module provides the
+[FrameClock][ledstrip.frameclock.FrameClock] which keeps an absolute deadline
+for each frame instead, so the frame rate stays the same no matter how long
+the frame took to draw.
+
+The frame start still depends on when the asyncio loop gets around to waking
+the pattern. [TimerClock][ledstrip.frameclock.TimerClock] is an optional
+replacement that uses a hardware timer interrupt to mark each frame, so the
+frame timing does not depend on the other tasks. Both clocks have the same
+interface.
+
+Usage:
+
+``` py
+clock = FrameClock()
+clock.start(20)   # 20 ms per frame
+
+while running:
+    ... draw and show
+    frames = await clock.wait()
+    # frames is normally 1, but is more if the frame was late and frames
+    # were skipped
+```
+"""
+
+import asyncio
+import time
+
+try:
+    from machine import Timer
+except ImportError:
+    from tests.timer_test import Timer
+
+class FrameClock():
+    """Keeps frame deadlines for an animated pattern.
+
+    There is one clock for each LED strip (see `LedStrip.clock`), which is
+    used by whatever pattern is running on the strip.
+
+    If a frame takes longer than the frame period, the deadline that was
+    missed is counted as an overrun. The next deadline stays in step with the
+    original schedule, and `wait()` reports how many frame periods went by,
+    so that a pattern can catch up (for example move a chase by more than one
+    pixel) and keep the same speed.
+    """
+
+    def __init__(self) -> None:
+        self._period = 0
+        self._next = 0
+        self.overruns = 0
+        """Number of times a frame deadline was missed."""
+        self.skipped = 0
+        """Number of frames that were skipped because of overruns."""
+
+    def __str__(self):
+        return f"period: {self._period}, overruns: {self.overruns}, skipped: {self.skipped}"
+
+    def start(self, period: int) -> None:
+        """Start frame timing with a new frame period.
+
+        This should be called when a pattern starts, just before drawing the
+        first frame.
+
+        :param period: frame period in milliseconds. If 0, `wait()` just
+            yields and there is no frame timing.
+        """
+        self._period = period
+        self._next = time.ticks_add(time.ticks_ms(), period)
+
+    def stop(self) -> None:
+        """Stop frame timing, for when the pattern finishes."""
+        self._period = 0
+
+    async def wait(self) -> int:
+        """Wait until the next frame deadline.
+
+        This always yields, even if the deadline has already passed.
+
+        :return: number of frame periods since the last deadline. This is 1
+            unless the frame was late.
+        """
+        period = self._period
+        if period <= 0:
+            await asyncio.sleep_ms(0)
+            return 1
+
+        delay = time.ticks_diff(self._next, time.ticks_ms())
+        if delay > 0:
+            frames = 1
+            await asyncio.sleep_ms(delay)
+        else:
+            # late, count the deadlines that were missed and catch up
+            frames = 1 + (-delay // period)
+            self.overruns += 1
+            self.skipped += frames - 1
+            await asyncio.sleep_ms(0)
+        self._next = time.ticks_add(self._next, frames * period)
+        return frames
+
+class TimerClock(FrameClock):
+    """Frame clock driven by a periodic hardware timer.
+
+    The timer callback runs in (soft) interrupt context and only counts the
+    frame and sets a `ThreadSafeFlag`. The pattern waits on the flag, so it
+    is woken as soon as the asyncio loop is free rather than on the next
+    sleep expiry, and the frame starts do not drift.
+
+    The interface is the same as [FrameClock][ledstrip.frameclock.FrameClock],
+    so a strip can use either one.
+
+    :param timer_id: the hardware timer to use. The default of -1 is a
+        virtual timer, which is what the RP2040 port provides.
+    """
+
+    def __init__(self, timer_id: int=-1) -> None:
+        super().__init__()
+        self._timer = Timer(timer_id)
+        self._flag = asyncio.ThreadSafeFlag()
+        self._ticks = 0     # frames counted by the timer callback
+        self._seen = 0      # frames already returned by wait()
+
+    def _tick(self, timer) -> None:
+        # timer callback, keep it short and do not allocate
+        self._ticks += 1
+        self._flag.set()
+
+    def start(self, period: int) -> None:
+        """Start the timer with a new frame period.
+
+        :param period: frame period in milliseconds. If 0, the timer is
+            stopped and `wait()` just yields.
+        """
+        self._timer.deinit()
+        self._period = period
+        self._ticks = 0
+        self._seen = 0
+        self._flag.clear()
+        if period > 0:
+            self._timer.init(mode=Timer.PERIODIC, period=period,
+                             callback=self._tick)
+
+    def stop(self) -> None:
+        """Stop the timer, for when the pattern finishes."""
+        self._timer.deinit()
+        super().stop()
+
+    async def wait(self) -> int:
+        """Wait for the next timer tick.
+
+        :return: number of ticks since the last call. This is 1 unless the
+            frame was late.
+        """
+        if self._period <= 0:
+            await asyncio.sleep_ms(0)
+            return 1
+
+        if self._ticks == self._seen:
+            # the flag can be left set from a tick that was already counted,
+            # so keep waiting until there is a new tick
+            while self._ticks == self._seen:
+                await self._flag.wait()
+        else:
+            await asyncio.sleep_ms(0)
+        ticks = self._ticks
+        frames = ticks - self._seen
+        self._seen = ticks
+        if frames > 1:
+            self.overruns += 1
+            self.skipped += frames - 1
+        return frames
@@ -0,0 +1,123 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+"""bands (LedBands) - bands of color that scroll along the strip.
+
+The strip is covered with a repeating set of color bands, which move along
+the strip at a steady speed. Each band is drawn as one run of pixels, so a
+frame costs a few fills no matter how long the strip is.
+
+The command takes no parameters, and runs until it is stopped or replaced:
+
+    $bands
+
+The configuration is:
+
+    $config,bands,<speed>,<delay_ms>,<r>,<g>,<b>,<width>[,<r>,<g>,<b>,<width>...]
+
+* speed - how far the bands move each frame, in 1/256 pixel. 256 is one pixel
+  per frame. A negative speed moves the bands toward the start of the strip
+* delay_ms - frame period in milliseconds
+* r/g/b - color of a band. Use 0,0,0 for a dark gap
+* width - width of the band in pixels
+
+There can be up to 16 bands, and they repeat along the whole strip. The
+colors assume RGB order, like the other patterns.
+
+*Example*
+
+The default is red, green and blue bands of 5 pixels with dark gaps between
+them, moving one pixel each 20 ms:
+
+    $config,bands,256,20,5,0,0,5,0,0,0,5,0,5,0,5,0,0,0,5,0,0,5,5,0,0,0,5
+    $bands
+"""
+
+import array
+from ledeffects import LedEffect, pack
+from ledstrip import LedStrip
+import ledkernels
+
+class LedBands(LedEffect):
+    helpstr = "scrolling color bands"
+    cfgstr = "speed,delay_ms,r,g,b,width[,r,g,b,width...]"
+    cfgschema = "iii*"
+
+    MAX_BANDS = 16
+    """Most bands that can be configured."""
+
+    def __init__(self, strip: LedStrip) -> None:
+        super().__init__(strip)
+        self._speed = 256
+        self._setbands([5, 0, 0, 5, 0, 0, 0, 5, 0, 5, 0, 5,
+                        0, 0, 0, 5, 0, 0, 5, 5, 0, 0, 0, 5])
+        self._pos = 0
+
+    def _bandsok(self, bandlist: list[int]) -> bool:
+        numbands = len(bandlist) // 4
+        return (0 < numbands <= self.MAX_BANDS
+                and len(bandlist) == numbands * 4)
+
+    # bandlist is r,g,b,width for each band
+    def _setbands(self, bandlist: list[int]) -> None:
+        if not self._bandsok(bandlist):
+            raise ValueError("bands")
+        numbands = len(bandlist) // 4
+        colors = array.array("I", bytes(4 * numbands))
+        widths = array.array("H", bytes(2 * numbands))
+        for band in range(numbands):
+            red, grn, blu, width = bandlist[band * 4:(band + 1) * 4]
+            colors[band] = pack(red & 0xFF, grn & 0xFF, blu & 0xFF)
+            widths[band] = min(max(width, 1), 0xFFFF)
+        self._colors = colors
+        self._widths = widths
+        self._period = sum(widths)
+
+    def validate_config(self, cfglist):
+        return (super().validate_config(cfglist)
+                and self._bandsok(cfglist[4:]))
+
+    # cfglist[2] - speed in 1/256 pixel per frame
+    # cfglist[3] - frame period in milliseconds
+    # cfglist[4:] - r,g,b,width for each band
+    def config(self, cfglist):
+        self._setbands(cfglist[4:])
+        self._speed = cfglist[2]
+        self._delay = cfglist[3]
+
+    def start(self) -> None:
+        self._pos = 0
+
+    def draw(self, frames: int) -> None:
+        # position is in 1/256 pixels within one repeat of the bands
+        span = self._period << 8
+        self._pos = (self._pos + (self._speed * frames)) % span
+
+        buf = self._strip.buf
+        numpixels = len(buf)
+        colors = self._colors
+        widths = self._widths
+        numbands = len(widths)
+        # start one repeat back, so the part of a band that scrolled in
+        # from the start of the strip is drawn
+        start = (self._pos >> 8) - self._period
+        band = 0
+        while start < numpixels:
+            end = start + widths[band]
+            if end > 0:
+                first = max(start, 0)
+                ledkernels.fill(buf, colors[band], first,
+                                min(end, numpixels) - first)
+            start = end
+            band = band + 1 if band + 1 < numbands else 0
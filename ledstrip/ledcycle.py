@@ -0,0 +1,118 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+"""cycle (LedCycle) - color cycle using a rotating palette.
+
+This command fills the LED strip with a smooth color gradient that moves
+along the strip. It uses the strip palette mode: each pixel holds an index
+into a palette of 256 colors, and the animation just rotates the palette.
+The pixels themselves are only written once when the command starts.
+
+The command takes no parameters:
+
+    $cycle
+
+It has a configuration:
+
+    $config,cycle,<r0>,<g0>,<b0>,<r1>,<g1>,<b1>,<repeat>,<step>,<delay_ms>
+
+* r0/g0/b0 - the first color of the gradient
+* r1/g1/b1 - the second color of the gradient. The palette goes from the
+  first color to the second and back, so there is no jump in color
+* repeat - how many times the whole gradient repeats along the strip
+* step - how far the palette rotates for each frame, 1-255. Larger is faster
+* delay_ms - frame period in milliseconds
+
+*Example*
+
+A slow red and blue cycle, twice along the strip:
+
+    $config,cycle,255,0,0,0,0,255,2,1,20
+    $cycle
+"""
+
+import asyncio
+from cmdtemplate import CommandTemplate
+from ledstrip import LedStrip
+from ledmeter import interpolate_color
+
+class LedCycle(CommandTemplate):
+    helpstr = "color cycle"
+    cfgstr = "r0,g0,b0,r1,g1,b1,repeat,step,delay_ms"
+    schema = ""
+    cfgschema = "iiiiiiiii"
+
+    def __init__(self, strip: LedStrip) -> None:
+        super().__init__(strip)
+        self._color0 = (64, 0, 0)
+        self._color1 = (0, 0, 64)
+        self._repeat = 1
+        self._step = 2
+        self._delay = 20
+
+    # 2-4 - first color r, g, b
+    # 5-7 - second color r, g, b
+    # 8 - number of gradient repeats along the strip
+    # 9 - palette rotation per frame
+    # 10 - frame period in milliseconds
+    def config(self, cfglist):
+        self._color0 = (cfglist[2], cfglist[3], cfglist[4])
+        self._color1 = (cfglist[5], cfglist[6], cfglist[7])
+        self._repeat = max(cfglist[8], 1)
+        self._step = cfglist[9] & 0xFF
+        self._delay = cfglist[10]
+
+    # fill the palette with color0 to color1 and back
+    def _fill_palette(self, palette) -> None:
+        red = (self._color0[0], self._color1[0])
+        grn = (self._color0[1], self._color1[1])
+        blu = (self._color0[2], self._color1[2])
+        for idx in range(128):
+            color = ((interpolate_color(128, idx, grn) << 16)
+                     + (interpolate_color(128, idx, red) << 8)
+                     + interpolate_color(128, idx, blu))
+            palette[idx] = color
+            palette[255 - idx] = color
+
+    async def run(self, parmlist):
+        # check valid LED strip available and acquire lock
+        if self._strip is None:
+            return
+        strip = self._strip
+        await strip.acquire(self)
+        # at this point we have locked access to LED strip
+
+        # draw the gradient once into the index buffer
+        strip.use_palette()
+        self._fill_palette(strip.palette)
+        index = strip.index
+        numpixels = len(index)
+        span = 256 * self._repeat
+        for pix in range(numpixels):
+            index[pix] = ((pix * span) // numpixels) & 0xFF
+
+        clock = strip.clock
+        clock.start(self._delay)
+        offset = 0
+        while not self._stoprequest:
+            strip.expand(offset)
+            strip.show()
+            # rotate by the frames that went by, to keep the same speed
+            frames = await clock.wait()
+            offset = (offset + (self._step * frames)) & 0xFF
+
+        # clean exit - clear display and release lock
+        strip.clear()
+        strip.release()
+        self._stoprequest = False
@@ -0,0 +1,320 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+"""effects - rainbow, breathe, plasma and fire patterns.
+
+These patterns are built on two kinds of lookup tables, so that a frame can
+be drawn with integer math only:
+
+* `SINE` - 256 entry sine table, with values from 0 to 255 around 128
+* color tables of 256 packed colors, such as a hue wheel made by
+  [hue_wheel][ledstrip.ledeffects.hue_wheel] or the fire colors made by
+  [fire_palette][ledstrip.ledeffects.fire_palette]
+
+The per-pixel loops are in [ledkernels][ledstrip.ledkernels].
+
+All of the patterns take no parameters, and have a configuration. The
+colors assume RGB order, like the other patterns.
+
+**rainbow**
+
+    $rainbow
+    $config,rainbow,<brightness>,<repeat>,<speed>,<delay_ms>
+
+A rainbow that moves along the strip.
+
+* brightness - 0-255
+* repeat - how many times the rainbow repeats along the strip
+* speed - how far the colors move each frame, 1-255
+* delay_ms - frame period in milliseconds
+
+**breathe**
+
+    $breathe
+    $config,breathe,<r>,<g>,<b>,<speed>,<delay_ms>
+
+The whole strip fades in and out in one color.
+
+* r/g/b - color at full brightness
+* speed - how fast the brightness changes, 1-255
+* delay_ms - frame period in milliseconds
+
+**plasma**
+
+    $plasma
+    $config,plasma,<brightness>,<speed>,<delay_ms>
+
+Two sine waves move through each other, and their sum picks a color from the
+hue wheel.
+
+* brightness - 0-255
+* speed - how fast the waves move, 1-255
+* delay_ms - frame period in milliseconds
+
+**fire**
+
+    $fire
+    $config,fire,<cooling>,<sparking>,<delay_ms>
+
+A fire that burns from the start of the strip.
+
+* cooling - how fast the flames cool, higher gives shorter flames, 1-255
+* sparking - chance of a new spark each frame out of 255, higher gives a
+  busier fire
+* delay_ms - frame period in milliseconds
+"""
+
+import array
+import asyncio
+from cmdtemplate import CommandTemplate
+from ledstrip import LedStrip
+import ledkernels
+
+SINE = bytes.fromhex(
+    "808386898c909396999c9fa2a5a8abaeb1b3b6b9bcbfc1c4c7c9ccced1d3d5d8"
+    "dadcdee0e2e4e6e8eaebedeff0f1f3f4f5f6f8f9fafafbfcfdfdfefefeffffff"
+    "fffffffffefefefdfdfcfbfafaf9f8f6f5f4f3f1f0efedebeae8e6e4e2e0dedc"
+    "dad8d5d3d1ceccc9c7c4c1bfbcb9b6b3b1aeaba8a5a29f9c999693908c898683"
+    "807d7a7774706d6a6764615e5b5855524f4d4a4744413f3c393734322f2d2b28"
+    "262422201e1c1a1816151311100f0d0c0b0a0807060605040303020202010101"
+    "0101010102020203030405060607080a0b0c0d0f1011131516181a1c1e202224"
+    "26282b2d2f323437393c3f4144474a4d4f5255585b5e6164676a6d7074777a7d")
+"""Sine table, `SINE[n]` is 128 + 127 * sin(2 * pi * n / 256)."""
+
+def pack(red: int, grn: int, blu: int) -> int:
+    """Pack 8-bit color values into a pixel value."""
+    return (grn << 16) + (red << 8) + blu
+
+def hsv(hue: int, value: int) -> int:
+    """Return the packed color for a hue at full saturation.
+
+    :param hue: 0-255, going from red through green and blue back to red
+    :param value: brightness, 0-255
+    :return: packed color
+    """
+    region = (hue * 6) >> 8
+    rem = (hue * 6) & 0xFF
+    fall = (value * (255 - rem)) >> 8
+    rise = (value * rem) >> 8
+    if region == 0:
+        return pack(value, rise, 0)
+    elif region == 1:
+        return pack(fall, value, 0)
+    elif region == 2:
+        return pack(0, value, rise)
+    elif region == 3:
+        return pack(0, fall, value)
+    elif region == 4:
+        return pack(rise, 0, value)
+    return pack(value, 0, fall)
+
+def hue_wheel(value: int) -> array.array:
+    """Make a table of the 256 hues at one brightness.
+
+    :param value: brightness, 0-255
+    :return: `array("I")` of packed colors
+    """
+    return array.array("I", [hsv(hue, value) for hue in range(256)])
+
+def fire_palette() -> array.array:
+    """Make a table of fire colors for heat values 0-255.
+
+    The colors go from black through red and yellow to white.
+
+    :return: `array("I")` of packed colors
+    """
+    palette = array.array("I", bytes(256 * 4))
+    for heat in range(256):
+        # scale heat to 0-191, in three bands of 64
+        level = (heat * 191) >> 8
+        ramp = (level & 0x3F) << 2
+        if level > 127:
+            palette[heat] = pack(255, 255, ramp)
+        elif level > 63:
+            palette[heat] = pack(255, ramp, 0)
+        else:
+            palette[heat] = pack(ramp, 0, 0)
+    return palette
+
+class LedEffect(CommandTemplate):
+    """Common run loop for the effect patterns.
+
+    A subclass sets up its tables in `start()` and draws each frame in
+    `draw()`. The frames are timed by the strip frame clock, and `draw()`
+    is told how many frame periods went by so the effect keeps the same speed
+    when frames are late.
+    """
+    schema = ""
+
+    def __init__(self, strip: LedStrip) -> None:
+        super().__init__(strip)
+        self._delay = 20
+
+    def start(self) -> None:
+        """Called once when the pattern starts, after the strip is acquired."""
+        pass
+
+    def draw(self, frames: int) -> None:
+        """Draw the next frame into the strip buffer.
+
+        :param frames: number of frame periods since the last frame
+        """
+        pass
+
+    async def run(self, parmlist):
+        # check valid LED strip available and acquire lock
+        if self._strip is None:
+            return
+        await self._strip.acquire(self)
+        # at this point we have locked access to LED strip
+
+        self.start()
+        clock = self._strip.clock
+        clock.start(self._delay)
+        frames = 1
+        while not self._stoprequest:
+            self.draw(frames)
+            self._strip.show()
+            frames = await clock.wait()
+
+        # clean exit - clear display and release lock
+        self._strip.clear()
+        self._strip.release()
+        self._stoprequest = False
+
+class LedRainbow(LedEffect):
+    helpstr = "moving rainbow"
+    cfgstr = "brightness,repeat,speed,delay_ms"
+    cfgschema = "iiii"
+
+    def __init__(self, strip: LedStrip) -> None:
+        super().__init__(strip)
+        self._brightness = 64
+        self._repeat = 1
+        self._speed = 2
+        self._wheel = None
+        self._hue = 0
+
+    def config(self, cfglist):
+        self._brightness = cfglist[2] & 0xFF
+        self._repeat = max(cfglist[3], 1)
+        self._speed = cfglist[4] & 0xFF
+        self._delay = cfglist[5]
+        self._wheel = None
+
+    def start(self) -> None:
+        if self._wheel is None:
+            self._wheel = hue_wheel(self._brightness)
+        # hue change per pixel, in 1/256 hue units
+        self._step = (self._repeat << 16) // len(self._strip.buf)
+
+    def draw(self, frames: int) -> None:
+        self._hue = (self._hue + (self._speed * frames)) & 0xFF
+        ledkernels.ramp(self._strip.buf, self._wheel, self._hue << 8,
+                        self._step)
+
+class LedBreathe(LedEffect):
+    helpstr = "fade in and out"
+    cfgstr = "r,g,b,speed,delay_ms"
+    cfgschema = "iiiii"
+
+    def __init__(self, strip: LedStrip) -> None:
+        super().__init__(strip)
+        self._color = (0, 0, 64)
+        self._speed = 2
+        self._phase = 0
+
+    def config(self, cfglist):
+        self._color = (cfglist[2] & 0xFF, cfglist[3] & 0xFF, cfglist[4] & 0xFF)
+        self._speed = cfglist[5] & 0xFF
+        self._delay = cfglist[6]
+
+    def start(self) -> None:
+        # start from dark
+        self._phase = 192
+
+    def draw(self, frames: int) -> None:
+        self._phase = (self._phase + (self._speed * frames)) & 0xFF
+        level = SINE[self._phase] + 1
+        red, grn, blu = self._color
+        color = pack((red * level) >> 8, (grn * level) >> 8, (blu * level) >> 8)
+        buf = self._strip.buf
+        ledkernels.fill(buf, color, 0, len(buf))
+
+class LedPlasma(LedEffect):
+    helpstr = "plasma waves"
+    cfgstr = "brightness,speed,delay_ms"
+    cfgschema = "iii"
+
+    def __init__(self, strip: LedStrip) -> None:
+        super().__init__(strip)
+        self._brightness = 64
+        self._speed = 2
+        self._wheel = None
+        self._phase = 0
+
+    def config(self, cfglist):
+        self._brightness = cfglist[2] & 0xFF
+        self._speed = cfglist[3] & 0xFF
+        self._delay = cfglist[4]
+        self._wheel = None
+
+    def start(self) -> None:
+        if self._wheel is None:
+            self._wheel = hue_wheel(self._brightness)
+
+    def draw(self, frames: int) -> None:
+        self._phase = (self._phase + (self._speed * frames)) & 0xFFFF
+        # second wave moves at a different speed than the first
+        phase1 = self._phase & 0xFF
+        phase2 = ((self._phase * 3) >> 1) & 0xFF
+        ledkernels.plasma(self._strip.buf, self._wheel, SINE,
+                          phase1 | (phase2 << 8))
+
+class LedFire(LedEffect):
+    helpstr = "fire"
+    cfgstr = "cooling,sparking,delay_ms"
+    cfgschema = "iii"
+
+    def __init__(self, strip: LedStrip) -> None:
+        super().__init__(strip)
+        self._cooling = 55
+        self._sparking = 120
+        self._delay = 16
+        self._palette = None
+        self._heat = None
+        self._state = array.array("I", [0x2545F491])
+
+    def config(self, cfglist):
+        self._cooling = cfglist[2] & 0xFF
+        self._sparking = cfglist[3] & 0xFF
+        self._delay = cfglist[4]
+
+    def start(self) -> None:
+        if self._palette is None:
+            self._palette = fire_palette()
+        numpixels = len(self._strip.buf)
+        if self._heat is None or len(self._heat) != numpixels:
+            self._heat = bytearray(numpixels)
+        else:
+            self._heat[:] = bytes(numpixels)
+        # most a cell cools per frame, scaled so that the flame length does
+        # not depend much on the strip length
+        self._coolmax = min(((self._cooling * 10) // numpixels) + 2, 255)
+
+    def draw(self, frames: int) -> None:
+        # the fire just runs at whatever rate it gets, late frames are not
+        # caught up
+        ledkernels.fire(self._heat, self._state, self._coolmax, self._sparking)
+        ledkernels.expand(self._strip.buf, self._heat, self._palette, 0)
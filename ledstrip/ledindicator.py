@@ -0,0 +1,114 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+"""ind (LedIndicator) - status indicator pixels over the running pattern.
+
+Single pixels can be set aside to show a status, like the charger state or
+the car mode. Each indicator slot has a pixel and a small table of colors,
+one for each state. The state is set with:
+
+    $ind,<slot>,<state>
+
+State 0 turns the indicator off, so its pixel shows the pattern again.
+State 1 shows the first color of the slot, state 2 the second, and so on.
+
+The indicator is shown over whatever pattern is running on the strip. It
+does not stop the pattern or wait for the strip, and the pattern does not
+need to redraw. A running pattern shows the change with its next frame. If
+nothing is running, the strip is shown right away.
+
+A slot is set up with:
+
+    $config,ind,<slot>,<pixel>,<color1>[,<color2>,...]
+
+* slot - indicator slot, 0-7
+* pixel - the pixel used for the indicator
+* colorN - color for state N, as 6 hex digits in RGB order, like `00FF00`
+  for green
+
+Setting up a slot turns it off. An unknown slot or state is an error.
+
+*Example*
+
+The last pixel of a 418 pixel strip shows the charger supply: green for no
+AC, red for 200V, and blue otherwise:
+
+    $config,ind,0,417,003200,320000,000032
+    $ind,0,2
+"""
+
+from cmdtemplate import CommandTemplate, convert_parms
+from ledstrip import LedStrip
+
+class LedIndicator(CommandTemplate):
+    helpstr = "ind,<slot>,<state>"
+    cfgstr = "slot,pixel,color1[,color2,...]"
+    schema = "ii"
+    cfgschema = "iix*"
+    cfgkey = 1
+    oneshot = True
+
+    def __init__(self, strip: LedStrip) -> None:
+        super().__init__(strip)
+        self._pixels = [0] * LedStrip.INDICATORS
+        self._colors = [[] for _ in range(LedStrip.INDICATORS)]
+
+    def _cfgok(self, cfglist) -> bool:
+        # known slot, pixel on the strip, and at least one color
+        return (0 <= cfglist[2] < LedStrip.INDICATORS
+                and 0 <= cfglist[3] < len(self._strip.buf)
+                and len(cfglist) > 4)
+
+    def validate_config(self, cfglist) -> bool:
+        return super().validate_config(cfglist) and self._cfgok(cfglist)
+
+    # cfglist[2] - slot
+    # cfglist[3] - pixel
+    # cfglist[4:] - RGB color for each state, from state 1
+    def config(self, cfglist):
+        if not self._cfgok(cfglist):
+            raise ValueError(cfglist[2:4])
+        slot = cfglist[2]
+        # convert RGB to the packed pixel order
+        self._colors[slot] = [((rgb & 0xFF00) << 8) | ((rgb >> 8) & 0xFF00)
+                              | (rgb & 0xFF) for rgb in cfglist[4:]]
+        self._pixels[slot] = cfglist[3]
+        self._strip.clear_indicator(slot)
+
+    # check the slot and state too, since update() can not fail
+    def validate(self, parmlist) -> bool:
+        if not convert_parms(parmlist, self.schema, 1):
+            return False
+        slot = parmlist[1]
+        state = parmlist[2]
+        return (0 <= slot < LedStrip.INDICATORS
+                and 0 <= state <= len(self._colors[slot]))
+
+    # as part of a batch, the batch shows the strip
+    def apply(self, parmlist) -> None:
+        slot = parmlist[1]
+        state = parmlist[2]
+        if state:
+            self._strip.set_indicator(slot, self._pixels[slot],
+                                      self._colors[slot][state - 1])
+        else:
+            self._strip.clear_indicator(slot)
+
+    # an indicator never waits for the strip. A running pattern shows it with
+    # the next frame, otherwise it is shown now
+    def update(self, parmlist) -> bool:
+        self.apply(parmlist)
+        if not self._strip.busy:
+            self._strip.show()
+        return True
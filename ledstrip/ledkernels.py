@@ -0,0 +1,425 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+"""
+ledkernels - Inner loops over the pixel buffers.
+
+Some operations touch every pixel of a strip on every frame. Written as
+plain python loops they take a large part of the frame time for a long
+strip. The functions in this module are those inner loops, compiled with the
+viper code emitter when it is available. On other platforms, like the host
+used for unit tests, a plain python version with the same results is used
+instead.
+
+Each kernel is first written as python, which also documents it, and then
+replaced by its viper version when the code emitter is available.
+
+The kernels do no checking of their arguments. The caller must make sure the
+buffers are big enough. Viper functions can only have four arguments, which
+is why some kernels take the pixel count from the length of a buffer.
+"""
+
+def expand(dst, index, palette, offset: int):
+    """Fill a pixel buffer from an index buffer and a palette.
+
+    :param dst: pixel buffer, `array("I")`
+    :param index: index buffer, `bytearray` with one byte per pixel. Its
+        length is the number of pixels
+    :param palette: 256 entry `array("I")` of packed colors
+    :param offset: added to each index before looking up the color, used to
+        rotate the palette
+    """
+    for pix in range(len(index)):
+        dst[pix] = palette[(index[pix] + offset) & 0xFF]
+
+def unpack_rgb(dst, start: int, src, count: int):
+    """Copy RGB bytes into a pixel buffer.
+
+    :param dst: pixel buffer, `array("I")`
+    :param start: first pixel in `dst` to write
+    :param src: pixel data, 3 bytes per pixel in red, green, blue order
+    :param count: number of pixels
+    """
+    for pix in range(count):
+        idx = pix * 3
+        dst[start + pix] = (src[idx + 1] << 16) | (src[idx] << 8) | src[idx + 2]
+
+def apply_delta(dst, src, count: int, limit: int):
+    """Write changed pixels into a pixel buffer.
+
+    Each change is 5 bytes: the pixel number as a 16-bit little endian value,
+    then red, green and blue. Pixel numbers at or above `limit` are skipped.
+
+    :param dst: pixel buffer, `array("I")`
+    :param src: list of pixel changes
+    :param count: number of changes
+    :param limit: number of pixels in `dst`
+    """
+    for rec in range(count):
+        idx = rec * 5
+        pix = src[idx] | (src[idx + 1] << 8)
+        if pix < limit:
+            dst[pix] = (src[idx + 3] << 16) | (src[idx + 2] << 8) | src[idx + 4]
+
+def fill(dst, color: int, start: int, count: int):
+    """Set a run of pixels to one color.
+
+    :param dst: pixel buffer, `array("I")`
+    :param color: packed color
+    :param start: first pixel to set
+    :param count: number of pixels
+    """
+    for pix in range(start, start + count):
+        dst[pix] = color
+
+def ramp(dst, palette, start: int, step: int):
+    """Fill a pixel buffer with palette colors at a steady rate.
+
+    The palette position is kept in 1/256 units, so the step can be a
+    fraction of a palette entry.
+
+    :param dst: pixel buffer, `array("I")`. Its length is the number of
+        pixels
+    :param palette: 256 entry `array("I")` of packed colors
+    :param start: palette position of the first pixel, in 1/256 units
+    :param step: palette position change per pixel, in 1/256 units
+    """
+    pos = start
+    for pix in range(len(dst)):
+        dst[pix] = palette[(pos >> 8) & 0xFF]
+        pos += step
+
+def plasma(dst, palette, sine, phases: int):
+    """Fill a pixel buffer with the sum of two moving sine waves.
+
+    The two waves have different lengths and move in opposite directions.
+    Their sum picks the palette color for each pixel.
+
+    :param dst: pixel buffer, `array("I")`. Its length is the number of
+        pixels
+    :param palette: 256 entry `array("I")` of packed colors
+    :param sine: 256 entry sine table with values 0-255
+    :param phases: phase of the first wave in bits 0-7, and of the second
+        wave in bits 8-15
+    """
+    phase1 = phases & 0xFF
+    phase2 = (phases >> 8) & 0xFF
+    for pix in range(len(dst)):
+        val = sine[((pix * 3) + phase1) & 0xFF] + sine[((pix * 5) - phase2) & 0xFF]
+        dst[pix] = palette[val >> 1]
+
+def fire(heat, state, cooling: int, sparking: int):
+    """Advance a fire simulation by one frame.
+
+    Every cell cools by a random amount, heat drifts up the strip from the
+    start, and sometimes a new spark is added near the start. This is the
+    well known "Fire2012" algorithm. The random numbers use the same xorshift
+    generator as [fastrand][ledstrip.fastrand], with the state passed in.
+
+    :param heat: heat of each pixel, `bytearray`. Its length is the number of
+        pixels
+    :param state: random generator state, one word `array("I")`
+    :param cooling: most that a cell cools each frame
+    :param sparking: chance of a new spark each frame, out of 256
+    """
+    count = len(heat)
+    x = state[0]
+    for pix in range(count):
+        x ^= (x << 13) & 0xFFFFFFFF
+        x ^= x >> 17
+        x ^= (x << 5) & 0xFFFFFFFF
+        val = heat[pix] - ((((x >> 8) & 0xFF) * cooling) >> 8)
+        heat[pix] = val if val > 0 else 0
+    for pix in range(count - 1, 1, -1):
+        heat[pix] = ((heat[pix - 1] + heat[pix - 2] + heat[pix - 2]) * 85) >> 8
+    x ^= (x << 13) & 0xFFFFFFFF
+    x ^= x >> 17
+    x ^= (x << 5) & 0xFFFFFFFF
+    if ((x >> 8) & 0xFF) < sparking:
+        pix = (((x >> 16) & 0xFF) * 7) >> 8
+        if pix < count:
+            val = heat[pix] + 160 + ((x >> 24) & 0x5F)
+            heat[pix] = val if val < 255 else 255
+    state[0] = x
+
+def blend(dst, src0, src1, amount: int):
+    """Mix two pixel buffers, each color channel separately.
+
+    :param dst: pixel buffer for the result, `array("I")`. Its length is the
+        number of pixels
+    :param src0: pixel buffer to mix from
+    :param src1: pixel buffer to mix to
+    :param amount: how much of `src1` to use, 0-256 where 256 is all
+    """
+    for pix in range(len(dst)):
+        col0 = src0[pix]
+        col1 = src1[pix]
+        out = 0
+        for shift in (16, 8, 0):
+            chan0 = (col0 >> shift) & 0xFF
+            chan1 = (col1 >> shift) & 0xFF
+            out |= (chan0 + (((chan1 - chan0) * amount) >> 8)) << shift
+        dst[pix] = out
+
+def decay(dst, start: int, count: int, factor: int):
+    """Scale every color channel of a run of pixels.
+
+    Each channel is multiplied by `factor`/256. Repeated use fades the pixels
+    all the way to 0.
+
+    :param dst: pixel buffer, `array("I")`
+    :param start: first pixel to scale
+    :param count: number of pixels
+    :param factor: scale factor, 0-255
+    """
+    for pix in range(start, start + count):
+        col = dst[pix]
+        dst[pix] = ((((((col >> 16) & 0xFF) * factor) >> 8) << 16)
+                    | (((((col >> 8) & 0xFF) * factor) >> 8) << 8)
+                    | (((col & 0xFF) * factor) >> 8))
+
+def particles_step(pos, vel, life, frames: int):
+    """Move the live particles and count down their life.
+
+    The three arrays are parallel, one entry per particle slot. A slot with a
+    life of 0 is free. A particle that runs out of life is freed.
+
+    :param pos: positions in 1/256 pixel units, `array("i")`. Its length is
+        the number of slots
+    :param vel: velocities in 1/256 pixel per frame, `array("i")`
+    :param life: frames left to live, `array("i")`
+    :param frames: number of frame periods to move
+    """
+    for idx in range(len(pos)):
+        left = life[idx]
+        if left > 0:
+            left -= frames
+            if left > 0:
+                pos[idx] += vel[idx] * frames
+                life[idx] = left
+            else:
+                life[idx] = 0
+
+def particles_render(dst, pos, color, life):
+    """Draw the live particles into a pixel buffer.
+
+    Each particle sets the pixel at its position to its color. A particle
+    that is outside of the buffer is freed.
+
+    :param dst: pixel buffer, `array("I")` or a memoryview of part of one.
+        Its length is the number of pixels
+    :param pos: positions in 1/256 pixel units, `array("i")`. Its length is
+        the number of particle slots
+    :param color: packed particle colors, `array("I")`
+    :param life: frames left to live, `array("i")`
+    """
+    count = len(dst)
+    for idx in range(len(pos)):
+        if life[idx] > 0:
+            pix = pos[idx] >> 8
+            if 0 <= pix < count:
+                dst[pix] = color[idx]
+            else:
+                life[idx] = 0
+
+def dither(dst, src, err, level: int):
+    """Scale a pixel buffer by a 12-bit level, with temporal dithering.
+
+    Each channel is multiplied by `level`, and the part that is lost when
+    the result is cut back to 8 bits is kept in `err` and added in on the
+    next frame. Over several frames the average of each channel is the exact
+    scaled value, so low levels fade smoothly instead of in visible steps.
+
+    `dst` and `src` can be the same buffer.
+
+    :param dst: pixel buffer for the result, `array("I")`. Its length is the
+        number of pixels
+    :param src: pixel buffer to scale
+    :param err: carried error, `array("H")` with 3 entries per pixel
+    :param level: brightness, 0-4096 where 4096 is full
+    """
+    idx = 0
+    for pix in range(len(dst)):
+        col = src[pix]
+        out = 0
+        for shift in (16, 8, 0):
+            val = (((col >> shift) & 0xFF) * level) + err[idx]
+            err[idx] = val & 0xFFF
+            out |= (val >> 12) << shift
+            idx += 1
+        dst[pix] = out
+
+try:
+    import micropython
+except ImportError:
+    micropython = None
+
+if micropython:
+    @micropython.viper
+    def expand(dst, index, palette, offset: int):
+        pdst = ptr32(dst)
+        pidx = ptr8(index)
+        ppal = ptr32(palette)
+        for pix in range(int(len(index))):
+            pdst[pix] = ppal[(pidx[pix] + offset) & 0xFF]
+
+    @micropython.viper
+    def unpack_rgb(dst, start: int, src, count: int):
+        pdst = ptr32(dst)
+        psrc = ptr8(src)
+        idx = 0
+        for pix in range(start, start + count):
+            pdst[pix] = (psrc[idx + 1] << 16) | (psrc[idx] << 8) | psrc[idx + 2]
+            idx += 3
+
+    @micropython.viper
+    def apply_delta(dst, src, count: int, limit: int):
+        pdst = ptr32(dst)
+        psrc = ptr8(src)
+        idx = 0
+        for rec in range(count):
+            pix = psrc[idx] | (psrc[idx + 1] << 8)
+            if pix < limit:
+                pdst[pix] = ((psrc[idx + 3] << 16) | (psrc[idx + 2] << 8)
+                             | psrc[idx + 4])
+            idx += 5
+
+    @micropython.viper
+    def fill(dst, color: int, start: int, count: int):
+        pdst = ptr32(dst)
+        for pix in range(start, start + count):
+            pdst[pix] = color
+
+    @micropython.viper
+    def ramp(dst, palette, start: int, step: int):
+        pdst = ptr32(dst)
+        ppal = ptr32(palette)
+        pos = start
+        for pix in range(int(len(dst))):
+            pdst[pix] = ppal[(pos >> 8) & 0xFF]
+            pos += step
+
+    @micropython.viper
+    def plasma(dst, palette, sine, phases: int):
+        pdst = ptr32(dst)
+        ppal = ptr32(palette)
+        psin = ptr8(sine)
+        phase1 = phases & 0xFF
+        phase2 = (phases >> 8) & 0xFF
+        for pix in range(int(len(dst))):
+            val = (psin[((pix * 3) + phase1) & 0xFF]
+                   + psin[((pix * 5) - phase2) & 0xFF])
+            pdst[pix] = ppal[val >> 1]
+
+    @micropython.viper
+    def fire(heat, state, cooling: int, sparking: int):
+        pheat = ptr8(heat)
+        pstate = ptr32(state)
+        count = int(len(heat))
+        x = uint(pstate[0])
+        for pix in range(count):
+            x ^= x << 13
+            x ^= x >> 17
+            x ^= x << 5
+            val = pheat[pix] - ((int((x >> 8) & 0xFF) * cooling) >> 8)
+            pheat[pix] = val if val > 0 else 0
+        pix = count - 1
+        while pix > 1:
+            pheat[pix] = ((pheat[pix - 1] + pheat[pix - 2] + pheat[pix - 2])
+                          * 85) >> 8
+            pix -= 1
+        x ^= x << 13
+        x ^= x >> 17
+        x ^= x << 5
+        if int((x >> 8) & 0xFF) < sparking:
+            pix = (int((x >> 16) & 0xFF) * 7) >> 8
+            if pix < count:
+                val = pheat[pix] + 160 + int((x >> 24) & 0x5F)
+                pheat[pix] = val if val < 255 else 255
+        pstate[0] = x
+
+    @micropython.viper
+    def blend(dst, src0, src1, amount: int):
+        pdst = ptr32(dst)
+        psrc0 = ptr32(src0)
+        psrc1 = ptr32(src1)
+        for pix in range(int(len(dst))):
+            col0 = int(psrc0[pix])
+            col1 = int(psrc1[pix])
+            grn = (col0 >> 16) & 0xFF
+            red = (col0 >> 8) & 0xFF
+            blu = col0 & 0xFF
+            grn += (((col1 >> 16) & 0xFF) - grn) * amount >> 8
+            red += (((col1 >> 8) & 0xFF) - red) * amount >> 8
+            blu += ((col1 & 0xFF) - blu) * amount >> 8
+            pdst[pix] = (grn << 16) | (red << 8) | blu
+
+    @micropython.viper
+    def dither(dst, src, err, level: int):
+        pdst = ptr32(dst)
+        psrc = ptr32(src)
+        perr = ptr16(err)
+        idx = 0
+        for pix in range(int(len(dst))):
+            col = int(psrc[pix])
+            val = (((col >> 16) & 0xFF) * level) + perr[idx]
+            perr[idx] = val & 0xFFF
+            out = (val >> 12) << 16
+            val = (((col >> 8) & 0xFF) * level) + perr[idx + 1]
+            perr[idx + 1] = val & 0xFFF
+            out |= (val >> 12) << 8
+            val = ((col & 0xFF) * level) + perr[idx + 2]
+            perr[idx + 2] = val & 0xFFF
+            out |= val >> 12
+            pdst[pix] = out
+            idx += 3
+
+    @micropython.viper
+    def decay(dst, start: int, count: int, factor: int):
+        pdst = ptr32(dst)
+        for pix in range(start, start + count):
+            col = int(pdst[pix])
+            pdst[pix] = ((((((col >> 16) & 0xFF) * factor) >> 8) << 16)
+                         | (((((col >> 8) & 0xFF) * factor) >> 8) << 8)
+                         | (((col & 0xFF) * factor) >> 8))
+
+    @micropython.viper
+    def particles_step(pos, vel, life, frames: int):
+        ppos = ptr32(pos)
+        pvel = ptr32(vel)
+        plife = ptr32(life)
+        for idx in range(int(len(pos))):
+            left = int(plife[idx])
+            if left > 0:
+                left -= frames
+                if left > 0:
+                    ppos[idx] = int(ppos[idx]) + (int(pvel[idx]) * frames)
+                    plife[idx] = left
+                else:
+                    plife[idx] = 0
+
+    @micropython.viper
+    def particles_render(dst, pos, color, life):
+        pdst = ptr32(dst)
+        ppos = ptr32(pos)
+        pcolor = ptr32(color)
+        plife = ptr32(life)
+        count = int(len(dst))
+        for idx in range(int(len(pos))):
+            if int(plife[idx]) > 0:
+                pix = int(ppos[idx]) >> 8
+                if pix >= 0 and pix < count:
+                    pdst[pix] = pcolor[idx]
+                else:
+                    plife[idx] = 0
@@ -30,7 +30,7 @@
 that are part of the meter display, and the color gradient to use. The config
 command has the following format:
 
-    $config,meter,<start-pxel>,<stop-pixel>,<r0>,<rN>,<g0>,<gN>,<b0>,<bN>
+    $config,meter,<start-pxel>,<stop-pixel>,<r0>,<rN>,<g0>,<gN>,<b0>,<bN>[,<attack>,<decay>,<hold>,<period>]
 
 * start-pixel - the beginning pixel of the meter display
 * stop-pixel - the ending pixel of the meter display, inclusive
@@ -38,13 +38,20 @@
 * rN - the ending value for "red"
 * g0/gN - begin/end value for "green"
 * b0/bN - begin/end value for "blue"
+* attack - optional, how fast the meter rises toward a higher value (1-256)
+* decay - optional, how fast the meter falls toward a lower value (1-256)
+* hold - optional, number of frames to hold the peak pixel, 0 for no peak
+* period - optional, animation frame period in milliseconds (default 20)
 
 **NOTES:**
 
 * The colors listed above assume RGB format. Swap values if your order is GRB.
 * The start pixel and stop pixel can be in either increasing or decreasing order
 * the config only need to be done once for a given powered session. If the
-  controller board is repowered or reset, the config command must be sent again
+  controller board is repowered or reset, the config command must be sent
+  again, unless it is kept by the [config_store][ledstrip.config_store], or
+  saved in a scene that is loaded at boot (see
+  [CmdScene][ledstrip.cmdif.CmdScene])
 
 *Example*
 
@@ -60,6 +67,26 @@
 
     $meter,50
 
+The gradient colors are worked out once when the meter is configured. After
+that, a meter update only changes the pixels between the old and the new
+level, so small changes are cheap. If anything else has updated the strip
+since the last meter update, the whole meter is redrawn.
+
+**Animation**
+
+If `attack` and `decay` are left out, or are both 256, the meter jumps
+straight to each new value. Otherwise the meter is animated on the
+controller. A new value sets the target, and each frame the meter moves
+`attack`/256 (going up) or `decay`/256 (going down) of the way from where it
+is toward the target. For example an attack of 128 and a decay of 16 gives a
+meter that rises quickly and falls back slowly. If `hold` is not 0, a peak
+pixel stays at the highest level for that many frames, and then falls one
+pixel per frame. The animation stops by itself when the meter has reached
+the target and the peak has fallen, so the host only needs to send a new
+value when it changes.
+
+    $config,meter,0,19,255,0,0,255,0,0,128,16,25,20
+
 There is one meter command built-in, named `meter`. Additional meter instances
 can be added using the `add` command.
 
@@ -70,6 +97,8 @@
 meter displays on a single LED strip.
 """
 
+import array
+
 from cmdtemplate import CommandTemplate
 from ledstrip import LedStrip
 
@@ -87,7 +116,11 @@ def interpolate_color(numpixels, pixel, gradient):
 
 class LedMeter(CommandTemplate):
     helpstr = "meter,<pct 0-100>"
-    cfgstr = "start,stop,r0,rN,g0,gN,b0,bN"
+    cfgstr = "start,stop,r0,rN,g0,gN,b0,bN[,attack,decay,hold,period]"
+    schema = "i"
+    cfgschema = "iiiiiiiii*"
+    oneshot = True
+    coalesce = True
 
     def __init__(self, strip: LedStrip) -> None:
         super().__init__(strip)
@@ -98,6 +131,20 @@ def __init__(self, strip: LedStrip) -> None:
         self._bgradient = (0, 15)
         self._stride = 1
         self._numdots = 0
+        self._lut = array.array("I")    # packed color for each meter pixel
+        self._lit = 0                   # number of pixels lit by last update
+        self._shown = -2                # strip show count at last update
+        self._writes = -2               # strip write count at last update
+        # animation, level is in 1/256 pixel units
+        self._attack = 256
+        self._decay = 256
+        self._hold = 0
+        self._period = 20
+        self._target = 0
+        self._level = 0
+        self._peak = 0
+        self._peaktime = 0
+        self._running = False
 
     #
     # cfglist is list of string parameters
@@ -112,37 +159,135 @@ def __init__(self, strip: LedStrip) -> None:
     # 7 - ending g   (the r value at stop pixel)
     # 8 - starting b (the r value at start pixel)
     # 9 - ending b   (the r value at stop pixel)
+    # 10 - optional attack rate, 1-256
+    # 11 - optional decay rate, 1-256
+    # 12 - optional peak hold frames
+    # 13 - optional frame period in milliseconds
     #
     def config(self, cfglist):
-        self._start = int(cfglist[2])
-        self._stop = int(cfglist[3])
-        self._rgradient = (int(cfglist[4]), int(cfglist[5]))
-        self._ggradient = (int(cfglist[6]), int(cfglist[7]))
-        self._bgradient = (int(cfglist[8]), int(cfglist[9]))
+        self._start = cfglist[2]
+        self._stop = cfglist[3]
+        self._rgradient = (cfglist[4], cfglist[5])
+        self._ggradient = (cfglist[6], cfglist[7])
+        self._bgradient = (cfglist[8], cfglist[9])
         self._stride = 1 if self._stop > self._start else -1
-        self._numdots = abs(self._stop - self._start) + 1
+        self._numdots = numdots = abs(self._stop - self._start) + 1
+
+        # precompute the gradient colors
+        lut = array.array("I", bytearray(4 * numdots))
+        for idx in range(numdots):
+            red  = interpolate_color(numdots, idx, self._rgradient)
+            green = interpolate_color(numdots, idx, self._ggradient)
+            blue = interpolate_color(numdots, idx, self._bgradient)
+            lut[idx] = (green << 16) + (red << 8) + blue
+        self._lut = lut
+        # force a full repaint on the next update
+        self._shown = -2
+
+        # optional animation settings
+        anim = cfglist[10:14]
+        self._attack = min(max(anim[0], 1), 256) if len(anim) > 0 else 256
+        self._decay = min(max(anim[1], 1), 256) if len(anim) > 1 else 256
+        self._hold = anim[2] if len(anim) > 2 else 0
+        self._period = anim[3] if len(anim) > 3 else 20
+        # the plain meter is a one-shot, the animated meter keeps running
+        self.oneshot = (self._attack == 256 and self._decay == 256
+                        and self._hold == 0)
 
     # this is a one-shot display so it does not loop and does not wait
+    # the strip takes care of the lock and shows the result
+    def apply(self, parmlist) -> None:
+        self.paint(self._litdots(parmlist[1]))
+
+    def _litdots(self, pct: int) -> int:
+        litdots = ((self._numdots * pct) + 50) // 100
+        return min(max(litdots, 0), self._numdots)
+
+    # a new value for a running animated meter just changes the target
+    def update(self, parmlist) -> bool:
+        if self._running:
+            self._target = self._litdots(parmlist[1])
+            return True
+        return False
+
+    # animated meter, eases toward the target and stops when it gets there
     async def run(self, parmlist) -> None:
-        # check valid LED strip available and acquire lock
-        if self._strip is None:
+        self._target = self._litdots(parmlist[1])
+        if self._running:
+            # already started, it picks up the new target
             return
-        framebuf = self._strip.buf
+        self._running = True
         await self._strip.acquire(self)
-        # at this point we have locked access to LED strip
+        try:
+            clock = self._strip.clock
+            clock.start(self._period)
+            level = self._lit << 8
+            while not self._stoprequest:
+                # move part of the way toward the target
+                target = self._target << 8
+                diff = target - level
+                step = (diff * (self._attack if diff > 0 else self._decay)) >> 8
+                level = target if step == 0 else level + step
+                lit = (level + 128) >> 8
 
-        pct = int(parmlist[1])
-        litdots = ((self._numdots * pct) + 50) // 100
-        for idx in range(litdots):
-            red  = interpolate_color(self._numdots, idx, self._rgradient)
-            green = interpolate_color(self._numdots, idx, self._ggradient)
-            blue = interpolate_color(self._numdots, idx, self._bgradient)
-            framebuf[self._start + (idx*self._stride)] = (green << 16) + (red << 8) + blue
-        for idx in range(litdots, self._numdots):
-            framebuf[self._start + (idx*self._stride)] = 0
-
-        # update the display
-        self._strip.show()
-
-        # clean exit
-        self._strip.release()
+                # peak stays for the hold time, then falls a pixel per frame
+                oldpeak = self._peak
+                if lit >= oldpeak:
+                    self._peak = lit
+                    self._peaktime = self._hold
+                elif self._peaktime:
+                    self._peaktime -= 1
+                else:
+                    self._peak = oldpeak - 1
+
+                self._paintpeak(oldpeak, lit)
+                self._strip.show()
+                if level == target and (self._hold == 0 or self._peak <= lit):
+                    break
+                await clock.wait()
+        finally:
+            self._running = False
+            self._stoprequest = False
+            self._strip.release()
+
+    def _paintpeak(self, oldpeak: int, lit: int) -> None:
+        # clear the old peak pixel, paint the level, then the new peak pixel
+        framebuf = self._strip.buf
+        if self._hold and oldpeak > lit and oldpeak <= self._numdots:
+            framebuf[self._start + ((oldpeak-1)*self._stride)] = 0
+        self.paint(lit)
+        peak = self._peak
+        if self._hold and peak > lit:
+            framebuf[self._start + ((peak-1)*self._stride)] = self._lut[peak-1]
+
+    def paint(self, litdots: int) -> None:
+        """Light the first `litdots` pixels of the meter.
+
+        Only the pixels between the previous and new level are changed,
+        unless the strip was shown by someone else since the last update, or
+        another one-shot command was applied to it, in which case the whole
+        meter is redrawn.
+
+        :param litdots: number of meter pixels to light
+        """
+        strip = self._strip
+        framebuf = strip.buf
+        lut = self._lut
+        start = self._start
+        stride = self._stride
+
+        litdots = min(max(litdots, 0), self._numdots)
+        if (strip.shows == self._shown + 1
+                and strip.writes <= self._writes + 1):
+            # only our update was shown, and no other one-shot command wrote
+            # to the strip, so just change the difference
+            lo = min(self._lit, litdots)
+            hi = max(self._lit, litdots)
+        else:
+            lo = 0
+            hi = self._numdots
+        for idx in range(lo, hi):
+            framebuf[start + (idx*stride)] = lut[idx] if idx < litdots else 0
+        self._lit = litdots
+        self._shown = strip.shows
+        self._writes = strip.writes
@@ -0,0 +1,211 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+"""particles - fixed capacity particle engine and the particles pattern.
+
+A [Particles][ledstrip.ledparticles.Particles] object holds a fixed number of
+particle slots. The particles are not objects. Each one is an entry in four
+parallel arrays for its position, velocity, color and life, which are made
+once when the engine is created. Spawning, moving and drawing particles does
+not allocate, so a pattern can use hundreds of particles without garbage
+collection pauses. The move and draw loops are in
+[ledkernels][ledstrip.ledkernels].
+
+Positions and velocities are in 1/256 pixel units, so particles can move
+slower than one pixel per frame. A particle is drawn as one pixel. It is
+freed when its life runs out, or when it leaves the pixels it is drawn into.
+
+**particles**
+
+The particles pattern is set up by its configuration, and takes no
+parameters:
+
+    $particles
+    $config,particles,<kind>,<hue>,<rate>,<speed>,<life>,<fade>,<delay_ms>
+
+* kind - how particles are made:
+    * `sparkle` - at a random place, and they do not move
+    * `comet` - at the start of the strip, moving up the strip
+    * `sweep` - at both ends of the strip, moving toward the other end
+* hue - color of the particles, 0-255 around the color wheel. Any other
+  value gives each particle a random hue
+* rate - chance out of 256 that a particle is made each frame. 256 or more
+  makes one every frame
+* speed - particle speed in 1/256 pixel per frame, so 256 is one pixel per
+  frame
+* life - how many frames a particle lives. 0 means until it leaves the
+  strip, which sparkles never do, so sparkles need a life
+* fade - 0 clears the strip for each frame. 1-255 fades the last frame by
+  fade/256 instead, so moving particles leave a trail
+* delay_ms - frame period in milliseconds
+
+The particles are at full brightness. Use `$config,strips,<idx>,dim,<level>`
+to make them dimmer.
+"""
+
+import array
+import fastrand
+from ledeffects import LedEffect, hue_wheel
+from ledstrip import LedStrip
+import ledkernels
+
+# life for particles that live until they leave the strip
+_FOREVER = 0x3FFFFFFF
+
+class Particles:
+    """A fixed number of particles in parallel arrays.
+
+    :param capacity: number of particle slots
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.pos = array.array("i", bytes(4 * capacity))
+        """Particle positions, in 1/256 pixel units."""
+        self.vel = array.array("i", bytes(4 * capacity))
+        """Particle velocities, in 1/256 pixel per frame."""
+        self.color = array.array("I", bytes(4 * capacity))
+        """Packed particle colors."""
+        self.life = array.array("i", bytes(4 * capacity))
+        """Frames left for each particle, 0 for a free slot."""
+        self._capacity = capacity
+        self._next = 0
+
+    @property
+    def capacity(self) -> int:
+        """Number of particle slots."""
+        return self._capacity
+
+    def alive(self) -> int:
+        """Return the number of live particles."""
+        return sum(1 for left in self.life if left > 0)
+
+    def clear(self) -> None:
+        """Free all of the particles."""
+        for idx in range(self._capacity):
+            self.life[idx] = 0
+
+    def spawn(self, pos: int, vel: int, color: int, life: int) -> bool:
+        """Start a new particle in a free slot.
+
+        :param pos: position in 1/256 pixel units
+        :param vel: velocity in 1/256 pixel per frame
+        :param color: packed color
+        :param life: number of frames the particle lives, at least 1
+        :return: False if there is no free slot
+        """
+        # look for a free slot, starting after the last one used
+        idx = self._next
+        for _ in range(self._capacity):
+            if self.life[idx] <= 0:
+                self.pos[idx] = pos
+                self.vel[idx] = vel
+                self.color[idx] = color
+                self.life[idx] = max(life, 1)
+                self._next = idx + 1 if idx + 1 < self._capacity else 0
+                return True
+            idx = idx + 1 if idx + 1 < self._capacity else 0
+        return False
+
+    def step(self, frames: int=1) -> None:
+        """Move the particles, and free the ones that ran out of life.
+
+        :param frames: number of frame periods to move
+        """
+        ledkernels.particles_step(self.pos, self.vel, self.life, frames)
+
+    def render(self, buf, start: int=0, count: int=None) -> None:
+        """Draw the particles into a pixel buffer, or part of one.
+
+        Particle position 0 is pixel `start`. Particles outside of the
+        pixels that are drawn are freed.
+
+        :param buf: pixel buffer, such as `LedStrip.buf`
+        :param start: first pixel of the part to draw into
+        :param count: number of pixels to draw into, default is to the end
+        """
+        if start or count is not None:
+            end = len(buf) if count is None else start + count
+            buf = memoryview(buf)[start:end]
+        ledkernels.particles_render(buf, self.pos, self.color, self.life)
+
+class LedParticles(LedEffect):
+    helpstr = "particle sparkles and comets"
+    cfgstr = "kind,hue,rate,speed,life,fade,delay_ms"
+    cfgschema = "siiiiii"
+
+    _kinds = ("sparkle", "comet", "sweep")
+
+    def __init__(self, strip: LedStrip, capacity: int=64) -> None:
+        super().__init__(strip)
+        self.particles = Particles(capacity)
+        self._kind = "comet"
+        self._hue = 160
+        self._rate = 16
+        self._speed = 128
+        self._life = 0
+        self._fade = 192
+        self._wheel = None
+        self._flip = False
+
+    def validate_config(self, cfglist):
+        return (super().validate_config(cfglist)
+                and cfglist[2] in self._kinds)
+
+    def config(self, cfglist):
+        if cfglist[2] not in self._kinds:
+            raise ValueError(cfglist[2])
+        self._kind = cfglist[2]
+        self._hue = cfglist[3]
+        self._rate = max(cfglist[4], 0)
+        self._speed = max(cfglist[5], 1)
+        self._life = max(cfglist[6], 0)
+        self._fade = cfglist[7] & 0xFF
+        self._delay = cfglist[8]
+
+    def start(self) -> None:
+        if self._wheel is None:
+            self._wheel = hue_wheel(255)
+        self.particles.clear()
+        self._numpixels = len(self._strip.buf)
+
+    def _spawn(self) -> None:
+        rnd = fastrand.rand()
+        # low 8 bits for the rate, next 8 for the hue, the rest for position
+        if (rnd & 0xFF) >= self._rate:
+            return
+        hue = self._hue
+        if hue < 0 or hue > 255:
+            hue = (rnd >> 8) & 0xFF
+        color = self._wheel[hue]
+        life = self._life if self._life else _FOREVER
+        if self._kind == "sparkle":
+            pos = (((rnd >> 16) * self._numpixels) >> 14) << 8
+            self.particles.spawn(pos, 0, color, life)
+        elif self._kind == "sweep" and self._flip:
+            self._flip = False
+            self.particles.spawn(((self._numpixels << 8) - 1), -self._speed,
+                                 color, life)
+        else:
+            self._flip = True
+            self.particles.spawn(0, self._speed, color, life)
+
+    def draw(self, frames: int) -> None:
+        if self._fade:
+            self._strip.decay(0, self._numpixels, self._fade)
+        else:
+            ledkernels.fill(self._strip.buf, 0, 0, self._numpixels)
+        self.particles.step(frames)
+        for _ in range(frames):
+            self._spawn()
+        self.particles.render(self._strip.buf)
@@ -0,0 +1,110 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+"""px (LedPixels) - set many scattered pixels to colors.
+
+This command is used to set any number of individual pixels, each to its own
+color, in a single command. It is meant for sparse updates such as status
+pixels or sparkles, where using `range` would need one command per pixel. The
+format is:
+
+    $px,<index>:<RRGGBB>,<index>:<RRGGBB>,...
+
+* index  - the pixel number (0-origin), in hex
+* RRGGBB - the pixel color in hex, two digits each for red, green and blue
+
+Hex is used for the pixel number as well as the color to keep the command
+short. If any field is not in this format, or has a pixel number that is past
+the end of the LED strip, the reply is `$ERR` and no pixels are changed.
+
+The color order follows the `range` command, so use whatever order works with
+`range` for your hardware.
+
+*Example*
+
+Set pixel 417 (0x1A1) to green and pixel 416 (0x1A0) to dim red:
+
+    $px,1a1:00ff00,1a0:100000
+
+The `px` command does not have any configuration settings. It is a one-shot
+command, so it can also be batched with other one-shot commands.
+"""
+
+from cmdtemplate import CommandTemplate
+
+class LedPixels(CommandTemplate):
+    # pylint: disable=missing-class-docstring
+    helpstr = "set pixels to colors <px,idx:RRGGBB,...> (hex)"
+    schema = "s*"
+    oneshot = True
+
+    # every field must be <hex index>:<6 hex digits>, with the index inside
+    # the strip. this uses the same character loop as apply(), so checking
+    # does not create any substrings either
+    def validate(self, parmlist):
+        if len(parmlist) < 2:
+            return False
+        numpixels = len(self._strip.buf)
+        for fidx in range(1, len(parmlist)):
+            pix = -1            # no ':' found yet
+            val = 0
+            digits = 0
+            for ch in parmlist[fidx]:
+                code = ord(ch)
+                if code == 58:  # ':' ends the pixel index
+                    if pix >= 0 or digits == 0:
+                        return False
+                    pix = val
+                    val = 0
+                    digits = 0
+                    continue
+                if 48 <= code <= 57:  # '0'-'9'
+                    val = (val << 4) + code - 48
+                elif 97 <= (code | 0x20) <= 102:  # 'a'-'f' or 'A'-'F'
+                    val = (val << 4) + (code | 0x20) - 87
+                else:
+                    return False
+                digits += 1
+                # stop before the index or color can grow past a small int
+                if (pix < 0 and val >= numpixels) or digits > 6:
+                    return False
+            if pix < 0 or digits != 6:
+                return False
+        return True
+
+    # each field is parsed one character at a time so that no substrings are
+    # created for the index and color parts. validate() has already checked
+    # the format
+    def apply(self, parmlist):
+        framebuf = self._strip.buf
+        numpixels = len(framebuf)
+
+        for fidx in range(1, len(parmlist)):
+            pix = numpixels     # invalid unless a ':' is found
+            val = 0
+            for ch in parmlist[fidx]:
+                code = ord(ch)
+                if code == 58:  # ':' ends the pixel index
+                    pix = val
+                    val = 0
+                elif code < 58:  # '0'-'9'
+                    val = (val << 4) + code - 48
+                else:  # 'a'-'f' or 'A'-'F'
+                    val = (val << 4) + (code | 0x20) - 87
+
+            # input is RRGGBB, pixel buffer is the same order as range
+            if pix < numpixels:
+                framebuf[pix] = (((val & 0xFF00) << 8)
+                                 + ((val >> 8) & 0xFF00)
+                                 + (val & 0xFF))
@@ -0,0 +1,168 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+"""play (LedPlay) - play a pre-rendered animation file.
+
+Patterns that are too slow to compute on the controller can be rendered on a
+host computer and copied to the controller filesystem as an animation file.
+This command plays the file on the LED strip, reading the frames from the
+file as it goes, a small chunk at a time, so the whole animation does not
+need to fit in memory.
+
+The command format is:
+
+    $play,<file>[,<loop>]
+
+* file - name of the animation file on the controller filesystem
+* loop - optional, 1 to keep repeating the animation until another command
+  takes the LED strip. The default is to play it once
+
+If the file does not exist or is not an animation file, the reply is `$ERR`.
+The frames are timed with the strip frame clock, at the frame period stored in
+the file.
+
+**File format**
+
+All values are little endian. The file starts with a 16 byte header:
+
+| bytes | type   | value                                |
+|-------|--------|--------------------------------------|
+| 0-3   | bytes  | `LSAN`                               |
+| 4     | uint8  | format version, 1                    |
+| 5     | uint8  | flags, 0                             |
+| 6-7   | uint16 | number of pixels in each frame       |
+| 8-9   | uint16 | frame period in milliseconds         |
+| 10-11 | uint16 | number of frames                     |
+| 12-15 | uint32 | reserved, 0                          |
+
+Each frame starts with a 3 byte frame header, a uint8 frame type and a uint16
+count, followed by the frame data:
+
+* key frame (type 0) - `count` pixels, 3 bytes each in red, green, blue
+  order, starting at pixel 0
+* delta frame (type 1) - `count` changed pixels, 5 bytes each: the uint16
+  pixel number, then red, green, blue. Pixels that are not listed keep the
+  value from the previous frame
+
+Pixels past the end of the LED strip are ignored. The first frame must be a
+key frame. Animation files can be made with the host script
+`tests/host/animencode.py`.
+"""
+
+import struct
+from cmdtemplate import CommandTemplate
+from ledstrip import LedStrip
+import ledkernels
+
+MAGIC = b"LSAN"
+VERSION = 1
+HEADER = "<4sBBHHHI"
+HEADER_SIZE = 16
+FRAME_HEADER = "<BH"
+KEY_FRAME = 0
+DELTA_FRAME = 1
+
+CHUNK_PIXELS = 64
+"""Number of pixels (or pixel changes) read from the file at a time."""
+
+def read_header(animfile) -> tuple:
+    """Read and check the header of an animation file.
+
+    :param animfile: animation file opened for binary reading, positioned at
+        the start
+    :return: tuple of (pixels, period, frames), or None if the file is not a
+        valid animation file
+    """
+    data = animfile.read(HEADER_SIZE)
+    if len(data) != HEADER_SIZE:
+        return None
+    magic, version, _, pixels, period, frames, _ = struct.unpack(HEADER, data)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return (pixels, period, frames)
+
+class LedPlay(CommandTemplate):
+    helpstr = "play,<file>[,loop]"
+    schema = "si*"
+
+    def __init__(self, strip: LedStrip) -> None:
+        super().__init__(strip)
+        # preallocated read buffers, the chunk holds either key frame pixels
+        # or delta frame changes
+        self._chunk = bytearray(CHUNK_PIXELS * 5)
+        self._chunkview = memoryview(self._chunk)
+        self._frameheader = bytearray(3)
+
+    # make sure the file can be played before replying
+    def validate(self, parmlist: list[str]) -> bool:
+        if not super().validate(parmlist):
+            return False
+        try:
+            with open(parmlist[1], "rb") as animfile:
+                return read_header(animfile) is not None
+        except OSError:
+            return False
+
+    # read one frame from the file into the pixel buffer
+    def _read_frame(self, animfile) -> None:
+        buf = self._strip.buf
+        numpixels = len(buf)
+        chunk = self._chunk
+        view = self._chunkview
+        animfile.readinto(self._frameheader)
+        frametype, count = struct.unpack(FRAME_HEADER, self._frameheader)
+        pix = 0
+        while pix < count:
+            num = min(CHUNK_PIXELS, count - pix)
+            if frametype == KEY_FRAME:
+                animfile.readinto(view[:num * 3])
+                ledkernels.unpack_rgb(buf, pix, chunk,
+                                      min(num, numpixels - pix))
+            else:
+                animfile.readinto(view[:num * 5])
+                ledkernels.apply_delta(buf, chunk, num, numpixels)
+            pix += num
+
+    async def run(self, parmlist):
+        # check valid LED strip available and acquire lock
+        if self._strip is None:
+            return
+        loop = len(parmlist) > 2 and parmlist[2]
+        await self._strip.acquire(self)
+        # at this point we have locked access to LED strip
+
+        try:
+            with open(parmlist[1], "rb") as animfile:
+                _, period, frames = read_header(animfile)
+                clock = self._strip.clock
+                clock.start(period)
+                while not self._stoprequest:
+                    for _ in range(frames):
+                        self._read_frame(animfile)
+                        self._strip.show()
+                        # frames are not skipped when late, because delta
+                        # frames depend on the frames before them
+                        await clock.wait()
+                        if self._stoprequest:
+                            break
+                    if not loop:
+                        break
+                    animfile.seek(HEADER_SIZE)
+        except OSError:
+            pass
+
+        # clean exit - clear display and release lock
+        self._strip.clear()
+        self._strip.release()
+        self._stoprequest = False
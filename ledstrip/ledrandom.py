@@ -13,37 +13,62 @@
 
 """random - random pattern commands."""
 
+import array
 import asyncio
-from random import randint, randrange, choice as randchoice
+import fastrand
 from cmdtemplate import CommandTemplate
 from ledstrip import LedStrip
 
-# TODO for random operations do we need to set the seed? for example, could
-# seed with current time when command is executed
+# table of channel values 20-255 for a random byte, used by LedRandomOG
+_og_channel = bytes(20 + ((val * 236) >> 8) for val in range(256))
+
+def _masks(colors: list[int], weights: list[int]) -> array.array:
+    # 256 entry table of color masks for a weighted random choice
+    return array.array("I", [colors[idx]
+                             for idx in fastrand.weighted_table(weights)])
 
 class LedRandomOG(CommandTemplate):
     """Random pattern based on Bill's pattern 2.
 
     This command lights one or more LEDs in the string at random locations and
     with random colors. It is based on Bill's original pattern 2 code. This
-    command has no configuration and no parameters. It is just invoked by
-    itself:
+    command has no parameters. It is just invoked by itself:
 
         $randomog
+
+    The only configuration is the random seed. A seed other than 0 restarts
+    the random sequence each time the command is started, so the pattern is
+    the same every time:
+
+        $config,randomog,<seed>
     """
     helpstr = "bill's original pattern2"
-    cfgstr = "no configs"
+    cfgstr = "seed"
+    schema = ""
+    cfgschema = "i"
+
+    # color masks and their chance out of 101, from the original pattern
+    _colors = [0, 0xFF0000, 0x00FF00, 0x0000FF, 0xFFFF00, 0xFF00FF,
+               0x00FFFF, 0xFF0000, 0xFFFFFF]
+    _weights = [30, 5, 5, 5, 5, 5, 5, 10, 31]
 
     def __init__(self, strip: LedStrip) -> None:
         super().__init__(strip)
+        self._seed = 0
+        self._chooser = _masks(self._colors, self._weights)
+        # 64 entry table for the number of pixels, 1-5
+        self._numpix = bytes(1 + idx for idx in
+                             fastrand.weighted_table([1, 1, 1, 1, 1], 64))
 
-    # def config(self, cfglist):
+    # cfglist[2] - random seed, 0 to not reseed
+    def config(self, cfglist):
+        self._seed = cfglist[2]
 
     async def run (self, parmlist):
         # this is a rewriting of Bill's underhoodLights algorithm for
         # pattern 2. The code looks different but the outcome should be the
-        # same or simimlar.
-        # TODO rewrite as lookup table or similar
+        # same or simimlar. The random choices are made from two random
+        # numbers per frame using lookup tables.
 
         # check valid LED strip available and acquire lock
         if self._strip is None:
@@ -51,47 +76,40 @@ async def run (self, parmlist):
         framebuf = self._strip.buf
         await self._strip.acquire(self)
         # at this point we have locked access to LED strip
+        clock = self._strip.clock
 
         # figure out highest pixel number so we dont exceed array
         max_lit_pixels = 5
         max_pixel_num = (len(framebuf) - 1) - max_lit_pixels
+        chooser = self._chooser
+        numpix = self._numpix
+        channel = _og_channel
+        rand = fastrand.rand
+
+        if self._seed:
+            fastrand.seed(self._seed)
+        clock.start(100)
 
         while not self._stoprequest:
             # determine random elements
-            colorChooser = randint(0, 100)
-            startPixel = randint(0, max_pixel_num)
-            numPixels = randint(1, 5)
-            grn = randint(20, 255) << 16
-            red = randint(20, 255) << 8
-            blu = randint(20, 255)
-
-            # select which colors to apply
-            if colorChooser < 30:
-                color = 0
-            elif colorChooser < 35:  # green
-                color = grn
-            elif colorChooser < 40:  # red
-                color = red
-            elif colorChooser < 45:  # blue
-                color = blu
-            elif colorChooser < 50:  # red/green
-                color = grn + red
-            elif colorChooser < 55:  # green/blue
-                color = grn + blu
-            elif colorChooser < 60:  # red/blue
-                color = red + blu
-            elif colorChooser < 70:  # more green
-                color = grn
-            else:
-                color = grn + red + blu
+            # first number: 24 bits of channel values, 6 bits pixel count
+            rnd = rand()
+            color = ((channel[(rnd >> 16) & 0xFF] << 16)
+                     + (channel[(rnd >> 8) & 0xFF] << 8)
+                     + channel[rnd & 0xFF])
+            numPixels = numpix[rnd >> 24]
+            # second number: 8 bits color chooser, 16 bits start pixel
+            rnd = rand()
+            color &= chooser[rnd & 0xFF]
+            startPixel = (((rnd >> 8) & 0xFFFF) * (max_pixel_num + 1)) >> 16
 
             # set the pixels in the frame buffer
             for pix in range(startPixel, startPixel+numPixels+1):
                 framebuf[pix] = color
             self._strip.show()
 
-            # rerun every 100 ms
-            await asyncio.sleep_ms(100)
+            # rerun every 100 ms, late frames are skipped
+            await clock.wait()
 
         # clean exit - clear display and release lock
         self._strip.clear()
@@ -120,7 +138,7 @@ class LedRandom(CommandTemplate):
 
     But it has a configuration:
 
-        $config,random,<dark-threshold>,<max-intensity>,<num-pixels>,<delayus>
+        $config,random,<dark-threshold>,<max-intensity>,<num-pixels>,<delayus>[,<seed>]
 
     * dark-threshold - a random value from 0-255 is compared to the dark
       threshold. If it is below the threshold then the color will be dark (off).
@@ -140,9 +158,14 @@ class LedRandom(CommandTemplate):
     * delayms - the repeat period in milliseconds. The lower the number, the
       faster the pattern updates. The default is 100 which is 100
       milliseconds.
+    * seed - optional random seed. If not 0, the random sequence restarts
+      each time the command is started, so the pattern is the same every
+      time.
     """
     helpstr = "show random colors"
-    cfgstr = "dark-threshold(0-255),max-intensity(0-255),num-pixels,delay_us"
+    cfgstr = "dark-threshold(0-255),max-intensity(0-255),num-pixels,delay_us[,seed]"
+    schema = ""
+    cfgschema = "iiiii*"
 
     chooser = [0x0000FF, 0x00FF00, 0x00FFFF,
                0xFF0000, 0xFF00FF, 0xFFFF00, 0xFFFFFF]
@@ -153,6 +176,14 @@ def __init__(self, strip: LedStrip) -> None:
         self._max_intensity = 0x7F7F7F
         self._max_pixels = 5
         self._delay = 100 # 100 ms
+        self._seed = 0
+        self._chooser = _masks(self.chooser, [1] * len(self.chooser))
+        self._numpix = self._numpix_table()
+
+    # 64 entry table for the number of pixels, 1 to max
+    def _numpix_table(self) -> bytes:
+        return bytes(1 + idx for idx in
+                     fastrand.weighted_table([1] * self._max_pixels, 64))
 
     # cfglist[0] - "config"
     # cfglist[1] - "random"
@@ -160,14 +191,16 @@ def __init__(self, strip: LedStrip) -> None:
     # cfglist[3] - max intensity (0-255)
     # cfglist[4] - max number of pixels to light
     # cfglist[5] - periodic delay in microseconds
+    # cfglist[6] - optional random seed, 0 to not reseed
     def config(self, cfglist: list[str]) -> None:
-        # do bare minimum error checking
-        if len(cfglist) == 6:
-            self._dark_threshold = int(cfglist[2]) & 0xff
-            intens = int(cfglist[3]) & 0xFF
-            self._max_intensity = (intens << 16) + (intens << 8) + intens
-            self._max_pixels = int(cfglist[4])
-            self._delay = int(cfglist[5])
+        # parameters are checked by cfgschema
+        self._dark_threshold = cfglist[2] & 0xff
+        intens = cfglist[3] & 0xFF
+        self._max_intensity = (intens << 16) + (intens << 8) + intens
+        self._max_pixels = min(max(cfglist[4], 1), 64)
+        self._delay = cfglist[5]
+        self._seed = cfglist[6] if len(cfglist) > 6 else 0
+        self._numpix = self._numpix_table()
 
     async def run(self, parmlist):
         # check valid LED strip available and acquire lock
@@ -176,34 +209,41 @@ async def run(self, parmlist):
         framebuf = self._strip.buf
         await self._strip.acquire(self)
         # at this point we have locked access to LED strip
+        clock = self._strip.clock
+        chooser = self._chooser
+        numpix = self._numpix
+        rand = fastrand.rand
+
+        if self._seed:
+            fastrand.seed(self._seed)
+        clock.start(self._delay)
 
         while not self._stoprequest:
-            # get a random color value (all 3 colors)
-            color = randrange(0x7FFFFFFF)
-            # use upper 8 bits as probability of dark
-            dark = color >> 24
-            if dark < self._dark_threshold:
+            # first random number: 24 bits of color (all 3 colors) and 6 bits
+            # for the number of pixels
+            rnd = rand()
+            numpixels = numpix[rnd >> 24]
+            # second random number: 8 bits dark probability, 8 bits color
+            # chooser, 14 bits starting pixel
+            rnd2 = rand()
+            if (rnd2 & 0xFF) < self._dark_threshold:
                 # below dark threshold so set color to 0 (off)
                 color = 0
             else:
-                # use the lower 3 bytes for the pixel value
                 # apply the color chooser, then the intensity cap
-                color = color & randchoice(self.chooser)
+                color = rnd & chooser[(rnd2 >> 8) & 0xFF]
                 color = color & self._max_intensity  # cap the intensity
 
-            # determine number of pixels to light
-            numpixels = randint(1, self._max_pixels)
-
             # determine starting pixel
-            startpix = randrange(len(framebuf) - numpixels)
+            startpix = ((rnd2 >> 16) * (len(framebuf) - numpixels)) >> 14
 
             # set the affected pixels
             for pix in range(numpixels):
                 framebuf[startpix+pix] = color
             self._strip.show()
 
-            # return the rerun period
-            await asyncio.sleep_ms(self._delay)
+            # wait for the rerun period, late frames are skipped
+            await clock.wait()
 
         # clean exit - clear display and release lock
         self._strip.clear()
@@ -36,7 +36,15 @@
 
     $range,10,10,0,0,128
 
+If the range does not fit on the LED strip, the reply is `$ERR` and no
+pixels are changed.
+
 The `range` command does not have any configuration settings.
+
+`range` is a one-shot command, so several of them can be sent in a single
+batch, and the LED strip is only updated once for the whole batch:
+
+    $range,0,10,128,0,0;range,10,10,0,128,0;range,20,10,0,0,128
 """
 
 from cmdtemplate import CommandTemplate
@@ -44,32 +52,32 @@
 class LedRange(CommandTemplate):
     # pylint: disable=missing-class-docstring
     helpstr = "set range to color <range,start,num,r,g,b>"
-
-    async def run(self, parmlist):
-        # make sure we have strip to write
-        if self._strip is None:
-            return
-
+    schema = "iiiii"
+    oneshot = True
+
+    # the whole range must be on the strip, so apply() can not fail part way
+    # through, or wrap a negative start around to the end of the strip
+    def validate(self, parmlist):
+        if not super().validate(parmlist):
+            return False
+        dot0 = parmlist[1]
+        numdots = parmlist[2]
+        return (0 <= dot0 and 0 <= numdots
+                and dot0 + numdots <= len(self._strip.buf))
+
+    # one-shot, the strip takes care of the lock and shows the result
+    def apply(self, parmlist):
         # get the framebuffer
         framebuf = self._strip.buf
 
-        # acquire LED strip resource lock
-        await self._strip.acquire(self)
-
         # write the pattern to the buffer
-        dot0 = int(parmlist[1])
-        numdots = int(parmlist[2])
-        red = int(parmlist[3])
-        green = int(parmlist[4])
-        blue = int(parmlist[5])
+        dot0 = parmlist[1]
+        numdots = parmlist[2]
+        red = parmlist[3]
+        green = parmlist[4]
+        blue = parmlist[5]
         color = green << 16
         color += red << 8
         color += blue
         for idx in range(numdots):
             framebuf[dot0+idx] = color
-
-        # write the pattern out
-        self._strip.show()
-
-        # release the resource and return
-        self._strip.release()
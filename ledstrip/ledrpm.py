@@ -0,0 +1,138 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+"""rpm (LedRpm) - chase pattern that follows an engine speed.
+
+The pattern is started with an RPM value, and keeps running. The host then
+just sends each new RPM value as it gets it:
+
+    $rpm,<value>
+
+The display is worked out on the controller, at the frame rate. Dashes of
+light move along the strip faster as the RPM goes up, and their color moves
+around the color wheel from one hue at 0 RPM to another at the top RPM. A new
+value only changes the target, and the shown RPM eases toward it each frame,
+so the display stays smooth even if the values come in slowly or jump.
+
+The pattern runs until it is stopped:
+
+    $stop,rpm
+
+The configuration is:
+
+    $config,rpm,<max-rpm>,<max-speed>,<hue0>,<hue1>,<dash>,<gap>,<delay_ms>
+
+* max-rpm - the top RPM. Higher values are shown the same as this one
+* max-speed - how fast the dashes move at the top RPM, in 1/256 pixel per
+  frame. 256 is one pixel per frame
+* hue0 - hue at 0 RPM, 0-255 around the color wheel
+* hue1 - hue at the top RPM
+* dash - length of each dash in pixels
+* gap - number of dark pixels between dashes
+* delay_ms - frame period in milliseconds
+
+The colors are at full brightness. Use `$config,strips,<idx>,dim,<level>`
+to make them dimmer.
+
+*Example*
+
+Green dashes at idle that turn red and move at 2 pixels per frame at
+7000 RPM:
+
+    $config,rpm,7000,512,85,0,4,4,20
+    $rpm,800
+"""
+
+from ledeffects import LedEffect, hue_wheel
+from ledstrip import LedStrip
+import ledkernels
+
+class LedRpm(LedEffect):
+    helpstr = "rpm,<value>"
+    cfgstr = "max-rpm,max-speed,hue0,hue1,dash,gap,delay_ms"
+    schema = "i"
+    cfgschema = "iiiiiii"
+
+    def __init__(self, strip: LedStrip) -> None:
+        super().__init__(strip)
+        self._maxrpm = 7000
+        self._maxspeed = 512
+        self._hue0 = 85
+        self._hue1 = 0
+        self._dash = 4
+        self._gap = 4
+        self._wheel = None
+        self._target = 0
+        self._rpm = 0
+        self._pos = 0
+        self._running = False
+
+    def config(self, cfglist):
+        self._maxrpm = max(cfglist[2], 1)
+        self._maxspeed = max(cfglist[3], 0)
+        self._hue0 = cfglist[4] & 0xFF
+        self._hue1 = cfglist[5] & 0xFF
+        self._dash = max(cfglist[6], 1)
+        self._gap = max(cfglist[7], 0)
+        self._delay = cfglist[8]
+
+    def _settarget(self, rpm: int) -> None:
+        self._target = min(max(rpm, 0), self._maxrpm)
+
+    # a new value for the running pattern just changes the target
+    def update(self, parmlist) -> bool:
+        if self._running:
+            self._settarget(parmlist[1])
+            return True
+        return False
+
+    async def run(self, parmlist):
+        self._settarget(parmlist[1])
+        self._running = True
+        try:
+            await super().run(parmlist)
+        finally:
+            self._running = False
+
+    def start(self) -> None:
+        if self._wheel is None:
+            self._wheel = hue_wheel(255)
+        self._rpm = self._target
+        self._pos = 0
+
+    def draw(self, frames: int) -> None:
+        # ease toward the target, a quarter of the way each frame
+        for _ in range(frames):
+            diff = self._target - self._rpm
+            self._rpm += diff >> 2 if diff > 3 or diff < -3 else diff
+        rpm = self._rpm
+        maxrpm = self._maxrpm
+
+        # move the dashes, position is in 1/256 pixels within one dash period
+        period = self._dash + self._gap
+        speed = (rpm * self._maxspeed) // maxrpm
+        self._pos = (self._pos + (speed * frames)) % (period << 8)
+        hue = self._hue0 + (((self._hue1 - self._hue0) * rpm) // maxrpm)
+        color = self._wheel[hue & 0xFF]
+
+        buf = self._strip.buf
+        numpixels = len(buf)
+        ledkernels.fill(buf, 0, 0, numpixels)
+        start = (self._pos >> 8) - period
+        while start < numpixels:
+            first = max(start, 0)
+            last = min(start + self._dash, numpixels)
+            if last > first:
+                ledkernels.fill(buf, color, first, last - first)
+            start += period
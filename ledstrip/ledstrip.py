@@ -17,8 +17,11 @@
 
 import array
 import asyncio
+import time
 
 from cmdtemplate import CommandTemplate
+from frameclock import FrameClock
+import ledkernels
 
 try:
     import ws2812_pio as wspio
@@ -26,6 +29,9 @@
     from tests import ws2812_test as wspio
 
 
+DIM_FULL = 4096
+"""Dimming level for full brightness."""
+
 class LedStrip:
     """Attached LED strip which has its own PIO and pixel buffer.
 
@@ -46,22 +52,98 @@ class LedStrip:
     resources before writing to the buffer. The method [release] should be
     called when the client no longer needs access to the LED strip.
 
+    A strip can crossfade between patterns. If `fade_ms` is set and a pattern
+    takes over the strip from another pattern, the last frame of the old
+    pattern is kept, and the new pattern's frames are mixed with it over
+    `fade_ms` milliseconds. The old pattern's final clear is not shown.
+    One-shot commands do not fade, since they only show one frame.
+
+    A strip can also be dimmed with [set_dim][ledstrip.ledstrip.LedStrip.set_dim].
+    The pixels are scaled with 12-bit precision and temporal dithering as
+    they are shown, so patterns do not need to change and low brightness
+    levels still fade smoothly.
+
+    With a trail set ([set_trail][ledstrip.ledstrip.LedStrip.set_trail]), the
+    whole pixel buffer is faded a little after every show, so whatever a
+    pattern draws leaves a fading trail behind it. A chase becomes a comet.
+
+    A few pixels can be set aside as indicators, with
+    [set_indicator][ledstrip.ledstrip.LedStrip.set_indicator]. An indicator
+    pixel shows its own color over whatever the pattern draws there. It is
+    put in at the last moment of each show, so the pattern does not need to
+    know about it and the pixel buffer is not changed. Indicators are not
+    faded or dimmed.
+
+    One-shot commands are not run as their own tasks. They are passed to
+    [submit]. If the strip is not in use, the command is applied and shown
+    right away. Otherwise it is put in a small queue, and the queue is drained
+    by a single task that takes the lock once, applies every queued command,
+    and shows the strip once. A command that sets `coalesce` replaces any
+    older copy of itself that is still waiting in the queue, so only the
+    latest value is shown.
+
     :param smid: state machine number to use for PIO
     :param pin: GPIO pin number for the ws2812 signal
     :param numpixels: number of pixels in the string
+    :param clock: frame clock used by animated patterns. If not specified a
+        [FrameClock][ledstrip.frameclock.FrameClock] is used. Pass a
+        [TimerClock][ledstrip.frameclock.TimerClock] to time frames from a
+        hardware timer.
     """
 
-    def __init__(self, smid: int, pin: int, numpixels: int) -> None:
+    QUEUE_DEPTH = 8
+    """Maximum number of one-shot commands waiting for the strip."""
+
+    INDICATORS = 8
+    """Number of indicator slots."""
+
+    def __init__(self, smid: int, pin: int, numpixels: int,
+                 clock: FrameClock=None) -> None:
         self._buf = array.array("I", [0 for _ in range(numpixels)])
         self._numpixels = numpixels
         self._pio = ws = wspio.WS2812(smid, pin)
         self._lock = asyncio.Lock()
         self._user = None
+        # frame timing for animated patterns
+        self.clock = clock if clock else FrameClock()
+        # one-shot commands waiting to be applied, as (cmdobj, parmlist)
+        self._queue = []
+        self._draining = False
+        # state machine is stopped while the strip is idle
+        self._asleep = False
+        # number of times the strip was shown, and number of one-shot
+        # commands applied to it, so a command can tell if someone else
+        # updated the strip since its own last update
+        self.shows = 0
+        self.writes = 0
+        # palette mode buffers, created by use_palette()
+        self.index = None
+        self.palette = None
+        # crossfade between patterns
+        self.fade_ms = 0
+        """Crossfade time in milliseconds when a pattern replaces another."""
+        self._prev = None       # outgoing frame to fade from
+        self._handoff = False   # outgoing pattern is being stopped
+        self._fading = False
+        self._fadestart = 0
+        # dimming, 12-bit level and the carried dither error per channel
+        self._dim = DIM_FULL
+        self._err = None
+        # fade factor applied to the pixel buffer after each show, 0 for off
+        self._trail = 0
+        # indicator slots, pixel is -1 for a slot that is not used
+        self._indpix = array.array("i", [-1] * self.INDICATORS)
+        self._indcol = array.array("I", bytes(4 * self.INDICATORS))
+        self._indsave = array.array("I", bytes(4 * self.INDICATORS))
+        self._ind = False
+        # output buffer, when what is shown is not the pixel buffer itself
+        self._out = None
+        self._post = False
         # prebind the pio show method - thanks chatgpt!
         self.pio_show = self._pio.show
 
     def __str__(self):
-        return f"sm: {self._pio}, lock: {self._lock.locked()}, user: {self._user}"
+        return f"sm: {self._pio}, lock: {self._lock.locked()}, user: {self._user}, clock: {self.clock}"
 
     @property
     def buf(self) -> array.array:
@@ -77,20 +159,132 @@ async def acquire(self, newuser: CommandTemplate) -> None:
 
         :param newuser: client that is taking control of the LED strip
         """
+        fade = False
         if self._user:
+            if self.fade_ms and not newuser.oneshot:
+                # keep the outgoing frame to fade from, and do not show the
+                # outgoing pattern clearing the strip
+                if self._prev is None:
+                    self._prev = array.array("I", bytes(4 * self._numpixels))
+                self._prev[:] = self._buf
+                self._handoff = fade = True
             self._user.stop()
         await self._lock.acquire()
         self._user = newuser
+        if fade:
+            self._handoff = False
+            self._fading = True
+            self._fadestart = time.ticks_ms()
+            self._update_post()
 
     def release(self) -> None:
-        """Release the lock and clear the current user."""
+        """Release the lock and clear the current user.
+
+        This also stops the frame clock, in case it was started by the user.
+        """
+        self.clock.stop()
         self._lock.release()
         self._user = None
 
+    def submit(self, cmdobj: CommandTemplate, parmlist: list) -> bool:
+        """Apply a one-shot command to the strip, or queue it.
+
+        If the strip is not locked and nothing is queued, the command is
+        applied and the strip is shown before returning. There is nothing
+        that can run in between, so the lock is not needed.
+
+        Otherwise the command is queued. It is applied and shown by a task
+        that drains the queue, which is started if it is not already running.
+        If the command sets `coalesce` then any older copy of it still in the
+        queue is dropped.
+
+        :param cmdobj: one-shot command that implements `apply()`
+        :param parmlist: the parameters to pass to `apply()`
+        :return: False if the queue is full and the command was not queued
+        """
+        queue = self._queue
+        # fast path, strip is idle
+        if not queue and not self._lock.locked():
+            self.writes += 1
+            cmdobj.apply(parmlist)
+            self.show()
+            return True
+        if cmdobj.coalesce:
+            for idx in range(len(queue)):
+                if queue[idx][0] is cmdobj:
+                    del queue[idx]
+                    break
+        if len(queue) >= self.QUEUE_DEPTH:
+            return False
+        queue.append((cmdobj, parmlist))
+        if not self._draining:
+            self._draining = True
+            asyncio.create_task(self._drain())
+        return True
+
+    async def _drain(self) -> None:
+        # take the lock once and apply everything that is queued. more
+        # commands can be queued while waiting for the lock. the commands
+        # were already answered, so one that fails must not stop the rest
+        await self.acquire(self._queue[0][0])
+        try:
+            queue = self._queue
+            while queue:
+                cmdobj, parmlist = queue.pop(0)
+                self.writes += 1
+                try:
+                    cmdobj.apply(parmlist)
+                except Exception:
+                    pass
+            self.show()
+        finally:
+            self._draining = False
+            self.release()
+
+    def use_palette(self) -> None:
+        """Set up the buffers for palette mode.
+
+        In palette mode a pattern draws into `index`, a `bytearray` with one
+        byte per pixel, and sets the colors in `palette`, an `array("I")` of
+        256 packed colors. [expand][ledstrip.ledstrip.LedStrip.expand] then
+        fills the pixel buffer from the two before it is shown. A color cycle
+        only needs to change the palette, or just the offset passed to
+        `expand()`, instead of every pixel.
+
+        The buffers are created the first time this is called and are kept
+        for the next user.
+        """
+        if self.index is None:
+            self.index = bytearray(self._numpixels)
+            self.palette = array.array("I", bytes(256 * 4))
+
+    def expand(self, offset: int=0) -> None:
+        """Fill the pixel buffer from the palette mode buffers.
+
+        :param offset: added to each pixel index, to rotate the palette
+        """
+        ledkernels.expand(self._buf, self.index, self.palette, offset)
+
     def locked(self) -> bool:
         """Return True if the lock is currently held."""
         return self._lock.locked()
 
+    @property
+    def busy(self) -> bool:
+        """True if the strip is in use or has one-shot commands waiting."""
+        return self._lock.locked() or bool(self._queue)
+
+    def sleep(self) -> None:
+        """Stop the PIO state machine while the strip is not in use.
+
+        This is used to save power when nothing is running. The pixels keep
+        showing the last frame. The state machine is started again by the next
+        [show][ledstrip.ledstrip.LedStrip.show].
+        """
+        if not self._asleep:
+            self._pio.active(False)
+            self._asleep = True
+
     def clear(self) -> None:
         """Clear the LED strip by setting all pixels to 0 (off), and then
         updating the display."""
@@ -104,6 +298,120 @@ def fill(self) -> None:
             self._buf[pix] = 0x101010
         self.show()
 
+    def _update_post(self) -> None:
+        # work out if the pixel buffer needs processing before it is shown
+        self._post = self._fading or self._dim < DIM_FULL
+        if self._post and self._out is None:
+            self._out = array.array("I", bytes(4 * self._numpixels))
+
+    def _show_post(self) -> array.array:
+        # process the pixel buffer into the output buffer, and return the
+        # buffer to show
+        src = self._buf
+        if self._fading:
+            elapsed = time.ticks_diff(time.ticks_ms(), self._fadestart)
+            if elapsed >= self.fade_ms:
+                # fade is done
+                self._fading = False
+                self._update_post()
+            else:
+                ledkernels.blend(self._out, self._prev, src,
+                                 (elapsed << 8) // self.fade_ms)
+                src = self._out
+        if self._dim < DIM_FULL:
+            ledkernels.dither(self._out, src, self._err, self._dim)
+            src = self._out
+        return src
+
+    def _show_ind(self, src: array.array) -> None:
+        # put the indicators in, show, and then put back what was there
+        indpix = self._indpix
+        save = self._indsave
+        for slot in range(self.INDICATORS):
+            pix = indpix[slot]
+            if pix >= 0:
+                save[slot] = src[pix]
+                src[pix] = self._indcol[slot]
+        self.pio_show(src)
+        for slot in range(self.INDICATORS - 1, -1, -1):
+            pix = indpix[slot]
+            if pix >= 0:
+                src[pix] = save[slot]
+
+    def set_indicator(self, slot: int, pixel: int, color: int) -> None:
+        """Show a fixed color on a pixel, over whatever is drawn there.
+
+        The strip is not shown.
+
+        :param slot: indicator slot, 0 to `INDICATORS`-1
+        :param pixel: the pixel for the indicator
+        :param color: packed color for the pixel
+        """
+        if pixel < 0 or pixel >= self._numpixels:
+            raise ValueError(pixel)
+        self._indpix[slot] = pixel
+        self._indcol[slot] = color
+        self._ind = True
+
+    def clear_indicator(self, slot: int) -> None:
+        """Stop using an indicator slot, so its pixel shows the pattern again.
+
+        The strip is not shown.
+
+        :param slot: indicator slot, 0 to `INDICATORS`-1
+        """
+        self._indpix[slot] = -1
+        self._ind = any(pix >= 0 for pix in self._indpix)
+
+    def decay(self, start: int, count: int, factor: int) -> None:
+        """Fade a range of pixels in the pixel buffer.
+
+        Every color channel is scaled by `factor`/256. The strip is not
+        shown.
+
+        :param start: first pixel to fade
+        :param count: number of pixels, it is cut off at the end of the strip
+        :param factor: scale factor, 0-255. Lower fades faster
+        """
+        start = min(max(start, 0), self._numpixels)
+        count = min(count, self._numpixels - start)
+        if count > 0:
+            ledkernels.decay(self._buf, start, count, factor & 0xFF)
+
+    def set_trail(self, factor: int) -> None:
+        """Fade the pixel buffer after every show, to leave trails.
+
+        Patterns that only redraw the pixels that change, like meter, will
+        also fade out when a trail is set.
+
+        :param factor: scale factor applied after each show, 1-255. Higher
+            values give longer trails. 0 turns trails off
+        """
+        self._trail = min(max(factor, 0), 255)
+
+    def set_dim(self, level: int) -> None:
+        """Set the brightness of everything shown on the strip.
+
+        :param level: brightness from 0 to 4096. 4096 is full brightness and
+            turns dimming off
+        """
+        self._dim = min(max(level, 0), DIM_FULL)
+        if self._dim < DIM_FULL and self._err is None:
+            self._err = array.array("H", bytes(6 * self._numpixels))
+        self._update_post()
+
     def show(self) -> None:
         """Repaint the strip with the current buffer contents."""
-        self.pio_show(self._buf)
+        if self._handoff:
+            return
+        if self._asleep:
+            self._pio.active(True)
+            self._asleep = False
+        self.shows += 1
+        src = self._show_post() if self._post else self._buf
+        if self._ind:
+            self._show_ind(src)
+        else:
+            self.pio_show(src)
+        if self._trail:
+            ledkernels.decay(self._buf, 0, self._numpixels, self._trail)
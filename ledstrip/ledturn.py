@@ -20,6 +20,8 @@
 class LedTurn(CommandTemplate):
     helpstr = "turn signal chaser"
     cfgstr = "start,stop,r,g,b,delay_ms"
+    schema = ""
+    cfgschema = "iiiiii"
 
     def __init__(self, strip: LedStrip, start=0, stop=30, red=64, grn=0, blu=0, delay=0):
         super().__init__(strip)
@@ -43,12 +45,12 @@ def __init__(self, strip: LedStrip, start=0, stop=30, red=64, grn=0, blu=0, dela
     # 6 - blue color (0-255)
     # 7 - delay in milliseconds
     def config(self, cfglist):
-        self._start = int(cfglist[2])
-        self._stop = int(cfglist[3])
-        self._color = ((int(cfglist[4]) << 16)
-                    + (int(cfglist[5]) << 8)
-                    + int(cfglist[6]))
-        self._delay = int(cfglist[7])
+        self._start = cfglist[2]
+        self._stop = cfglist[3]
+        self._color = ((cfglist[4] << 16)
+                    + (cfglist[5] << 8)
+                    + cfglist[6])
+        self._delay = cfglist[7]
         self._stride = 1 if self._stop >= self._start else -1
         self._pix = self._start
         self._on = True
@@ -62,20 +64,25 @@ async def run(self, parmlist) -> None:
         await self._strip.acquire(self)
         # at this point we have locked access to LED strip
 
+        clock = self._strip.clock
+        clock.start(self._delay)
+        steps = 1
         while not self._stoprequest:
-            # compute next pixel to be updated
-            pixcolor = self._color if self._on else 0
-            framebuf[self._pix] = pixcolor
-            self._pix += self._stride
-            if (((self._stride == 1) and (self._pix > self._stop))
-               or ((self._stride == -1) and (self._pix < self._stop))):
-                self._on = not self._on
-                self._pix = self._start
+            # compute next pixel to be updated. if frames were missed then
+            # catch up by more than one pixel, to keep the same speed
+            for _ in range(steps):
+                pixcolor = self._color if self._on else 0
+                framebuf[self._pix] = pixcolor
+                self._pix += self._stride
+                if (((self._stride == 1) and (self._pix > self._stop))
+                   or ((self._stride == -1) and (self._pix < self._stop))):
+                    self._on = not self._on
+                    self._pix = self._start
 
             # update the display
             self._strip.show()
-            # yield for the update delay time
-            await asyncio.sleep_ms(self._delay)
+            # yield until the next frame
+            steps = await clock.wait()
 
         # clean exit - clear display and release lock
         self._strip.clear()
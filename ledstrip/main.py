@@ -1,36 +1,34 @@
 
 import asyncio
 import cmdif
-from console_std import console_writeln
 from cmdclasses import *
 from  cmdtemplate import CommandTemplate
 import ledstrip
+from frameclock import TimerClock
+from cmdstrips import CmdStrips
+from config_store import ConfigStore
 
 # TODO: figure out how to make a "customization" module or plugin that can
 # be used for each RGB pico to customize it for its unique patterns while
 # reusing all the other code
 
-# TODO move this to its own file
-# provide a command to query the list of LED strips in the system
-class CmdStrips(CommandTemplate):
-    """Display table of LED strips..
+# set to True to time animation frames from a hardware timer instead of the
+# asyncio loop
+FRAME_TIMER = False
 
-    This command prints a simple table of the instantiated `ledstrip` classes
-    for diagnostic purposes.
-    """
-    helpstr = "show LED strip resources"
+# scene to recall at boot (see CmdScene), or None to start with the strips off
+BOOT_SCENE = None
 
-    def __init__(self, ledstrips: list[ledstrip.LedStrip]) -> None:
-        super().__init__(strip=None)
-        self._strips = ledstrips
-
-    async def run(self, parmlist: list[str]) -> None:
-        for idx, strip in enumerate(self._strips):
-            console_writeln(f"{idx}: {str(strip)}")
+# set to True to keep the command configs over a reset (see config_store)
+KEEP_CONFIG = True
 
 # create the led strip instances
-strip0 = ledstrip.LedStrip(0, 16, 144)
-strip1 = ledstrip.LedStrip(1, 19, 144)
+if FRAME_TIMER:
+    strip0 = ledstrip.LedStrip(0, 16, 144, clock=TimerClock())
+    strip1 = ledstrip.LedStrip(1, 19, 144, clock=TimerClock())
+else:
+    strip0 = ledstrip.LedStrip(0, 16, 144)
+    strip1 = ledstrip.LedStrip(1, 19, 144)
 
 # create the command interface. all commands will be added to the ci
 ci = cmdif.CmdInterface()
@@ -39,9 +37,13 @@ async def run(self, parmlist: list[str]) -> None:
 stripcmd = CmdStrips([strip0, strip1])
 ci.add_cmd("strips", stripcmd)
 range0 = LedRange(strip0)
-ci.add_cmd("range0", range0)
+ci.add_cmd("range0", range0, alias="r")
 range1 = LedRange(strip1)
-ci.add_cmd("range1", range1)
+ci.add_cmd("range1", range1, alias="r1")
+px0 = LedPixels(strip0)
+ci.add_cmd("px0", px0, alias="p")
+px1 = LedPixels(strip1)
+ci.add_cmd("px1", px1, alias="p1")
 random = LedRandom(strip0)
 ci.add_cmd("random", random)
 randomog = LedRandomOG(strip1)
@@ -51,12 +53,42 @@ async def run(self, parmlist: list[str]) -> None:
 rightturn = LedTurn(strip=strip1, start=0, stop=30)
 ci.add_cmd("right", rightturn)
 meter = LedMeter(strip0)
-ci.add_cmd("meter", meter)
+ci.add_cmd("meter", meter, alias="m")
+cycle = LedCycle(strip1)
+ci.add_cmd("cycle", cycle)
+play = LedPlay(strip0)
+ci.add_cmd("play", play)
+rainbow = LedRainbow(strip0)
+ci.add_cmd("rainbow", rainbow)
+plasma = LedPlasma(strip0)
+ci.add_cmd("plasma", plasma)
+breathe = LedBreathe(strip1)
+ci.add_cmd("breathe", breathe)
+fire = LedFire(strip1)
+ci.add_cmd("fire", fire)
+particles = LedParticles(strip1)
+ci.add_cmd("particles", particles)
+rpm = LedRpm(strip0)
+ci.add_cmd("rpm", rpm)
+ind = LedIndicator(strip0)
+ci.add_cmd("ind", ind)
+bands = LedBands(strip0)
+ci.add_cmd("bands", bands)
 
-# start up command interface loop as main coroutine loop
-# it will dispatch commands as coroutine tasks
+# restore the kept configs and recall the boot scene, if there is one, and
+# then start up the command interface loop as main coroutine loop. it will
+# dispatch commands as coroutine tasks
 #
-asyncio.run(ci.run())
+async def start():
+    if KEEP_CONFIG:
+        store = ConfigStore(ci)
+        store.load()
+        asyncio.create_task(store.run())
+    if BOOT_SCENE is not None:
+        ci._cmds["scene"].load(BOOT_SCENE)
+    await ci.run()
+
+asyncio.run(start())
 
 # getting here means the main run loop exited, which is not usual
 print("RGB LED strip program exited")
@@ -123,6 +123,23 @@ def __init__(self, smid: int, pin: int) -> None:
     def __str__(self):
         return f"ws2812: {self._sm}, {self._ws_pin}"
 
+    def active(self, enable: bool) -> None:
+        """Start or stop the state machine.
+
+        A stopped state machine uses less power. Before stopping, this waits
+        for any pixel data still in the FIFO to be shifted out, so the last
+        frame is complete and the output is left low. The state machine must
+        be started again before calling ``show``.
+
+        :param enable: True to start the state machine, False to stop it
+        """
+        sm = self._sm
+        if not enable:
+            while sm.tx_fifo():
+                pass
+            time.sleep_us(40)   # last pixel is still being shifted out
+        sm.active(1 if enable else 0)
+
     def shutdown(self):
         """Halt the state machine.
 
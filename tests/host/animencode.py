@@ -0,0 +1,121 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+"""
+animencode - make animation files for the play command.
+
+Renders an animation on the host with NumPy and writes it in the animation
+file format that is played by the `play` command (see ledplay.py for the
+format). Frames that change only a few pixels are written as delta frames.
+
+Usage:
+
+    python animencode.py <effect> <outfile> [--pixels N] [--frames N] [--period MS]
+
+The file is then copied to the controller, for example:
+
+    mpremote cp comet.lsa :comet.lsa
+
+and played with `$play,comet.lsa,1`.
+
+This needs NumPy, which is not part of the project requirements.
+"""
+
+import argparse
+import struct
+
+import numpy as np
+
+MAGIC = b"LSAN"
+VERSION = 1
+HEADER = "<4sBBHHHI"
+FRAME_HEADER = "<BH"
+KEY_FRAME = 0
+DELTA_FRAME = 1
+
+def encode(frames: np.ndarray, period: int, keyinterval: int=0) -> bytes:
+    """Encode rendered frames as an animation file.
+
+    :param frames: uint8 array of shape (frames, pixels, 3), in RGB order
+    :param period: frame period in milliseconds
+    :param keyinterval: if not 0, force a key frame at this interval
+    :return: contents of the animation file
+    """
+    numframes, numpixels, _ = frames.shape
+    out = [struct.pack(HEADER, MAGIC, VERSION, 0, numpixels, period,
+                       numframes, 0)]
+    prev = None
+    for idx, frame in enumerate(frames):
+        key = prev is None or (keyinterval and idx % keyinterval == 0)
+        if not key:
+            changed = np.nonzero(np.any(frame != prev, axis=1))[0]
+            # delta frame is 5 bytes per changed pixel, key frame is 3 bytes
+            # per pixel, use whichever is smaller
+            key = len(changed) * 5 >= numpixels * 3
+        if key:
+            out.append(struct.pack(FRAME_HEADER, KEY_FRAME, numpixels))
+            out.append(frame.astype(np.uint8).tobytes())
+        else:
+            records = np.zeros((len(changed), 5), dtype=np.uint8)
+            records[:, 0] = changed & 0xFF
+            records[:, 1] = changed >> 8
+            records[:, 2:] = frame[changed]
+            out.append(struct.pack(FRAME_HEADER, DELTA_FRAME, len(changed)))
+            out.append(records.tobytes())
+        prev = frame
+    return b"".join(out)
+
+def render_comet(numframes: int, numpixels: int) -> np.ndarray:
+    """A comet with a fading tail that travels along the strip."""
+    pos = np.arange(numpixels)
+    frames = np.zeros((numframes, numpixels, 3), dtype=np.uint8)
+    for idx in range(numframes):
+        head = idx % numpixels
+        dist = (head - pos) % numpixels
+        level = np.where(dist < 20, 255 * (0.8 ** dist), 0)
+        frames[idx, :, 0] = level
+        frames[idx, :, 2] = level // 4
+    return frames
+
+def render_rainbow(numframes: int, numpixels: int) -> np.ndarray:
+    """A rainbow that scrolls along the strip."""
+    pos = np.arange(numpixels)
+    frames = np.zeros((numframes, numpixels, 3), dtype=np.uint8)
+    for idx in range(numframes):
+        hue = ((pos / numpixels) + (idx / numframes)) % 1.0
+        for chan, shift in enumerate((0.0, 1/3, 2/3)):
+            wave = np.cos(2 * np.pi * (hue - shift))
+            frames[idx, :, chan] = np.clip(wave, 0, 1) * 64
+    return frames
+
+EFFECTS = {"comet": render_comet, "rainbow": render_rainbow}
+
+def main():
+    parser = argparse.ArgumentParser(description="make an animation file")
+    parser.add_argument("effect", choices=EFFECTS.keys())
+    parser.add_argument("outfile")
+    parser.add_argument("--pixels", type=int, default=144)
+    parser.add_argument("--frames", type=int, default=144)
+    parser.add_argument("--period", type=int, default=20)
+    parser.add_argument("--keyinterval", type=int, default=0)
+    args = parser.parse_args()
+
+    frames = EFFECTS[args.effect](args.frames, args.pixels)
+    data = encode(frames, args.period, args.keyinterval)
+    with open(args.outfile, "wb") as outfile:
+        outfile.write(data)
+    print(f"{args.outfile}: {args.frames} frames, {len(data)} bytes")
+
+if __name__ == "__main__":
+    main()
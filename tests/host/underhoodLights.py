@@ -91,16 +91,9 @@ def __init__(self):
 
         self.openSerialPort()
 
-        self.pat1PatIdx = 0
-        self.pat1Offset = 0
-
-        self.pattern1Dict = {}
-        self.pattern1Dict[0] = dict(red =   5, green =   0, blue =   0, numDots = 5, base =   0, offset = 0)
-        self.pattern1Dict[1] = dict(red =   0, green =   0, blue =   0, numDots = 5, base =   5, offset = 0)
-        self.pattern1Dict[2] = dict(red =   0, green =   5, blue =   0, numDots = 5, base =  10, offset = 0)
-        self.pattern1Dict[3] = dict(red =   0, green =   0, blue =   0, numDots = 5, base =  15, offset = 0)
-        self.pattern1Dict[4] = dict(red =   0, green =   0, blue =   5, numDots = 5, base =  20, offset = 0)
-        self.pattern1Dict[5] = dict(red =   0, green =   0, blue =   0, numDots = 5, base =  25, offset = 0)
+        # pattern 1 is red, green and blue bands of 5 pixels with dark gaps,
+        # scrolled by the controller one pixel every 20 ms
+        self.pattern1Config = '$config,bands,256,20,5,0,0,5,0,0,0,5,0,5,0,5,0,0,0,5,0,0,5,5,0,0,0,5'
 
 
         self.chargerCanIds = {0x390: 'pdm', 0x393 : 'statusBits', 0x679 : 'wakeUp', 0x1F2 : 'chargePower' }
@@ -119,6 +112,8 @@ def __init__(self):
         #self.chargerPubPortNum = options.chargerCanPubPortNum
         #self.chargerPubHost    = options.chargerCanPublishHost
         self.lastRpm           = 0
+        # an rpm that arrived while waiting for a reply, sent on the next $OK
+        self.rpmPending        = False
 
         #self.initMotorCanSocket()
         #self.initChargerCanSocket()
@@ -193,6 +188,8 @@ def processReply(self):
             print("Ready for next msg")
             if self.repeatSend:
                 self.sendNext()
+            elif self.pattern == 3 and self.rpmPending:
+                self.sendNext()
 
         else:
             print(text)
@@ -209,12 +206,7 @@ def sendNext(self):
         self.nextToSend = None
 
         if self.lastCarMode == 'charge':
-            if self.chargerDict['OBC_Status_AC_Voltage'] == 'No Signal':
-                toSend = '$range,%d,%d,%d,%d,%d'%(417, 1, 0, 50, 0 )
-            elif self.chargerDict['OBC_Status_AC_Voltage'] == '200V':
-                toSend = '$range,%d,%d,%d,%d,%d'%(417, 1, 50, 0, 0 )
-            else:
-                toSend = '$range,%d,%d,%d,%d,%d'%(417, 1, 0, 0, 50 )
+            toSend = self.chargeIndicatorMsg()
 
             toSend += '\n'
             bytesToSend = toSend.encode('utf-8')
@@ -228,7 +220,9 @@ def sendNext(self):
 
 
         if self.pattern == 1:
-            self.doNextPatternOne()
+            # the controller runs the pattern, so it is only started once
+            toSend = self.pattern1Config + '\n$bands\n'
+            ret = self.ser.write(toSend.encode('utf-8'))
             self.readyToSend = False
 
 
@@ -265,10 +259,10 @@ def sendNext(self):
 
         elif self.pattern == 3:
 
-            perc = int(self.lastRpm/100)
-            if perc > 100:
-                perc = 100
-            toSend = '$meter,%d'%(perc) 
+            # the controller works out the display from the rpm
+            toSend = '$rpm,%d'%(int(self.lastRpm))
+            self.rpmPending = False
+            self.readyToSend = False
 
             toSend += '\n'
             bytesToSend = toSend.encode('utf-8')
@@ -281,42 +275,6 @@ def sendNext(self):
 
 
 
-    def doNextPatternOne(self):
-        """
-        """
-
-#        import pdb; pdb.set_trace()
-
-        #print("doNextPatternOne")
-
-        retDict = self.pattern1Dict[self.pat1PatIdx]
-        self.pat1PatIdx += 1
-        if self.pat1PatIdx >= len(self.pattern1Dict):
-            self.pat1PatIdx = 0
-
-        endPix = retDict['base'] + retDict['offset'] + retDict['numDots']
-        if endPix > 417:
-            #print("reached end of pixels, handle this")
-            if retDict['base'] + retDict['offset'] >= 417:
-                retDict['offset'] = 0
-            else:
-                retDict['offset'] += 1  # we have to move it forward
-                bytesToSend = self.setRangeMsg(0, 1, random.randint(0,255), random.randint(0,255), random.randint(0,255) )
-                ret = self.ser.write(bytesToSend)
-                self.nextToSend = bytesToSend
-
-
-                return
-
-
-        
-        bytesToSend = self.setRangeMsg(retDict['base'] + retDict['offset'], retDict['numDots'], retDict['red'], retDict['green'], retDict['blue'] )
-        ret = self.ser.write(bytesToSend)
-        self.nextToSend = bytesToSend
-        retDict['offset'] += 1
-
-
-
     def updateDirection(self):
         """
         """
@@ -325,12 +283,7 @@ def updateDirection(self):
         #print("Got a new carMode, %s"%(self.lastCarMode))
 
         if self.lastCarMode == 'charge':
-            if self.chargerDict['OBC_Status_AC_Voltage'] == 'No Signal':
-                toSend = '$range,%d,%d,%d,%d,%d'%(417, 1, 0, 50, 0 )
-            elif self.chargerDict['OBC_Status_AC_Voltage'] == '200V':
-                toSend = '$range,%d,%d,%d,%d,%d'%(417, 1, 50, 0, 0 )
-            else:
-                toSend = '$range,%d,%d,%d,%d,%d'%(417, 1, 0, 0, 50 )
+            toSend = self.chargeIndicatorMsg()
 
 
 
@@ -379,10 +332,27 @@ def setRangeMsg(self, start = 0, number = 417, red = 0, green = 0, blue = 0):
 
 
 
+    def chargeIndicatorMsg(self):
+        """
+        return the indicator command for the charger status. The indicator
+        is shown by the controller over whatever pattern is running
+        """
+        if self.chargerDict['OBC_Status_AC_Voltage'] == 'No Signal':
+            state = 1
+        elif self.chargerDict['OBC_Status_AC_Voltage'] == '200V':
+            state = 2
+        else:
+            state = 3
+        return '$ind,0,%d'%(state)
+
+
+
     def startCom(self):
         """
         """
-        toSend = '$range,0,417,0,0,0'
+        # last pixel is the charger status indicator, green/red/blue
+        toSend = '$config,ind,0,417,003200,320000,000032\n'
+        toSend += '$range,0,417,0,0,0'
         toSend += '\n'
         bytesToSend = toSend.encode('utf-8')
         
@@ -409,9 +379,9 @@ def doPattern1(self, msg):
 
 #        import pdb; pdb.set_trace()
 
-        self.repeatSend = True
+        self.repeatSend = False
         self.pattern      = 1
-        self.nextToSend = self.setRangeMsg(0, 417, 0, 0, 0)
+        self.nextToSend = None
         if self.readyToSend:
             self.sendNext()
        
@@ -427,11 +397,30 @@ def doPattern2(self, msg):
             self.sendNext()
        
 
+    def updateRpm(self, rpm):
+        """
+        called by the motor CAN handler with each new rpm. only a changed
+        value is sent, one $rpm message per update
+        """
+
+        rpm = int(rpm)
+        if rpm == self.lastRpm:
+            return
+        self.lastRpm = rpm
+        if self.pattern != 3:
+            return
+        if self.readyToSend:
+            self.sendNext()
+        else:
+            self.rpmPending = True
+
+
     def doRpmMode(self, msg):
         """
         """
 
-        self.repeatSend = True
+        # rpm is sent by updateRpm() when the CAN handler has a new value
+        self.repeatSend = False
         self.pattern      = 3
         self.nextToSend = self.setRangeMsg(0, 417, 0, 0, 0)
         if self.readyToSend:
@@ -0,0 +1,83 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+#
+
+# This file measures console output throughput of the console_std (USB
+# serial) and console_uart (hardware UART) modules. It is meant to be run on
+# the rp2 target board that already has the console modules installed.
+#
+# The same block of command replies is written through each console, one
+# line per write, and then again using buffered output with a single flush.
+# The results are printed to the REPL at the end.
+#
+# To also measure UART receive, connect the UART TX pin to the UART RX pin
+# (GPIO 0 to GPIO 1 with the default settings). Otherwise the receive
+# measurement will show 0 bytes.
+
+import time
+import console_std
+import console_uart
+
+NUMLINES = 200
+LINE = "$OK"
+
+def bench_writes(con, buffered):
+    con.console_buffered(buffered)
+    start = time.ticks_us()
+    for _ in range(NUMLINES):
+        con.console_writeln(LINE)
+    con.console_flush()
+    elapsed = time.ticks_diff(time.ticks_us(), start)
+    con.console_buffered(False)
+    return elapsed
+
+def bench_uart_read():
+    # anything sent so far was looped back, so discard it
+    while console_uart.console_read():
+        pass
+    line = "$range,0,10,0,0,128\n"
+    for _ in range(10):
+        console_uart.console_write(line)
+    # wait for the bytes to arrive, 10 lines at 115200 is about 20 ms
+    time.sleep_ms(50)
+    start = time.ticks_us()
+    received = 0
+    while True:
+        incoming = console_uart.console_read()
+        if not incoming:
+            break
+        received += len(incoming)
+    elapsed = time.ticks_diff(time.ticks_us(), start)
+    return received, elapsed
+
+def run():
+    console_std.console_init()
+    console_uart.console_init()
+    numbytes = NUMLINES * (len(LINE) + 2)
+    results = []
+    for name, con in (("std", console_std), ("uart", console_uart)):
+        for buffered in (False, True):
+            elapsed = bench_writes(con, buffered)
+            results.append((name, buffered, elapsed))
+    received, elapsed = bench_uart_read()
+
+    print("")
+    print(f"{NUMLINES} lines, {numbytes} bytes")
+    for name, buffered, elapsed in results:
+        mode = "buffered" if buffered else "per-line"
+        rate = (numbytes * 1000000) // elapsed if elapsed else 0
+        print(f"{name:<5} {mode:<9}: {elapsed:>8} us, {rate:>8} bytes/s")
+    print(f"uart read: {received} bytes in {elapsed} us")
+
+run()
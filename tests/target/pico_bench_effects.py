@@ -0,0 +1,63 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+# This file measures how long the effect patterns in ledeffects take to draw
+# one frame, for a short and a long LED strip. It is meant to be run on the
+# rp2 target board that already has the firmware modules installed:
+#
+#     make picobench_effects
+#
+# It can also be run on the host with the unix port of micropython, to
+# compare changes, with "make hostbench_effects". Host times are much
+# shorter than on the target.
+#
+# Only the drawing is measured, not the transfer to the LED strip. The result
+# for each effect is the average time per frame, and whether that fits in a
+# 60 frames per second budget.
+
+import array
+import time
+
+import ledeffects
+
+NUMFRAMES = 100
+STRIPS = (144, 417)
+BUDGET_US = 16667   # 60 fps
+
+# just enough of LedStrip for the effects to draw
+class FakeStrip():
+
+    def __init__(self, numpixels):
+        self.buf = array.array("I", bytes(numpixels * 4))
+
+def bench(effectclass, numpixels):
+    effect = effectclass(FakeStrip(numpixels))
+    effect.start()
+    start = time.ticks_us()
+    for _ in range(NUMFRAMES):
+        effect.draw(1)
+    return time.ticks_diff(time.ticks_us(), start) // NUMFRAMES
+
+def run():
+    print("")
+    print(f"average draw time per frame, {NUMFRAMES} frames")
+    for effectclass in (ledeffects.LedRainbow, ledeffects.LedBreathe,
+                        ledeffects.LedPlasma, ledeffects.LedFire):
+        for numpixels in STRIPS:
+            elapsed = bench(effectclass, numpixels)
+            verdict = "ok" if elapsed < BUDGET_US else "OVER"
+            print(f"{effectclass.__name__:<11} {numpixels:>4} pixels: "
+                  f"{elapsed:>6} us  {verdict}")
+
+run()
@@ -29,10 +29,12 @@
 
 import unittest
 import asyncio
+import os
 
 from ledstrip import cmdif
-from cmdtemplate import CommandTemplate
+from cmdtemplate import CommandTemplate, format_parms
 from ledstrip import ledstrip
+import console_std
 
 # some globals used for tracking test states and events
 call_count = 0
@@ -131,6 +133,32 @@ async def run(self, parmlist):
         self.is_running = False
         self._strip.release()
 
+# one-shot command that sets a single pixel, used for batch testing
+class PixelCommand(CommandTemplate):
+    helpstr = "one-shot pixel command"
+    oneshot = True
+
+    def apply(self, parmlist):
+        global call_count
+        call_count += 1
+        self._strip.buf[int(parmlist[1])] = int(parmlist[2])
+
+# one-shot command where only the latest value matters
+class LatestCommand(PixelCommand):
+    coalesce = True
+
+# command with parameter schemas, for checking conversion
+class SchemaCommand(BasicCommand):
+    schema = "ix"
+    cfgschema = "is*"
+
+# command whose config values are checked beyond the schema
+class CheckedCommand(SchemaCommand):
+    cfgschema = "i"
+
+    def validate_config(self, cfglist):
+        return super().validate_config(cfglist) and cfglist[2] >= 0
+
 class TestBasicAdd(unittest.TestCase):
 
     def setUp(self):
@@ -344,5 +372,393 @@ async def async_test_config(self):
     def test_config(self):
         asyncio.run(self.async_test_config())
 
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        reset_globals()
+        self.ci = cmdif.CmdInterface()
+        self.strip = ledstrip.LedStrip(0, 16, 100)
+        self.pix_cmd = PixelCommand(self.strip)
+        self.ci.add_cmd("pix", self.pix_cmd)
+        self.ci.add_cmd("basic", BasicCommand())
+        # count the number of times the strip is shown
+        self.shows = 0
+        def counting_show():
+            self.shows += 1
+        self.strip.show = counting_show
+
+    # all commands in the batch are applied, and the strip is shown once
+    # before setup returns
+    async def async_test_batch(self):
+        newparms = ["pix", "1", "17", ";", "pix", "2", "18", ";", "pix", "3", "19"]
+        ret = self.ci.setup(newparms)
+        self.assertEqual(ret, self.ci._batch)
+        self.assertEqual(call_count, 3)
+        self.assertEqual(self.shows, 1)
+        self.assertEqual(self.strip.buf[1], 17)
+        self.assertEqual(self.strip.buf[2], 18)
+        self.assertEqual(self.strip.buf[3], 19)
+        self.assertFalse(self.strip.locked())
+
+    def test_batch(self):
+        asyncio.run(self.async_test_batch())
+
+    # a batch with any command that is not one-shot is rejected as a whole
+    async def async_test_batch_bad(self):
+        newparms = ["pix", "1", "17", ";", "basic", "1"]
+        ret = self.ci.setup(newparms)
+        self.assertIsNone(ret)
+        newparms = ["pix", "1", "17", ";", "foo", "1"]
+        ret = self.ci.setup(newparms)
+        self.assertIsNone(ret)
+        # one-shot commands without a strip are not batched either
+        newparms = ["pix", "1", "17", ";", "scene", "5"]
+        ret = self.ci.setup(newparms)
+        self.assertIsNone(ret)
+        await asyncio.sleep(0.1)
+        self.assertEqual(call_count, 0)
+        self.assertEqual(self.shows, 0)
+        self.assertEqual(self.strip.buf[1], 0)
+
+    def test_batch_bad(self):
+        asyncio.run(self.async_test_batch_bad())
+
+    # a command that fails while the batch runs does not stop the others
+    async def async_test_batch_raises(self):
+        newparms = ["pix", "1", "17", ";", "pix", "999", "18", ";", "pix", "3", "19"]
+        ret = self.ci.setup(newparms)
+        self.assertEqual(ret, self.ci._batch)
+        await asyncio.sleep(0.1)
+        self.assertEqual(call_count, 3)
+        self.assertEqual(self.shows, 1)
+        self.assertEqual(self.strip.buf[1], 17)
+        self.assertEqual(self.strip.buf[3], 19)
+        self.assertFalse(self.strip.locked())
+
+    def test_batch_raises(self):
+        asyncio.run(self.async_test_batch_raises())
+
+    # a batch for a busy strip is queued, and keeps its place in the queue
+    async def async_test_batch_queued(self):
+        self.strip.fade_ms = 100
+        await self.strip.acquire(self.pix_cmd)
+        ret = self.ci.setup(["pix", "1", "17", ";", "pix", "2", "18"])
+        self.assertEqual(ret, self.ci._batch)
+        ret = self.ci.setup(["pix", "1", "19"])
+        self.assertEqual(ret, self.pix_cmd)
+        self.assertEqual(call_count, 0)
+        # let the queue start waiting for the strip
+        await asyncio.sleep(0)
+        self.strip.release()
+        await asyncio.sleep(0.1)
+        self.assertEqual(call_count, 3)
+        self.assertEqual(self.shows, 1)
+        self.assertEqual(self.strip.buf[1], 19)
+        self.assertEqual(self.strip.buf[2], 18)
+        # a batch is a one-shot, so it does not start a crossfade
+        self.assertFalse(self.strip._fading)
+        self.assertFalse(self.strip.locked())
+
+    def test_batch_queued(self):
+        asyncio.run(self.async_test_batch_queued())
+
+    # a batch that does not fit in the queue is not applied at all
+    async def async_test_batch_busy(self):
+        await self.strip.acquire(self.pix_cmd)
+        for idx in range(self.strip.QUEUE_DEPTH):
+            self.ci.setup(["pix", str(idx), "1"])
+        ret = self.ci.setup(["pix", "10", "17", ";", "pix", "11", "18"])
+        self.assertIsNone(ret)
+        self.strip.release()
+        await asyncio.sleep(0.1)
+        self.assertEqual(call_count, self.strip.QUEUE_DEPTH)
+        self.assertEqual(self.strip.buf[10], 0)
+
+    def test_batch_busy(self):
+        asyncio.run(self.async_test_batch_busy())
+
+class TestQueue(unittest.TestCase):
+
+    def setUp(self):
+        reset_globals()
+        self.ci = cmdif.CmdInterface()
+        self.strip = ledstrip.LedStrip(0, 16, 100)
+        self.pix_cmd = PixelCommand(self.strip)
+        self.ci.add_cmd("pix", self.pix_cmd)
+        self.latest_cmd = LatestCommand(self.strip)
+        self.ci.add_cmd("latest", self.latest_cmd)
+        self.led_cmd = LedCommand(self.strip)
+        self.ci.add_cmd("led", self.led_cmd)
+        self.shows = 0
+        def counting_show():
+            self.shows += 1
+        self.strip.show = counting_show
+
+    # one-shot command on an idle strip is applied before setup returns
+    def test_fast_path(self):
+        ret = self.ci.setup(["pix", "1", "11"])
+        self.assertEqual(ret, self.pix_cmd)
+        self.assertEqual(call_count, 1)
+        self.assertEqual(self.shows, 1)
+        self.assertEqual(self.strip.buf[1], 11)
+        self.assertFalse(self.strip.locked())
+        self.assertFalse(self.strip._draining)
+
+    # a burst of one-shot commands is applied with one show, and older
+    # values of a coalescing command are dropped
+    async def async_test_coalesce(self):
+        # hold the lock so that the burst is queued
+        await self.strip.acquire(self.pix_cmd)
+        self.ci.setup(["pix", "1", "11"])
+        self.ci.setup(["latest", "5", "1"])
+        self.ci.setup(["latest", "5", "2"])
+        self.ci.setup(["pix", "2", "12"])
+        ret = self.ci.setup(["latest", "5", "3"])
+        self.assertEqual(ret, self.latest_cmd)
+        self.assertEqual(call_count, 0)
+        self.strip.release()
+        await asyncio.sleep(0.1)
+        self.assertEqual(call_count, 3)
+        self.assertEqual(self.shows, 1)
+        self.assertEqual(self.strip.buf[1], 11)
+        self.assertEqual(self.strip.buf[2], 12)
+        self.assertEqual(self.strip.buf[5], 3)
+        self.assertFalse(self.strip.locked())
+
+    def test_coalesce(self):
+        asyncio.run(self.async_test_coalesce())
+
+    # a queued command that fails does not stop the rest of the queue
+    async def async_test_raises(self):
+        await self.strip.acquire(self.pix_cmd)
+        self.ci.setup(["pix", "1", "11"])
+        self.ci.setup(["pix", "999", "1"])
+        self.ci.setup(["pix", "2", "12"])
+        self.strip.release()
+        await asyncio.sleep(0.1)
+        self.assertEqual(call_count, 3)
+        self.assertEqual(self.shows, 1)
+        self.assertEqual(self.strip.buf[1], 11)
+        self.assertEqual(self.strip.buf[2], 12)
+        self.assertFalse(self.strip.locked())
+        self.assertFalse(self.strip._draining)
+
+    def test_raises(self):
+        asyncio.run(self.async_test_raises())
+
+    # when the queue is full, new commands are refused
+    async def async_test_busy(self):
+        # hold the strip with a looping command so the queue does not drain
+        self.ci.setup(["led", 1])
+        await asyncio.sleep(0.1)
+        self.assertTrue(self.strip.locked())
+        for idx in range(self.strip.QUEUE_DEPTH):
+            ret = self.ci.setup(["pix", str(idx), "1"])
+            self.assertEqual(ret, self.pix_cmd)
+        ret = self.ci.setup(["pix", "20", "1"])
+        self.assertIsNone(ret)
+        # a coalescing command with no older copy to replace is refused too
+        ret = self.ci.setup(["latest", "21", "1"])
+        self.assertIsNone(ret)
+        # queued commands are applied once the looping command stops
+        await asyncio.sleep(0.3)
+        self.assertEqual(call_count, 1 + self.strip.QUEUE_DEPTH)
+        self.assertEqual(self.strip.buf[20], 0)
+        self.assertFalse(self.strip.locked())
+
+    def test_busy(self):
+        asyncio.run(self.async_test_busy())
+
+class TestIdle(unittest.TestCase):
+
+    def setUp(self):
+        reset_globals()
+        self.ci = cmdif.CmdInterface()
+        self.strip = ledstrip.LedStrip(0, 16, 100)
+        self.led_cmd = LedCommand(self.strip)
+        self.ci.add_cmd("led", self.led_cmd)
+
+    # strips used by commands are tracked, once each
+    def test_strips(self):
+        self.ci.add_cmd("pix", PixelCommand(self.strip))
+        self.assertEqual(self.ci._strips, [self.strip])
+
+    # interface is idle only when no strip is in use
+    async def async_test_idle(self):
+        self.assertTrue(self.ci.idle())
+        await self.strip.acquire(self.led_cmd)
+        self.assertFalse(self.ci.idle())
+        self.strip.release()
+        self.assertTrue(self.ci.idle())
+
+    def test_idle(self):
+        asyncio.run(self.async_test_idle())
+
+class TestSchema(unittest.TestCase):
+
+    def setUp(self):
+        reset_globals()
+        self.ci = cmdif.CmdInterface()
+        self.sch_cmd = SchemaCommand()
+        self.ci.add_cmd("schema", self.sch_cmd, alias="7")
+
+    # parameters are converted before the command is run
+    async def async_test_convert(self):
+        ret = self.ci.setup(["schema", "12", "ff"])
+        self.assertEqual(ret, self.sch_cmd)
+        await asyncio.sleep(0.1)
+        self.assertEqual(call_parms, ["schema", 12, 255])
+
+    def test_convert(self):
+        asyncio.run(self.async_test_convert())
+
+    # commands that do not match the schema are rejected
+    def test_bad_parms(self):
+        self.assertIsNone(self.ci.setup(["schema", "12"]))
+        self.assertIsNone(self.ci.setup(["schema", "12", "ff", "1"]))
+        self.assertIsNone(self.ci.setup(["schema", "a", "ff"]))
+        self.assertIsNone(self.ci.setup(["schema", "12", "fg"]))
+
+    # config parameters are checked against the config schema
+    def test_config(self):
+        self.assertIsNone(self.ci.setup(["config", "schema", "a"]))
+        self.assertIsNone(self.ci.setup(["config", "nosuch", "1"]))
+        self.assertEqual(call_count, 0)
+        ret = self.ci.setup(["config", "schema", "3", "foo", "bar"])
+        self.assertTrue(ret)
+        self.assertEqual(call_count, 1)
+        self.assertEqual(call_parms, ["config", "schema", 3, "foo", "bar"])
+
+    # alias is the same command as the full name
+    async def async_test_alias(self):
+        ret = self.ci.setup(["7", "1", "2"])
+        self.assertEqual(ret, self.sch_cmd)
+        await asyncio.sleep(0.1)
+        self.assertEqual(call_parms, ["7", 1, 2])
+
+    def test_alias(self):
+        asyncio.run(self.async_test_alias())
+
+class TestMode(unittest.TestCase):
+
+    def setUp(self):
+        self.ci = cmdif.CmdInterface()
+        self.assertTrue(self.ci._echo)
+        self.assertIsNone(console_std.console_outbuf)
+
+    def tearDown(self):
+        # dont leave the console buffered for other tests
+        console_std.console_buffered(False)
+
+    # machine mode turns off echo and buffers output, human mode undoes it
+    async def async_test_mode(self):
+        ret = self.ci.setup(["mode", "machine"])
+        self.assertTrue(ret)
+        await asyncio.sleep(0.1)
+        self.assertFalse(self.ci._echo)
+        # the reply to the mode command is already buffered
+        self.assertEqual(["$OK", "\r\n"], console_std.console_outbuf)
+        console_std.console_flush()
+        # replies are held until flushed
+        console_std.console_writeln("$OK")
+        self.assertEqual(["$OK", "\r\n"], console_std.console_outbuf)
+        console_std.console_flush()
+        self.assertEqual([], console_std.console_outbuf)
+        ret = self.ci.setup(["mode", "human"])
+        self.assertTrue(ret)
+        await asyncio.sleep(0.1)
+        self.assertTrue(self.ci._echo)
+        self.assertIsNone(console_std.console_outbuf)
+
+    def test_mode(self):
+        asyncio.run(self.async_test_mode())
+class TestScene(unittest.TestCase):
+
+    def setUp(self):
+        reset_globals()
+        self.ci = cmdif.CmdInterface()
+        self.strip = ledstrip.LedStrip(0, 16, 100)
+        self.led_cmd = LedCommand(self.strip)
+        self.ci.add_cmd("led", self.led_cmd)
+        self.sch_cmd = SchemaCommand()
+        self.ci.add_cmd("schema", self.sch_cmd)
+        self.ci.add_cmd("checked", CheckedCommand())
+        self.scene = self.ci._cmds["scene"]
+
+    def tearDown(self):
+        try:
+            os.remove(self.scene.filename(99))
+        except OSError:
+            pass
+
+    # parameters are written back the way they were sent
+    def test_format(self):
+        line = format_parms(["schema", 12, 255], "ix", 1)
+        self.assertEqual(line, "schema,12,ff")
+
+    # the last config and the running pattern are saved
+    async def async_test_save(self):
+        self.ci.setup(["config", "schema", "3", "foo"])
+        self.ci.setup(["config", "schema", "4", "bar"])
+        self.ci.setup(["led", "1"])
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.scene.lines(), ["config,schema,4,bar", "led,1"])
+        self.assertTrue(self.ci.setup(["scene", "save", "99"]))
+        with open(self.scene.filename(99)) as scenefile:
+            self.assertEqual(scenefile.read(), "config,schema,4,bar\nled,1\n")
+        self.led_cmd.stop()
+        await asyncio.sleep(0.2)
+
+    def test_save(self):
+        asyncio.run(self.async_test_save())
+
+    # a scene is applied as a whole, or not at all
+    async def async_test_load(self):
+        with open(self.scene.filename(99), "w") as scenefile:
+            scenefile.write("# test scene\nconfig,schema,5,baz\n\nnosuch\n")
+        self.assertIsNone(self.ci.setup(["scene", "99"]))
+        self.assertEqual(call_count, 0)
+        self.assertIsNone(self.ci.setup(["scene", "98"]))
+        with open(self.scene.filename(99), "w") as scenefile:
+            scenefile.write("config,schema,5,baz\nled\n")
+        self.assertTrue(self.ci.setup(["scene", "99"]))
+        await asyncio.sleep(0.1)
+        self.assertTrue(self.led_cmd.is_running)
+        self.assertEqual(call_count, 2)
+        self.assertEqual(self.ci._cmds["config"].saved["schema"],
+                         ["config", "schema", 5, "baz"])
+        self.led_cmd.stop()
+        await asyncio.sleep(0.2)
+
+    def test_load(self):
+        asyncio.run(self.async_test_load())
+
+    # a config value that is rejected stops the configs before it too
+    def test_load_bad_config(self):
+        with open(self.scene.filename(99), "w") as scenefile:
+            scenefile.write("config,schema,5,baz\nconfig,checked,-1\n")
+        self.assertIsNone(self.ci.setup(["scene", "99"]))
+        self.assertEqual(call_count, 0)
+        self.assertFalse(self.ci._cmds["config"].saved)
+        self.assertIsNone(self.ci.setup(["config", "checked", "-1"]))
+        self.assertTrue(self.ci.setup(["config", "checked", "1"]))
+
+    # a one-shot line that the strip can not take makes the reply $ERR
+    async def async_test_load_busy(self):
+        self.ci.add_cmd("pix", PixelCommand(self.strip))
+        await self.strip.acquire(self.led_cmd)
+        for idx in range(self.strip.QUEUE_DEPTH):
+            self.ci.setup(["pix", str(idx), "1"])
+        with open(self.scene.filename(99), "w") as scenefile:
+            scenefile.write("pix,10,1\n")
+        self.assertIsNone(self.ci.setup(["scene", "99"]))
+        self.strip.release()
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.strip.buf[10], 0)
+
+    def test_load_busy(self):
+        asyncio.run(self.async_test_load_busy())
+
+
 if __name__ == "__main__":
     unittest.main()
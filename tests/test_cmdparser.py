@@ -91,6 +91,14 @@ def test_3args(self):
         self.assertEqual("bar", result[1])
         self.assertEqual("baz", result[2])
 
+    # batched commands have a ";" arg between each command
+    def test_batch(self):
+        b = "$foo,1;bar,2,3\n"
+        result = self.cp.parse_cmd(b)
+        self.assertIsInstance(result, list)
+        self.assertEqual(6, len(result))
+        self.assertEqual(["foo", "1", ";", "bar", "2", "3"], result)
+
     # a command line with no actual arguments does not return an empty list
     # it returns a list with one item which is an empty string
     def test_0arg(self):
@@ -190,6 +198,16 @@ def test_ignore_trailing(self):
         result = self.cp.assemble_cmd(b)
         self.assertEqual("$foo,bar\n", result)
 
+    # input after the end of the command is kept for the next call
+    def test_rest(self):
+        b = "$foo,bar\n$baz,qux\n"
+        result = self.cp.assemble_cmd(b)
+        self.assertEqual("$foo,bar\n", result)
+        self.assertEqual("$baz,qux\n", self.cp.rest)
+        result = self.cp.assemble_cmd(self.cp.rest)
+        self.assertEqual("$baz,qux\n", result)
+        self.assertIsNone(self.cp.rest)
+
     def test_ignore_leading(self):
         b = "qwerty$foo,bar\n"
         result = self.cp.assemble_cmd(b)
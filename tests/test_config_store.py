@@ -0,0 +1,129 @@
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+
+# This test is meant to be run under micropython and checks the binary
+# config store.
+
+import asyncio
+import os
+import unittest
+
+from ledstrip import cmdif
+from cmdtemplate import CommandTemplate
+import config_store
+
+TESTFILE = "test_config.bin"
+
+# command that keeps its last config
+class ConfigCommand(CommandTemplate):
+    cfgschema = "isx"
+
+    def __init__(self):
+        super().__init__()
+        self.cfg = None
+
+    def config(self, cfglist):
+        if cfglist[2] < 0:
+            raise ValueError(cfglist[2])
+        self.cfg = cfglist[2:]
+
+class TestConfigStore(unittest.TestCase):
+
+    def setUp(self):
+        self.ci = cmdif.CmdInterface()
+        self.cmd = ConfigCommand()
+        self.ci.add_cmd("cfg", self.cmd)
+        self.store = config_store.ConfigStore(self.ci, TESTFILE, 100)
+
+    def tearDown(self):
+        try:
+            os.remove(TESTFILE)
+        except OSError:
+            pass
+
+    # configs survive encoding, and a damaged file is rejected
+    def test_encode(self):
+        configs = [["config", "cfg", -5, "abc", 0xFF00FF],
+                   ["config", "other"]]
+        data = config_store.encode(configs)
+        self.assertEqual(data[:4], b"LSCF")
+        self.assertEqual(config_store.decode(data), configs)
+        bad = bytearray(data)
+        bad[-1] ^= 1
+        self.assertIsNone(config_store.decode(bad))
+        bad = bytearray(data)
+        bad[4] = 2
+        self.assertIsNone(config_store.decode(bad))
+        self.assertIsNone(config_store.decode(data[:8]))
+
+    # configs that do not fit in a record are left out of the file
+    def test_encode_range(self):
+        configs = [["config", "big", 1 << 40],
+                   ["config", "cfg", -0x80000000, "abc", 0x7FFFFFFF],
+                   ["config", "long", "x" * 256]]
+        data = config_store.encode(configs)
+        self.assertEqual(config_store.decode(data), configs[1:2])
+
+    # a saved config is restored into a new command interface
+    def test_save_load(self):
+        self.ci.setup(["config", "cfg", "3", "foo", "ff"])
+        self.assertTrue(self.store.save())
+        # nothing changed, so the file is not written again
+        self.assertFalse(self.store.save())
+        self.assertEqual(self.store.writes, 1)
+
+        ci = cmdif.CmdInterface()
+        cmd = ConfigCommand()
+        ci.add_cmd("cfg", cmd)
+        store = config_store.ConfigStore(ci, TESTFILE)
+        self.assertEqual(store.load(), 1)
+        self.assertEqual(cmd.cfg, [3, "foo", 255])
+        # restoring does not make the file different
+        self.assertFalse(store.save())
+
+    def test_no_file(self):
+        self.assertEqual(self.store.load(), 0)
+
+    # a burst of changes is written once, after the delay
+    async def async_test_batched(self):
+        task = asyncio.create_task(self.store.run())
+        for val in range(5):
+            self.ci.setup(["config", "cfg", str(val), "foo", "1"])
+            await asyncio.sleep_ms(20)
+        self.assertEqual(self.store.writes, 0)
+        await asyncio.sleep_ms(200)
+        self.assertEqual(self.store.writes, 1)
+        task.cancel()
+
+    def test_batched(self):
+        asyncio.run(self.async_test_batched())
+
+    # a failed write does not stop later changes from being saved
+    async def async_test_write_fails(self):
+        self.store._filename = "nosuchdir/" + TESTFILE
+        task = asyncio.create_task(self.store.run())
+        self.ci.setup(["config", "cfg", "1", "foo", "1"])
+        await asyncio.sleep_ms(200)
+        self.assertEqual(self.store.writes, 0)
+        self.store._filename = TESTFILE
+        self.ci.setup(["config", "cfg", "2", "foo", "1"])
+        await asyncio.sleep_ms(200)
+        self.assertEqual(self.store.writes, 1)
+        task.cancel()
+
+    def test_write_fails(self):
+        asyncio.run(self.async_test_write_fails())
+
+if __name__ == "__main__":
+    unittest.main()
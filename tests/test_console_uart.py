@@ -0,0 +1,84 @@
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+# This test is meant to be run under micropython and exercises the
+# console_uart module, using the loopback UART from uart_test.py in place of
+# the hardware UART.
+
+import unittest
+
+import console_uart
+from cmdparser import CmdParser
+
+class TestConsoleUart(unittest.TestCase):
+
+    def setUp(self):
+        console_uart.console_init()
+        self.uart = console_uart.console_uart
+        self.assertEqual(self.uart.any(), 0)
+
+    def tearDown(self):
+        console_uart.console_buffered(False)
+
+    # nothing to read returns None
+    def test_read_empty(self):
+        self.assertIsNone(console_uart.console_read())
+
+    # everything waiting is returned in one read
+    def test_write_read(self):
+        console_uart.console_write("$foo,")
+        console_uart.console_write("bar\n")
+        self.assertEqual(console_uart.console_read(), "$foo,bar\n")
+        self.assertIsNone(console_uart.console_read())
+
+    # writeln adds line ending using a single write
+    def test_writeln(self):
+        console_uart.console_writeln("$OK")
+        self.assertEqual(self.uart.writes, 1)
+        self.assertEqual(console_uart.console_read(), "$OK\r\n")
+
+    # buffered output is held until flushed, then sent in a single write
+    def test_buffered(self):
+        console_uart.console_buffered(True)
+        console_uart.console_writeln("one")
+        console_uart.console_writeln("two")
+        self.assertEqual(self.uart.writes, 0)
+        self.assertIsNone(console_uart.console_read())
+        console_uart.console_flush()
+        self.assertEqual(self.uart.writes, 1)
+        self.assertEqual(console_uart.console_read(), "one\r\ntwo\r\n")
+
+    # a bulk read holding two commands produces both commands from the parser
+    def test_two_commands(self):
+        console_uart.console_write("$foo,1\n$bar,2\n")
+        cp = CmdParser()
+        incoming = console_uart.console_read()
+        cmds = []
+        while incoming:
+            cmdargs = cp.process_input(incoming)
+            if cmdargs:
+                cmds.append(cmdargs)
+            incoming = cp.rest
+        self.assertEqual(cmds, [["foo", "1"], ["bar", "2"]])
+
+    # bytes that are not valid text are dropped instead of raising
+    def test_bad_bytes(self):
+        self.uart.write(b"$foo\xff\xfe,1\n")
+        self.assertEqual(console_uart.console_read(), "$foo,1\n")
+        self.uart.write(b"\x80\xc3")
+        self.assertIsNone(console_uart.console_read())
+        self.assertEqual(self.uart.any(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
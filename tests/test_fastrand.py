@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+# This test is meant to be run under micropython and checks the fastrand
+# generator against known values, and that the random patterns repeat
+# when seeded.
+
+import asyncio
+import unittest
+
+import fastrand
+from ledstrip import ledstrip
+from ledrandom import LedRandom, LedRandomOG
+
+class TestFastRand(unittest.TestCase):
+
+    # known sequence for seed 1, same for the viper and python versions
+    def test_golden(self):
+        fastrand.seed(1)
+        values = [fastrand.rand() for _ in range(5)]
+        self.assertEqual(values, [67592, 16908672, 661858865, 76899923,
+                                  599672308])
+
+    # seed 0 selects the default seed
+    def test_seed_zero(self):
+        fastrand.seed(0)
+        first = fastrand.rand()
+        fastrand.seed(fastrand.DEFAULT_SEED)
+        self.assertEqual(fastrand.rand(), first)
+
+    def test_randbelow(self):
+        fastrand.seed(1234)
+        values = [fastrand.randbelow(10) for _ in range(200)]
+        self.assertEqual(min(values), 0)
+        self.assertEqual(max(values), 9)
+
+    def test_weighted_table(self):
+        self.assertEqual(list(fastrand.weighted_table([3, 1], 8)),
+                         [0, 0, 0, 0, 0, 0, 1, 1])
+        table = fastrand.weighted_table([1, 0, 2], 6)
+        self.assertEqual(list(table), [0, 0, 2, 2, 2, 2])
+
+class TestSeededPattern(unittest.TestCase):
+
+    # run a few frames of a pattern and return the frames
+    def frames(self, cmdclass, cfglist):
+        strip = ledstrip.LedStrip(0, 16, 40)
+        cmdobj = cmdclass(strip)
+        cmdobj.config(cfglist)
+        shown = []
+        def show():
+            shown.append(list(strip.buf))
+            if len(shown) == 5:
+                cmdobj.stop()
+        strip.show = show
+        asyncio.run(cmdobj.run([]))
+        return shown[:5]
+
+    def test_random(self):
+        cfg = ["config", "random", 77, 127, 5, 1, 42]
+        first = self.frames(LedRandom, cfg)
+        self.assertEqual(first, self.frames(LedRandom, cfg))
+        self.assertTrue(any(any(frame) for frame in first))
+
+    def test_randomog(self):
+        cfg = ["config", "randomog", 42]
+        first = self.frames(LedRandomOG, cfg)
+        self.assertEqual(first, self.frames(LedRandomOG, cfg))
+        self.assertTrue(any(any(frame) for frame in first))
+
+if __name__ == "__main__":
+    unittest.main()
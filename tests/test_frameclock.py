@@ -0,0 +1,106 @@
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+# This test is meant to be run under micropython and checks the frame timing
+# of FrameClock. The timing checks allow some slack for host scheduling.
+
+import asyncio
+import time
+import unittest
+
+from frameclock import FrameClock, TimerClock
+
+class TestFrameClock(unittest.TestCase):
+
+    # frames on time wait out the period and do not drift when the work
+    # done in each frame takes part of the period
+    def test_on_time(self):
+        async def frames(clock, count):
+            results = []
+            for _ in range(count):
+                time.sleep_ms(10)   # simulated drawing time
+                results.append(await clock.wait())
+            return results
+        clock = FrameClock()
+        start = time.ticks_ms()
+        clock.start(40)
+        results = asyncio.run(frames(clock, 5))
+        elapsed = time.ticks_diff(time.ticks_ms(), start)
+        self.assertEqual(results, [1, 1, 1, 1, 1])
+        self.assertEqual(clock.overruns, 0)
+        self.assertTrue(195 <= elapsed < 240, elapsed)
+
+    # a late frame is counted as an overrun and reports the missed frames
+    def test_overrun(self):
+        async def late(clock):
+            time.sleep_ms(110)  # misses the first two deadlines
+            missed = await clock.wait()
+            ontime = await clock.wait()
+            return missed, ontime
+        clock = FrameClock()
+        clock.start(50)
+        missed, ontime = asyncio.run(late(clock))
+        self.assertEqual(missed, 2)
+        self.assertEqual(ontime, 1)
+        self.assertEqual(clock.overruns, 1)
+        self.assertEqual(clock.skipped, 1)
+
+    # zero period just yields
+    def test_zero_period(self):
+        clock = FrameClock()
+        clock.start(0)
+        self.assertEqual(asyncio.run(clock.wait()), 1)
+        self.assertEqual(clock.overruns, 0)
+
+class TestTimerClock(unittest.TestCase):
+
+    # the timer is started with the frame period and wait() returns on a tick
+    def test_tick(self):
+        async def scenario(clock):
+            waiter = asyncio.create_task(clock.wait())
+            await asyncio.sleep_ms(5)
+            self.assertFalse(waiter.done())
+            clock._timer.fire()
+            return await waiter
+        clock = TimerClock()
+        clock.start(20)
+        self.assertEqual(clock._timer.period, 20)
+        self.assertEqual(asyncio.run(scenario(clock)), 1)
+        self.assertEqual(clock.overruns, 0)
+
+    # ticks that happen while a frame is drawn are counted as missed frames
+    def test_overrun(self):
+        async def scenario(clock):
+            clock._timer.fire(3)
+            missed = await clock.wait()
+            clock._timer.fire()
+            ontime = await clock.wait()
+            return missed, ontime
+        clock = TimerClock()
+        clock.start(20)
+        missed, ontime = asyncio.run(scenario(clock))
+        self.assertEqual(missed, 3)
+        self.assertEqual(ontime, 1)
+        self.assertEqual(clock.overruns, 1)
+        self.assertEqual(clock.skipped, 2)
+
+    # stopping the clock stops the timer
+    def test_stop(self):
+        clock = TimerClock()
+        clock.start(20)
+        clock.stop()
+        self.assertIsNone(clock._timer.callback)
+        self.assertEqual(asyncio.run(clock.wait()), 1)
+
+if __name__ == "__main__":
+    unittest.main()
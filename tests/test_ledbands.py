@@ -0,0 +1,59 @@
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+
+# This test is meant to be run under micropython and checks the bands
+# pattern.
+
+import unittest
+
+import ledbands
+from ledstrip import ledstrip
+
+class TestLedBands(unittest.TestCase):
+
+    def setUp(self):
+        self.strip = ledstrip.LedStrip(2, 16, 8)
+        self.bands = ledbands.LedBands(self.strip)
+        # a band of 2 red and a band of 3 blue, half a pixel per frame
+        self.bands.config(["config", "bands", 128, 20,
+                           255, 0, 0, 2, 0, 0, 255, 3])
+        self.bands.start()
+
+    def test_draw(self):
+        red = 0x00FF00
+        blu = 0x0000FF
+        self.bands.draw(1)
+        self.assertEqual(list(self.strip.buf),
+                         [red, red, blu, blu, blu, red, red, blu])
+        # two frames move one pixel
+        self.bands.draw(1)
+        self.assertEqual(list(self.strip.buf),
+                         [blu, red, red, blu, blu, blu, red, red])
+
+    # the bands move back for a negative speed, and wrap around
+    def test_reverse(self):
+        self.bands.config(["config", "bands", -256, 20,
+                           255, 0, 0, 2, 0, 0, 255, 3])
+        self.bands.draw(1)
+        self.assertEqual(self.strip.buf[0], 0x00FF00)
+        self.assertEqual(self.strip.buf[1], 0x0000FF)
+
+    def test_bad_config(self):
+        with self.assertRaises(ValueError):
+            self.bands.config(["config", "bands", 256, 20, 255, 0, 0])
+        with self.assertRaises(ValueError):
+            self.bands.config(["config", "bands", 256, 20])
+
+if __name__ == "__main__":
+    unittest.main()
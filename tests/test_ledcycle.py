@@ -0,0 +1,67 @@
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+
+# This test is meant to be run under micropython and runs the LedCycle
+# command, using the fake ws2812 driver.
+
+import asyncio
+import unittest
+
+from ledstrip import ledstrip
+from ledcycle import LedCycle
+
+class TestLedCycle(unittest.TestCase):
+
+    def setUp(self):
+        self.strip = ledstrip.LedStrip(0, 16, 4)
+        self.cycle = LedCycle(self.strip)
+        self.shown = []
+        def show():
+            self.shown.append(list(self.strip.buf))
+        self.strip.show = show
+
+    def run_cycle(self, numshown):
+        async def cycle_some():
+            task = asyncio.create_task(self.cycle.run([]))
+            while len(self.shown) < numshown:
+                await asyncio.sleep_ms(1)
+            self.cycle.stop()
+            await task
+        asyncio.run(cycle_some())
+
+    # palette goes from the first color to the second and back
+    def test_palette(self):
+        self.cycle.config(["config", "cycle", 255, 0, 0, 0, 0, 255, 1, 64, 50])
+        self.run_cycle(1)
+        palette = self.strip.palette
+        self.assertEqual(palette[0], 0x00FF00)
+        self.assertEqual(palette[255], 0x00FF00)
+        self.assertEqual(palette[127], palette[128])
+        self.assertEqual(palette[127] & 0xFF, 253)
+
+    # a quarter turn of the palette each frame moves the colors one pixel
+    # along a 4 pixel strip
+    def test_rotate(self):
+        self.cycle.config(["config", "cycle", 255, 0, 0, 0, 0, 255, 1, 64, 50])
+        self.run_cycle(2)
+        first = self.shown[0]
+        self.assertEqual(first, [self.strip.palette[idx]
+                                 for idx in (0, 64, 128, 192)])
+        self.assertEqual(self.shown[1], first[1:] + first[:1])
+        # strip is cleared when done
+        self.assertEqual(self.shown[-1], [0, 0, 0, 0])
+        self.assertFalse(self.strip.locked())
+
+if __name__ == "__main__":
+    unittest.main()
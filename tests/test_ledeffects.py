@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+# This test is meant to be run under micropython and checks the lookup
+# tables and kernels used by the effect patterns in ledeffects.
+
+import array
+import unittest
+
+import ledeffects
+import ledkernels
+
+class TestTables(unittest.TestCase):
+
+    def test_sine(self):
+        sine = ledeffects.SINE
+        self.assertEqual(len(sine), 256)
+        self.assertEqual(sine[0], 128)
+        self.assertEqual(sine[64], 255)
+        self.assertEqual(sine[192], 1)
+
+    # primary and secondary colors, packed in GRB order
+    def test_hsv(self):
+        self.assertEqual(ledeffects.hsv(0, 255), 0x00FF00)
+        self.assertEqual(ledeffects.hsv(85, 255), 0xFF0000)
+        self.assertEqual(ledeffects.hsv(171, 255), 0x0001FF)
+        self.assertEqual(ledeffects.hsv(85, 64), 0x400000)
+        self.assertEqual(len(ledeffects.hue_wheel(64)), 256)
+
+    def test_fire_palette(self):
+        palette = ledeffects.fire_palette()
+        self.assertEqual(palette[0], 0)
+        self.assertEqual(palette[255], 0xFFFFF8)
+
+class TestKernels(unittest.TestCase):
+
+    def test_fill(self):
+        buf = array.array("I", bytes(4 * 5))
+        ledkernels.fill(buf, 0x123456, 1, 3)
+        self.assertEqual(list(buf), [0, 0x123456, 0x123456, 0x123456, 0])
+
+    # ramp steps through the palette in 1/256 entry units
+    def test_ramp(self):
+        buf = array.array("I", bytes(4 * 4))
+        palette = array.array("I", range(256))
+        ledkernels.ramp(buf, palette, 255 << 8, 128)
+        self.assertEqual(list(buf), [255, 255, 0, 0])
+
+    # fire heat stays in range and the random state moves on
+    def test_fire(self):
+        heat = bytearray(20)
+        state = array.array("I", [1])
+        for _ in range(50):
+            ledkernels.fire(heat, state, 10, 200)
+        self.assertNotEqual(state[0], 1)
+        self.assertTrue(any(heat))
+
+if __name__ == "__main__":
+    unittest.main()
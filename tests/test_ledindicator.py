@@ -0,0 +1,64 @@
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+
+# This test is meant to be run under micropython and checks the indicator
+# command.
+
+import unittest
+
+import ledindicator
+from ledstrip import ledstrip
+
+class TestLedIndicator(unittest.TestCase):
+
+    def setUp(self):
+        self.strip = ledstrip.LedStrip(2, 16, 4)
+        self.shown = []
+        self.strip.pio_show = lambda buf: self.shown.append(list(buf))
+        self.ind = ledindicator.LedIndicator(self.strip)
+        self.ind.config(["config", "ind", 1, 3, 0xFF0000, 0x0000FF])
+
+    # only known slots and states are accepted
+    def test_validate(self):
+        self.assertTrue(self.ind.validate(["ind", "1", "2"]))
+        self.assertTrue(self.ind.validate(["ind", "1", "0"]))
+        self.assertFalse(self.ind.validate(["ind", "1", "3"]))
+        self.assertFalse(self.ind.validate(["ind", "0", "1"]))
+        self.assertFalse(self.ind.validate(["ind", "8", "0"]))
+
+    # states pick a color in the packed order, and a free strip is shown
+    def test_update(self):
+        self.assertTrue(self.ind.update(["ind", 1, 1]))
+        self.assertEqual(self.shown[-1], [0, 0, 0, 0x00FF00])
+        self.ind.update(["ind", 1, 0])
+        self.assertEqual(self.shown[-1], [0, 0, 0, 0])
+
+    # a busy strip is not shown, the pattern shows the indicator
+    def test_busy(self):
+        self.strip._queue.append((None, None))
+        self.ind.update(["ind", 1, 2])
+        self.assertEqual(self.shown, [])
+        self.strip.show()
+        self.assertEqual(self.shown[-1], [0, 0, 0, 0x0000FF])
+
+    def test_bad_config(self):
+        with self.assertRaises(ValueError):
+            self.ind.config(["config", "ind", 8, 0, 0xFF0000])
+        with self.assertRaises(ValueError):
+            self.ind.config(["config", "ind", 0, 4, 0xFF0000])
+        with self.assertRaises(ValueError):
+            self.ind.config(["config", "ind", 0, 0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+# This test is meant to be run under micropython and exercises the LedMeter
+# command using the fake ws2812 driver.
+
+import asyncio
+import unittest
+
+from ledstrip import ledstrip
+from ledmeter import LedMeter
+
+class TestLedMeter(unittest.TestCase):
+
+    def setUp(self):
+        self.strip = ledstrip.LedStrip(0, 16, 20)
+        self.meter = LedMeter(self.strip)
+        # 10 pixels from 2 to 11, red going to 0, green going to 90
+        self.meter.config(["config", "meter", 2, 11, 100, 0, 0, 90, 0, 0])
+        self.buf = self.strip.buf
+
+    def update(self, pct):
+        # same as the LedStrip fast path
+        self.strip.writes += 1
+        self.meter.apply(["meter", pct])
+        self.strip.show()
+
+    def expected(self, lit):
+        exp = [0] * 20
+        for idx in range(lit):
+            exp[2 + idx] = ((idx * 9) << 16) + ((100 - (idx * 10)) << 8)
+        return exp
+
+    # gradient colors are precomputed
+    def test_lut(self):
+        self.assertEqual(list(self.meter._lut), self.expected(10)[2:12])
+
+    # meter going up and down
+    def test_levels(self):
+        for pct in (50, 60, 100, 30, 0, 10):
+            self.update(pct)
+            self.assertEqual(list(self.buf), self.expected(pct // 10))
+
+    # only the changed pixels are written
+    def test_incremental(self):
+        self.update(50)
+        # change a lit pixel outside the changed range, it is left alone
+        self.buf[2] = 1
+        self.update(70)
+        self.assertEqual(self.buf[2], 1)
+        self.assertEqual(list(self.buf[3:]), self.expected(7)[3:])
+
+    # a show by someone else causes a full repaint
+    def test_repaint(self):
+        self.update(50)
+        self.strip.clear()
+        self.update(50)
+        self.assertEqual(list(self.buf), self.expected(5))
+
+    # another command applied before the same show causes a full repaint
+    def test_repaint_same_show(self):
+        self.update(50)
+        # another one-shot command in the same queue drain clears a pixel
+        self.strip.writes += 1
+        self.buf[3] = 0
+        self.update(50)
+        self.assertEqual(list(self.buf), self.expected(5))
+
+    # values over 100 stay within the meter
+    def test_clamp(self):
+        self.update(150)
+        self.assertEqual(list(self.buf), self.expected(10))
+
+class TestAnimatedMeter(unittest.TestCase):
+
+    def setUp(self):
+        self.strip = ledstrip.LedStrip(0, 16, 20)
+        self.meter = LedMeter(self.strip)
+        self.buf = self.strip.buf
+
+    def lit(self):
+        return len([pix for pix in self.buf if pix])
+
+    # without the animation settings the meter is a one-shot
+    def test_oneshot(self):
+        self.meter.config(["config", "meter", 0, 9, 100, 0, 0, 90, 0, 0])
+        self.assertTrue(self.meter.oneshot)
+        self.meter.config(["config", "meter", 0, 9, 100, 0, 0, 90, 0, 0, 64])
+        self.assertFalse(self.meter.oneshot)
+
+    # meter eases up to the target and then stops running
+    def test_ease(self):
+        self.meter.config(["config", "meter", 0, 9, 100, 0, 0, 90, 0, 0,
+                           128, 128, 0, 1])
+        async def run_meter():
+            task = asyncio.create_task(self.meter.run(["meter", 100]))
+            await asyncio.sleep_ms(0)
+            self.assertTrue(self.meter._running)
+            # partway up after the first frame
+            self.assertTrue(0 < self.lit() < 10)
+            await task
+        asyncio.run(run_meter())
+        self.assertFalse(self.meter._running)
+        self.assertFalse(self.strip.locked())
+        self.assertEqual(self.lit(), 10)
+
+    # a running meter takes a new target through update()
+    def test_update(self):
+        self.meter.config(["config", "meter", 0, 9, 100, 0, 0, 90, 0, 0,
+                           32, 256, 0, 1])
+        self.assertFalse(self.meter.update(["meter", 50]))
+        async def run_meter():
+            task = asyncio.create_task(self.meter.run(["meter", 100]))
+            await asyncio.sleep_ms(0)
+            self.assertTrue(self.meter.update(["meter", 20]))
+            await task
+        asyncio.run(run_meter())
+        self.assertEqual(self.lit(), 2)
+
+    # peak pixel is held, then falls back to the level
+    def test_peak(self):
+        self.meter.config(["config", "meter", 0, 9, 100, 0, 0, 90, 0, 0,
+                           256, 256, 3, 1])
+        # start from a meter at 8 pixels with the peak held there
+        self.meter.paint(8)
+        self.meter._peak = 8
+        self.meter._peaktime = 3
+        async def run_meter():
+            task = asyncio.create_task(self.meter.run(["meter", 0]))
+            await asyncio.sleep_ms(0)
+            # level is down but the peak pixel is still lit
+            self.assertEqual(self.lit(), 1)
+            self.assertNotEqual(self.buf[7], 0)
+            await task
+        asyncio.run(run_meter())
+        self.assertEqual(self.lit(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+
+# This test is meant to be run under micropython and checks the particle
+# engine and the particles pattern.
+
+import array
+import unittest
+
+import fastrand
+import ledparticles
+from ledstrip import ledstrip
+
+class TestParticles(unittest.TestCase):
+
+    def setUp(self):
+        self.parts = ledparticles.Particles(4)
+
+    # spawn fails once every slot is used, and a freed slot is used again
+    def test_spawn(self):
+        for idx in range(4):
+            self.assertTrue(self.parts.spawn(idx << 8, 0, 1, 10))
+        self.assertFalse(self.parts.spawn(0, 0, 1, 10))
+        self.assertEqual(self.parts.alive(), 4)
+        self.parts.life[2] = 0
+        self.assertTrue(self.parts.spawn(0, 0, 7, 10))
+        self.assertEqual(self.parts.color[2], 7)
+
+    # particles move by velocity times frames and die when life runs out
+    def test_step(self):
+        self.parts.spawn(0, 128, 1, 3)
+        self.parts.spawn(512, -256, 2, 10)
+        self.parts.step(2)
+        self.assertEqual(list(self.parts.pos[:2]), [256, 0])
+        self.assertEqual(list(self.parts.life[:2]), [1, 8])
+        self.parts.step()
+        self.assertEqual(self.parts.alive(), 1)
+
+    # render draws into part of a buffer, and frees particles outside of it
+    def test_render(self):
+        buf = array.array("I", bytes(4 * 6))
+        self.parts.spawn(0, 0, 0x11, 10)
+        self.parts.spawn(3 << 8, 0, 0x22, 10)
+        self.parts.spawn(-1, 0, 0x33, 10)
+        self.parts.render(buf, 2, 3)
+        self.assertEqual(list(buf), [0, 0, 0x11, 0, 0, 0])
+        self.assertEqual(self.parts.alive(), 1)
+
+class TestLedParticles(unittest.TestCase):
+
+    def setUp(self):
+        self.strip = ledstrip.LedStrip(2, 16, 10)
+        self.pattern = ledparticles.LedParticles(self.strip, 8)
+
+    # comets start at pixel 0 and move up the strip
+    def test_comet(self):
+        self.pattern.config(["config", "particles", "comet", 0, 256, 256,
+                             0, 128, 20])
+        self.pattern.start()
+        self.pattern.draw(1)
+        self.pattern.draw(1)
+        self.assertEqual(list(self.strip.buf[:3]), [0x00FF00, 0x00FF00, 0])
+        self.assertEqual(self.pattern.particles.alive(), 2)
+
+    # with a fade, the last frame is faded instead of cleared
+    def test_fade(self):
+        self.pattern.config(["config", "particles", "comet", 0, 0, 256,
+                             0, 128, 20])
+        self.pattern.start()
+        # particles move before they are drawn, so this is first drawn at 1
+        self.pattern.particles.spawn(0, 256, 0x00FF00, 10)
+        self.pattern.draw(1)
+        self.pattern.draw(1)
+        self.assertEqual(list(self.strip.buf[:3]), [0, 0x007F00, 0x00FF00])
+        self.pattern.config(["config", "particles", "comet", 0, 0, 256,
+                             0, 0, 20])
+        self.pattern.draw(1)
+        self.assertEqual(list(self.strip.buf[:4]), [0, 0, 0, 0x00FF00])
+
+    # sparkles do not move and die after their life
+    def test_sparkle(self):
+        fastrand.seed(1)
+        self.pattern.config(["config", "particles", "sparkle", 300, 256, 0,
+                             2, 0, 20])
+        self.pattern.start()
+        self.pattern.draw(1)
+        self.assertEqual(sum(1 for pix in self.strip.buf if pix), 1)
+        for _ in range(5):
+            self.pattern.draw(1)
+        self.assertEqual(self.pattern.particles.alive(), 2)
+
+    def test_bad_kind(self):
+        with self.assertRaises(ValueError):
+            self.pattern.config(["config", "particles", "bogus", 0, 0, 0,
+                                 0, 0, 20])
+
+if __name__ == "__main__":
+    unittest.main()
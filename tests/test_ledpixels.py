@@ -0,0 +1,67 @@
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+
+# This test is meant to be run under micropython and checks the px command.
+
+import unittest
+
+import ledpixels
+from ledstrip import ledstrip
+
+class TestLedPixels(unittest.TestCase):
+
+    def setUp(self):
+        self.strip = ledstrip.LedStrip(2, 16, 20)
+        self.px = ledpixels.LedPixels(self.strip)
+
+    # good fields are set, and RRGGBB is packed like the other patterns
+    def test_apply(self):
+        parms = ["px", "1:ff0000", "13:00FF00", "a:000010"]
+        self.assertTrue(self.px.validate(parms))
+        self.px.apply(parms)
+        buf = self.strip.buf
+        self.assertEqual(buf[1], 0x00FF00)
+        self.assertEqual(buf[0x13], 0xFF0000)
+        self.assertEqual(buf[10], 0x000010)
+
+    def test_no_fields(self):
+        self.assertFalse(self.px.validate(["px"]))
+
+    def test_empty_index(self):
+        self.assertFalse(self.px.validate(["px", ":ff0000"]))
+        self.assertFalse(self.px.validate(["px", "-:ff0000"]))
+
+    def test_bad_hex(self):
+        self.assertFalse(self.px.validate(["px", "3:zz0000"]))
+        self.assertFalse(self.px.validate(["px", "g:ff0000"]))
+
+    def test_no_colon(self):
+        self.assertFalse(self.px.validate(["px", "5ff0000"]))
+        self.assertFalse(self.px.validate(["px", "1:2:ff0000"]))
+        self.assertFalse(self.px.validate(["px", "1:ff0000:"]))
+
+    def test_short_color(self):
+        self.assertFalse(self.px.validate(["px", "1:ff"]))
+        self.assertFalse(self.px.validate(["px", "1:ff00000"]))
+
+    def test_past_end(self):
+        self.assertTrue(self.px.validate(["px", "13:ff0000"]))
+        self.assertFalse(self.px.validate(["px", "14:ff0000"]))
+
+    # one bad field rejects the whole command
+    def test_mixed(self):
+        self.assertFalse(self.px.validate(["px", "1:ff0000", "3:zz0000"]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+# This test is meant to be run under micropython and plays a small animation
+# file with the LedPlay command, using the fake ws2812 driver.
+
+import asyncio
+import os
+import struct
+import unittest
+
+from ledstrip import ledstrip
+from ledplay import LedPlay
+
+ANIMFILE = "test_ledplay.lsa"
+
+def write_anim(frames, numpixels=4, version=1):
+    # frames is a list of (type, data) with data already packed
+    with open(ANIMFILE, "wb") as animfile:
+        animfile.write(struct.pack("<4sBBHHHI", b"LSAN", version, 0,
+                                   numpixels, 1, len(frames), 0))
+        for frametype, count, data in frames:
+            animfile.write(struct.pack("<BH", frametype, count))
+            animfile.write(data)
+
+class TestLedPlay(unittest.TestCase):
+
+    def setUp(self):
+        self.strip = ledstrip.LedStrip(0, 16, 3)
+        self.play = LedPlay(self.strip)
+        self.shown = []
+        def show():
+            self.shown.append(list(self.strip.buf))
+        self.strip.show = show
+
+    def tearDown(self):
+        try:
+            os.remove(ANIMFILE)
+        except OSError:
+            pass
+
+    def run_play(self, parmlist):
+        self.assertTrue(self.play.validate(parmlist))
+        asyncio.run(self.play.run(parmlist))
+
+    # key frame then delta frame, the extra pixel in the file is ignored
+    def test_play(self):
+        write_anim([(0, 4, bytes([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12])),
+                    (1, 2, bytes([1, 0, 0x10, 0x20, 0x30,
+                                  3, 0, 1, 1, 1]))])
+        self.run_play(["play", ANIMFILE])
+        self.assertEqual(self.shown[0], [0x020103, 0x050406, 0x080709])
+        self.assertEqual(self.shown[1], [0x020103, 0x201030, 0x080709])
+        # strip is cleared when done
+        self.assertEqual(self.shown[2], [0, 0, 0])
+        self.assertFalse(self.strip.locked())
+
+    # looping plays until stopped
+    def test_loop(self):
+        write_anim([(0, 3, bytes([0, 1, 0] * 3))], numpixels=3)
+        parmlist = ["play", ANIMFILE, "1"]
+        self.assertTrue(self.play.validate(parmlist))
+        async def play_some():
+            task = asyncio.create_task(self.play.run(parmlist))
+            while len(self.shown) < 3:
+                await asyncio.sleep_ms(1)
+            self.play.stop()
+            await task
+        asyncio.run(play_some())
+        self.assertEqual(self.shown[2], [0x010000] * 3)
+
+    # missing or bad files are rejected
+    def test_bad_file(self):
+        self.assertFalse(self.play.validate(["play", "nosuchfile.lsa"]))
+        write_anim([], version=2)
+        self.assertFalse(self.play.validate(["play", ANIMFILE]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+
+# This test is meant to be run under micropython and checks the range command.
+
+import unittest
+
+import ledrange
+from ledstrip import ledstrip
+
+class TestLedRange(unittest.TestCase):
+
+    def setUp(self):
+        self.strip = ledstrip.LedStrip(2, 16, 20)
+        self.range = ledrange.LedRange(self.strip)
+
+    # pixels are packed like the other patterns
+    def test_apply(self):
+        parms = ["range", "18", "2", "1", "2", "3"]
+        self.assertTrue(self.range.validate(parms))
+        self.range.apply(parms)
+        buf = self.strip.buf
+        self.assertEqual(list(buf[17:20]), [0, 0x020103, 0x020103])
+
+    def test_bad_type(self):
+        self.assertFalse(self.range.validate(["range", "x", "2", "1", "2", "3"]))
+        self.assertFalse(self.range.validate(["range", "1", "2", "1", "2"]))
+
+    def test_negative(self):
+        self.assertFalse(self.range.validate(["range", "-1", "2", "1", "2", "3"]))
+        self.assertFalse(self.range.validate(["range", "1", "-2", "1", "2", "3"]))
+
+    def test_past_end(self):
+        self.assertTrue(self.range.validate(["range", "0", "20", "1", "2", "3"]))
+        self.assertFalse(self.range.validate(["range", "19", "2", "1", "2", "3"]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+
+
+# This test is meant to be run under micropython and checks the rpm pattern.
+
+import unittest
+
+import ledrpm
+from ledstrip import ledstrip
+
+class TestLedRpm(unittest.TestCase):
+
+    def setUp(self):
+        self.strip = ledstrip.LedStrip(2, 16, 10)
+        self.rpm = ledrpm.LedRpm(self.strip)
+        # hue 0 at 0 rpm to hue 85 at 1000 rpm, 1 pixel per frame at the top
+        self.rpm.config(["config", "rpm", 1000, 256, 0, 85, 2, 3, 20])
+
+    # update only takes the value while the pattern is running
+    def test_update(self):
+        self.assertFalse(self.rpm.update(["rpm", 500]))
+        self.rpm._running = True
+        self.assertTrue(self.rpm.update(["rpm", 5000]))
+        self.assertEqual(self.rpm._target, 1000)
+
+    # dashes of 2 with gaps of 3, in the hue for the rpm
+    def test_draw(self):
+        self.rpm._settarget(0)
+        self.rpm.start()
+        self.rpm.draw(1)
+        red = ledrpm.hue_wheel(255)[0]
+        self.assertEqual(list(self.strip.buf),
+                         [red, red, 0, 0, 0, red, red, 0, 0, 0])
+
+    # the dashes move with the rpm, and the rpm eases toward the target
+    def test_move(self):
+        self.rpm._settarget(1000)
+        self.rpm.start()
+        self.rpm.draw(2)
+        green = ledrpm.hue_wheel(255)[85]
+        self.assertEqual(list(self.strip.buf),
+                         [0, 0, green, green, 0, 0, 0, green, green, 0])
+        self.rpm._settarget(0)
+        self.rpm.draw(1)
+        self.assertEqual(self.rpm._rpm, 750)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,6 +17,7 @@
 
 import unittest
 import asyncio
+import time
 
 from ledstrip import ledstrip
 from cmdtemplate import CommandTemplate
@@ -91,6 +92,187 @@ async def async_test_acquire_twice(self):
     def test_acquire_twice(self):
         asyncio.run(self.async_test_acquire_twice())
 
+class TestSleep(unittest.TestCase):
+
+    def setUp(self):
+        self.strip = ledstrip.LedStrip(2, 16, 100)
+
+    # sleep stops the state machine and the next show starts it again
+    def test_sleep(self):
+        pio = self.strip._pio
+        self.assertTrue(pio.isactive)
+        self.strip.sleep()
+        self.assertFalse(pio.isactive)
+        self.strip.show()
+        self.assertTrue(pio.isactive)
+
+    # strip is busy while locked or while commands are queued
+    async def async_test_busy(self):
+        fake = FakeCmd()
+        self.assertFalse(self.strip.busy)
+        await self.strip.acquire(fake)
+        self.assertTrue(self.strip.busy)
+        self.strip.release()
+        self.assertFalse(self.strip.busy)
+        self.strip._queue.append((fake, []))
+        self.assertTrue(self.strip.busy)
+
+    def test_busy(self):
+        asyncio.run(self.async_test_busy())
+
+class TestPalette(unittest.TestCase):
+
+    # index buffer is expanded through the palette, with rotation
+    def test_expand(self):
+        strip = ledstrip.LedStrip(2, 16, 4)
+        strip.use_palette()
+        self.assertEqual(len(strip.index), 4)
+        self.assertEqual(len(strip.palette), 256)
+        for idx in range(256):
+            strip.palette[idx] = idx * 0x010101
+        strip.index[:] = bytes([0, 1, 128, 255])
+        strip.expand()
+        self.assertEqual(list(strip.buf), [0, 0x010101, 0x808080, 0xFFFFFF])
+        strip.expand(2)
+        self.assertEqual(list(strip.buf), [0x020202, 0x030303, 0x828282, 0x010101])
+
+class TestFade(unittest.TestCase):
+
+    def setUp(self):
+        self.strip = ledstrip.LedStrip(2, 16, 2)
+        self.strip.fade_ms = 1000
+        self.shown = []
+        def pio_show(buf):
+            self.shown.append(list(buf))
+        self.strip.pio_show = pio_show
+
+    # a pattern replacing another fades from the last frame of the old one
+    async def async_test_fade(self):
+        strip = self.strip
+        old = FakeCmd(strip)
+        new = FakeCmd(strip)
+        await strip.acquire(old)
+        strip.buf[0] = 0x808080
+        strip.show()
+        # new pattern takes over, the old one clears and releases
+        task = asyncio.create_task(strip.acquire(new))
+        await asyncio.sleep_ms(0)
+        self.assertTrue(old._stoprequest)
+        strip.clear()
+        strip.release()
+        await task
+        self.assertEqual(len(self.shown), 1)    # clear was not shown
+        # first frame of the new pattern is still mostly the old frame
+        strip.buf[1] = 0x404040
+        strip.show()
+        self.assertEqual(self.shown[-1][0] & 0xFF, 0x80)
+        self.assertEqual(self.shown[-1][1] & 0xFF, 0)
+        # half way through the fade
+        strip._fadestart = time.ticks_add(time.ticks_ms(), -500)
+        strip.show()
+        self.assertTrue(0x3E <= (self.shown[-1][0] & 0xFF) <= 0x42)
+        self.assertTrue(0x1F <= (self.shown[-1][1] & 0xFF) <= 0x21)
+        # fade done, the new frame is shown as is
+        strip._fadestart = time.ticks_add(time.ticks_ms(), -1000)
+        strip.show()
+        self.assertEqual(self.shown[-1], [0, 0x404040])
+        self.assertFalse(strip._post)
+
+    def test_fade(self):
+        asyncio.run(self.async_test_fade())
+
+class TestDim(unittest.TestCase):
+
+    def setUp(self):
+        self.strip = ledstrip.LedStrip(2, 16, 2)
+        self.shown = []
+        def pio_show(buf):
+            self.shown.append(list(buf))
+        self.strip.pio_show = pio_show
+
+    # average over several frames is the exact dimmed value
+    def test_dither(self):
+        strip = self.strip
+        strip.set_dim(1024)
+        strip.buf[0] = 0x101010
+        strip.buf[1] = 0x010203
+        for _ in range(4):
+            strip.show()
+        self.assertEqual(self.shown[0][0], 0x040404)
+        self.assertEqual(sum([frame[1] & 0xFF for frame in self.shown]), 3)
+        self.assertEqual(sum([(frame[1] >> 8) & 0xFF for frame in self.shown]), 2)
+        self.assertEqual(sum([frame[1] >> 16 for frame in self.shown]), 1)
+        # pixel buffer is not changed
+        self.assertEqual(list(strip.buf), [0x101010, 0x010203])
+
+    # full level turns dimming off
+    def test_full(self):
+        self.strip.set_dim(2048)
+        self.assertTrue(self.strip._post)
+        self.strip.set_dim(5000)
+        self.assertFalse(self.strip._post)
+
+class TestDecay(unittest.TestCase):
+
+    def setUp(self):
+        self.strip = ledstrip.LedStrip(2, 16, 4)
+        for pix in range(4):
+            self.strip.buf[pix] = 0x804001
+
+    # decay only changes the range, and stops at the end of the strip
+    def test_decay(self):
+        self.strip.decay(2, 10, 128)
+        self.assertEqual(list(self.strip.buf),
+                         [0x804001, 0x804001, 0x402000, 0x402000])
+
+    # trail fades the buffer after each show, down to 0
+    def test_trail(self):
+        strip = self.strip
+        shown = []
+        strip.pio_show = lambda buf: shown.append(buf[0])
+        strip.set_trail(128)
+        for _ in range(9):
+            strip.show()
+        self.assertEqual(shown[0], 0x804001)
+        self.assertEqual(shown[1], 0x402000)
+        self.assertEqual(shown[8], 0)
+
+class TestIndicator(unittest.TestCase):
+
+    def setUp(self):
+        self.strip = ledstrip.LedStrip(2, 16, 4)
+        self.shown = []
+        self.strip.pio_show = lambda buf: self.shown.append(list(buf))
+        for pix in range(4):
+            self.strip.buf[pix] = 0x808080
+
+    # indicators are shown over the pattern without changing the buffer
+    def test_indicator(self):
+        strip = self.strip
+        strip.set_indicator(0, 1, 0x00FF00)
+        strip.set_indicator(3, 1, 0x0000FF)
+        strip.show()
+        self.assertEqual(self.shown[-1], [0x808080, 0x0000FF, 0x808080, 0x808080])
+        self.assertEqual(list(strip.buf), [0x808080] * 4)
+        strip.clear_indicator(3)
+        strip.show()
+        self.assertEqual(self.shown[-1][1], 0x00FF00)
+        strip.clear_indicator(0)
+        strip.show()
+        self.assertEqual(self.shown[-1], [0x808080] * 4)
+
+    # indicators are not dimmed
+    def test_dim(self):
+        strip = self.strip
+        strip.set_dim(2048)
+        strip.set_indicator(0, 0, 0x00FF00)
+        strip.show()
+        self.assertEqual(self.shown[-1], [0x00FF00, 0x404040, 0x404040, 0x404040])
+
+    def test_bad_pixel(self):
+        with self.assertRaises(ValueError):
+            self.strip.set_indicator(0, 4, 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,40 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+#
+# This file implements a stub for the "machine.Timer" class used by the
+# "frameclock" module. There is no hardware timer in a standalone micropython
+# test environment, so the fake timer never fires on its own. Tests call
+# fire() to simulate the timer interrupt.
+
+class Timer():
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, timer_id=-1) -> None:
+        self.period = 0
+        self.callback = None
+
+    def init(self, mode=PERIODIC, period=-1, callback=None):
+        self.period = period
+        self.callback = callback
+
+    def deinit(self):
+        self.period = 0
+        self.callback = None
+
+    def fire(self, count=1):
+        """Simulate timer expiration, as if from the interrupt handler."""
+        for _ in range(count):
+            if self.callback:
+                self.callback(self)
@@ -0,0 +1,52 @@
+#
+# SPDX-License-Identifier: 0BSD
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted.
+#
+# THE SOFTWARE IS PROVIDED “AS IS” AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH
+# REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY
+# AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT,
+# INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM
+# LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR
+# OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR
+# PERFORMANCE OF THIS SOFTWARE.
+#
+# This file implements a stub for the "machine.UART" class used by the
+# "console_uart" module. The real class uses rp2040 hardware which is not
+# present in a standalone micropython test environment. The fake UART is a
+# loopback, everything written to it can be read back, so that console_uart
+# can be tested.
+
+class Pin():
+
+    def __init__(self, pin, *args, **kwargs) -> None:
+        self.pin = pin
+
+class UART():
+
+    def __init__(self, uart_id, baudrate=115200, tx=None, rx=None,
+                 rxbuf=256, txbuf=256) -> None:
+        self._rx = bytearray()
+        self._rxbuf = rxbuf
+        self.writes = 0     # number of calls to write, for checking by tests
+
+    def write(self, buf):
+        self.writes += 1
+        data = buf.encode() if isinstance(buf, str) else bytes(buf)
+        # like the real ring buffer, anything that does not fit is lost
+        room = self._rxbuf - len(self._rx)
+        self._rx += data[:room]
+        return len(data)
+
+    def any(self):
+        return len(self._rx)
+
+    def read(self, nbytes=None):
+        if not self._rx:
+            return None
+        if nbytes is None or nbytes > len(self._rx):
+            nbytes = len(self._rx)
+        data = bytes(self._rx[:nbytes])
+        self._rx = self._rx[nbytes:]
+        return data
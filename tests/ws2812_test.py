@@ -24,7 +24,10 @@
 class WS2812():
 
     def __init__(self, smid: int, pin: int) -> None:
-        pass
+        self.isactive = True
+
+    def active(self, enable: bool) -> None:
+        self.isactive = enable
 
     def shutdown(self):
         pass